@@ -69,7 +69,12 @@ from thrift.transport import THttpClient, TTransport
 from opentelemetry.configuration import Configuration
 from opentelemetry.exporter.jaeger.gen.agent import Agent as agent
 from opentelemetry.exporter.jaeger.gen.jaeger import Collector as jaeger
-from opentelemetry.sdk.trace.export import Span, SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.export import (
+    Span,
+    SpanBatch,
+    SpanExporter,
+    SpanExportResult,
+)
 from opentelemetry.trace import SpanKind
 from opentelemetry.trace.status import StatusCode
 
@@ -104,6 +109,10 @@ class JaegerSpanExporter(SpanExporter):
             required.
     """
 
+    # the agent client and the collector reuse a single thrift buffer
+    thread_safe = False
+    accepts_span_batch = True
+
     def __init__(
         self,
         service_name,
@@ -214,22 +223,35 @@ def _translate_to_jaeger(spans: Span):
         spans: Tuple of spans to convert
     """
 
+    batch = SpanBatch.create(spans)
+    # values shared by spans of the same trace, resource or instrumentation
+    # library are only translated once per batch
+    trace_ids = [
+        (_get_trace_id_high(trace_id), _get_trace_id_low(trace_id))
+        for trace_id in batch.trace_ids
+    ]
+    resource_tags = [
+        _extract_tags(resource.attributes) for resource in batch.resources
+    ]
+    instrumentation_info_tags = [
+        _extract_instrumentation_info_tags(instrumentation_info)
+        for instrumentation_info in batch.instrumentation_infos
+    ]
+
     jaeger_spans = []
 
-    for span in spans:
+    for index, span in enumerate(batch):
         ctx = span.get_span_context()
-        trace_id = ctx.trace_id
-        span_id = ctx.span_id
+        trace_id_high, trace_id_low = trace_ids[batch.trace_id_indices[index]]
+        start_time = batch.start_times[index]
 
-        start_time_us = _nsec_to_usec_round(span.start_time)
-        duration_us = _nsec_to_usec_round(span.end_time - span.start_time)
+        start_time_us = _nsec_to_usec_round(start_time)
+        duration_us = _nsec_to_usec_round(batch.end_times[index] - start_time)
 
         status = span.status
 
-        parent_id = span.parent.span_id if span.parent else 0
-
         tags = _extract_tags(span.attributes)
-        tags.extend(_extract_tags(span.resource.attributes))
+        tags.extend(resource_tags[batch.resource_indices[index]])
 
         tags.extend(
             [
@@ -239,19 +261,11 @@ def _translate_to_jaeger(spans: Span):
             ]
         )
 
-        if span.instrumentation_info is not None:
-            tags.extend(
-                [
-                    _get_string_tag(
-                        "otel.instrumentation_library.name",
-                        span.instrumentation_info.name,
-                    ),
-                    _get_string_tag(
-                        "otel.instrumentation_library.version",
-                        span.instrumentation_info.version,
-                    ),
-                ]
-            )
+        tags.extend(
+            instrumentation_info_tags[
+                batch.instrumentation_info_indices[index]
+            ]
+        )
 
         # Ensure that if Status.Code is not OK, that we set the "error" tag on the Jaeger span.
         if not status.is_ok:
@@ -263,10 +277,10 @@ def _translate_to_jaeger(spans: Span):
         flags = int(ctx.trace_flags)
 
         jaeger_span = jaeger.Span(
-            traceIdHigh=_get_trace_id_high(trace_id),
-            traceIdLow=_get_trace_id_low(trace_id),
+            traceIdHigh=trace_id_high,
+            traceIdLow=trace_id_low,
             # generated code expects i64
-            spanId=_convert_int_to_i64(span_id),
+            spanId=_convert_int_to_i64(batch.span_ids[index]),
             operationName=span.name,
             startTime=start_time_us,
             duration=duration_us,
@@ -274,7 +288,7 @@ def _translate_to_jaeger(spans: Span):
             logs=logs,
             references=refs,
             flags=flags,
-            parentSpanId=_convert_int_to_i64(parent_id),
+            parentSpanId=_convert_int_to_i64(batch.parent_span_ids[index]),
         )
 
         jaeger_spans.append(jaeger_span)
@@ -282,6 +296,20 @@ def _translate_to_jaeger(spans: Span):
     return jaeger_spans
 
 
+def _extract_instrumentation_info_tags(instrumentation_info):
+    if instrumentation_info is None:
+        return []
+    return [
+        _get_string_tag(
+            "otel.instrumentation_library.name", instrumentation_info.name
+        ),
+        _get_string_tag(
+            "otel.instrumentation_library.version",
+            instrumentation_info.version,
+        ),
+    ]
+
+
 def _extract_refs_from_span(span):
     if not span.links:
         return None
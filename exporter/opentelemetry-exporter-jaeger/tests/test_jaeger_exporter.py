@@ -24,8 +24,9 @@ from opentelemetry.configuration import Configuration
 from opentelemetry.exporter.jaeger.gen.jaeger import ttypes as jaeger
 from opentelemetry.sdk import trace
 from opentelemetry.sdk.trace import Resource
+from opentelemetry.sdk.trace.export import BatchExportSpanProcessor, SpanBatch
 from opentelemetry.sdk.util.instrumentation import InstrumentationInfo
-from opentelemetry.trace import SpanKind
+from opentelemetry.trace import SpanKind, TraceFlags
 from opentelemetry.trace.status import Status, StatusCode
 
 
@@ -444,6 +445,39 @@ class TestJaegerSpanExporter(unittest.TestCase):
         self.assertEqual(agent_client_mock.emit.call_count, 1)
         self.assertEqual(collector_mock.submit.call_count, 1)
 
+    def test_export_span_batch(self):
+        """Test that the batch of the span processor is translated"""
+        exporter = jaeger_exporter.JaegerSpanExporter("test_export")
+        agent_client_mock = mock.Mock(spec=jaeger_exporter.AgentClientUDP)
+        # pylint: disable=protected-access
+        exporter._agent_client = agent_client_mock
+        span_processor = BatchExportSpanProcessor(exporter)
+        span = trace._Span(
+            "test_span",
+            context=trace_api.SpanContext(
+                trace_id=0x000000000000000000000000DEADBEEF,
+                span_id=0x00000000DEADBEF0,
+                is_remote=False,
+                trace_flags=TraceFlags(TraceFlags.SAMPLED),
+            ),
+        )
+        span.start()
+        span.end()
+
+        with mock.patch.object(
+            SpanBatch,
+            "__init__",
+            autospec=True,
+            side_effect=SpanBatch.__init__,
+        ) as init_mock:
+            span_processor.on_end(span)
+            span_processor.force_flush()
+        span_processor.shutdown()
+
+        # the exporter does not build a batch of its own
+        self.assertEqual(init_mock.call_count, 1)
+        self.assertEqual(agent_client_mock.emit.call_count, 1)
+
     def test_agent_client(self):
         agent_client = jaeger_exporter.AgentClientUDP(
             host_name="localhost", port=6354
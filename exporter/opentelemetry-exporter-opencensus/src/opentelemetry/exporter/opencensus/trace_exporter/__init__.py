@@ -26,7 +26,11 @@ from opencensus.proto.trace.v1 import trace_pb2
 
 import opentelemetry.exporter.opencensus.util as utils
 from opentelemetry.sdk.trace import Span
-from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.export import (
+    SpanBatch,
+    SpanExporter,
+    SpanExportResult,
+)
 
 DEFAULT_ENDPOINT = "localhost:55678"
 
@@ -44,6 +48,8 @@ class OpenCensusSpanExporter(SpanExporter):
         client: TraceService client stub.
     """
 
+    accepts_span_batch = True
+
     def __init__(
         self,
         endpoint=DEFAULT_ENDPOINT,
@@ -88,8 +94,10 @@ class OpenCensusSpanExporter(SpanExporter):
 
 # pylint: disable=too-many-branches
 def translate_to_collector(spans: Sequence[Span]):
+    batch = SpanBatch.create(spans)
+    trace_ids = [trace_id.to_bytes(16, "big") for trace_id in batch.trace_ids]
     collector_spans = []
-    for span in spans:
+    for index, span in enumerate(batch):
         status = None
         if span.status is not None:
             status = trace_pb2.Status(
@@ -100,18 +108,16 @@ def translate_to_collector(spans: Sequence[Span]):
         collector_span = trace_pb2.Span(
             name=trace_pb2.TruncatableString(value=span.name),
             kind=utils.get_collector_span_kind(span.kind),
-            trace_id=span.context.trace_id.to_bytes(16, "big"),
-            span_id=span.context.span_id.to_bytes(8, "big"),
+            trace_id=trace_ids[batch.trace_id_indices[index]],
+            span_id=batch.span_ids[index].to_bytes(8, "big"),
             start_time=utils.proto_timestamp_from_time_ns(span.start_time),
             end_time=utils.proto_timestamp_from_time_ns(span.end_time),
             status=status,
         )
 
-        parent_id = 0
-        if span.parent is not None:
-            parent_id = span.parent.span_id
-
-        collector_span.parent_span_id = parent_id.to_bytes(8, "big")
+        collector_span.parent_span_id = batch.parent_span_ids[index].to_bytes(
+            8, "big"
+        )
 
         if span.context.trace_state is not None:
             for (key, value) in span.context.trace_state.items():
@@ -36,6 +36,14 @@ if no compression is the desired choice.
 Additional details are available `in the specification
 <https://github.com/open-telemetry/opentelemetry-specification/blob/master/specification/protocol/exporter.md#opentelemetry-protocol-exporter>`_.
 
+.. envvar:: OTEL_EXPORTER_OTLP_SPOOL_DIRECTORY
+
+The :envvar:`OTEL_EXPORTER_OTLP_SPOOL_DIRECTORY` environment variable sets a
+directory where `OTLPSpanExporter` and `OTLPMetricsExporter` store batches
+while the collector is unavailable, instead of retrying them from memory. They
+are sent again once the collector is reachable, also after a restart. See
+`opentelemetry.exporter.otlp.spool`.
+
 .. code:: python
 
     from opentelemetry import trace
@@ -14,14 +14,21 @@
 
 """OTLP Exporter"""
 
+import asyncio
 import enum
+import heapq
+import itertools
 import logging
+import os
+import threading
+import weakref
 from abc import ABC, abstractmethod
 from collections.abc import Mapping, Sequence
-from time import sleep
+from functools import lru_cache
+from time import monotonic
 from typing import Any, Callable, Dict, Generic, List, Optional
 from typing import Sequence as TypingSequence
-from typing import Text, TypeVar
+from typing import Text, Tuple, TypeVar
 
 from backoff import expo
 from google.rpc.error_details_pb2 import RetryInfo
@@ -36,9 +43,15 @@ from grpc import (
 )
 
 from opentelemetry.configuration import Configuration
-from opentelemetry.proto.common.v1.common_pb2 import AnyValue, KeyValue
+from opentelemetry.exporter.otlp.spool import DiskSpool
+from opentelemetry.proto.common.v1.common_pb2 import (
+    AnyValue,
+    InstrumentationLibrary,
+    KeyValue,
+)
 from opentelemetry.proto.resource.v1.resource_pb2 import Resource
 from opentelemetry.sdk.resources import Resource as SDKResource
+from opentelemetry.sdk.util.instrumentation import InstrumentationInfo
 
 logger = logging.getLogger(__name__)
 SDKDataT = TypeVar("SDKDataT")
@@ -80,9 +93,38 @@ def _translate_key_values(key: Text, value: Any) -> KeyValue:
     return KeyValue(key=key, value=any_value)
 
 
+# Resources and instrumentation infos are immutable and a process only has a
+# handful of them, so their messages are only translated once. The cached
+# messages are copied into the requests and must not be modified.
+@lru_cache(maxsize=128)
+def _translate_resource(sdk_resource: SDKResource) -> Resource:
+    collector_resource = Resource()
+
+    for key, value in sdk_resource.attributes.items():
+
+        try:
+            # pylint: disable=no-member
+            collector_resource.attributes.append(
+                _translate_key_values(key, value)
+            )
+        except Exception as error:  # pylint: disable=broad-except
+            logger.exception(error)
+
+    return collector_resource
+
+
+@lru_cache(maxsize=128)
+def _translate_instrumentation_library(
+    instrumentation_info: InstrumentationInfo,
+) -> InstrumentationLibrary:
+    return InstrumentationLibrary(
+        name=instrumentation_info.name, version=instrumentation_info.version,
+    )
+
+
 def _get_resource_data(
     sdk_resource_instrumentation_library_data: Dict[
-        SDKResource, ResourceDataT
+        SDKResource, List[ResourceDataT]
     ],
     resource_class: Callable[..., TypingResourceT],
     name: str,
@@ -95,25 +137,13 @@ def _get_resource_data(
         instrumentation_library_data,
     ) in sdk_resource_instrumentation_library_data.items():
 
-        collector_resource = Resource()
-
-        for key, value in sdk_resource.attributes.items():
-
-            try:
-                # pylint: disable=no-member
-                collector_resource.attributes.append(
-                    _translate_key_values(key, value)
-                )
-            except Exception as error:  # pylint: disable=broad-except
-                logger.exception(error)
-
         resource_data.append(
             resource_class(
                 **{
-                    "resource": collector_resource,
-                    "instrumentation_library_{}".format(name): [
-                        instrumentation_library_data
-                    ],
+                    "resource": _translate_resource(sdk_resource),
+                    "instrumentation_library_{}".format(
+                        name
+                    ): instrumentation_library_data,
                 }
             )
         )
@@ -121,6 +151,191 @@ def _get_resource_data(
     return resource_data
 
 
+def _get_retry_delay(error: RpcError, delay: float) -> Optional[float]:
+    """Returns the number of seconds to wait before retrying an export that
+    failed with error, or None if the export must not be retried.
+
+    The delay requested by the collector through ``RetryInfo`` takes
+    precedence over the given backoff delay.
+    """
+    if error.code() not in [
+        StatusCode.CANCELLED,
+        StatusCode.DEADLINE_EXCEEDED,
+        StatusCode.PERMISSION_DENIED,
+        StatusCode.UNAUTHENTICATED,
+        StatusCode.RESOURCE_EXHAUSTED,
+        StatusCode.ABORTED,
+        StatusCode.OUT_OF_RANGE,
+        StatusCode.UNAVAILABLE,
+        StatusCode.DATA_LOSS,
+    ]:
+        return None
+
+    retry_info_bin = dict(error.trailing_metadata() or ()).get(
+        "google.rpc.retryinfo-bin"
+    )
+    if retry_info_bin is not None:
+        retry_info = RetryInfo()
+        retry_info.ParseFromString(retry_info_bin)
+        delay = (
+            retry_info.retry_delay.seconds
+            + retry_info.retry_delay.nanos / 1.0e9
+        )
+    return delay
+
+
+# delay before the first retry of an export, doubled for every retry
+_INITIAL_RETRY_DELAY = 1
+# maximum delay between attempts to replay the spool
+_MAX_SPOOL_RETRY_DELAY = 60
+
+
+class _PendingExport:
+    __slots__ = ("payload", "deadline", "delay")
+
+    def __init__(self, payload: bytes, deadline: float, delay: float):
+        self.payload = payload
+        self.deadline = deadline
+        self.delay = delay
+
+
+class _RetryScheduler:
+    """Retries failed exports from a background thread, so that the
+    exporter can send new batches in the meantime.
+
+    At most ``max_batches`` batches wait to be retried, further failed
+    batches are abandoned. A batch is also abandoned once its next retry
+    would be more than ``timeout`` seconds after its first failure.
+
+    Args:
+        send: Sends an encoded request with the given backoff delay. Returns
+            whether it succeeded, and the delay before the next attempt or
+            None if it must not be retried.
+        max_batches: The maximum number of batches waiting to be retried.
+        timeout: The number of seconds batches are retried for.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[bytes, float], Tuple[bool, Optional[float]]],
+        max_batches: int,
+        timeout: float,
+    ):
+        self._send = send
+        self._max_batches = max_batches
+        self._timeout = timeout
+        # (due time, sequence number, pending export)
+        self._heap = []  # type: List[Tuple[float, int, _PendingExport]]
+        self._sequence = itertools.count()
+        self._condition = threading.Condition(threading.Lock())
+        self._thread = None  # type: Optional[threading.Thread]
+        self._done = False
+        self.retried_batches = 0
+        self.abandoned_batches = 0
+
+    def schedule(self, payload: bytes, delay: float) -> bool:
+        """Schedules the retry of a batch that failed for the first time,
+        returns False if it was abandoned."""
+        with self._condition:
+            if self._done or len(self._heap) >= self._max_batches:
+                self.abandoned_batches += 1
+                logger.warning(
+                    "Retry buffer is full, abandoning export of batch."
+                )
+                return False
+            now = monotonic()
+            self._push(
+                now + delay,
+                _PendingExport(payload, now + self._timeout, delay),
+            )
+            self.retried_batches += 1
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._worker, daemon=True
+                )
+                self._thread.start()
+            return True
+
+    def _push(self, due_time: float, pending: _PendingExport) -> None:
+        heapq.heappush(self._heap, (due_time, next(self._sequence), pending))
+        self._condition.notify()
+
+    def _worker(self):
+        while True:
+            with self._condition:
+                while not self._done:
+                    if self._heap:
+                        timeout = self._heap[0][0] - monotonic()
+                        if timeout <= 0:
+                            break
+                    else:
+                        timeout = None
+                    self._condition.wait(timeout)
+                if self._done:
+                    return
+                _, _, pending = heapq.heappop(self._heap)
+
+            pending.delay *= 2
+            succeeded, retry_delay = self._send(pending.payload, pending.delay)
+            if succeeded:
+                continue
+
+            with self._condition:
+                if retry_delay is None:
+                    self.abandoned_batches += 1
+                    logger.warning("Retried export of batch failed.")
+                    continue
+                due_time = monotonic() + retry_delay
+                if self._done or due_time > pending.deadline:
+                    self.abandoned_batches += 1
+                    logger.warning(
+                        "Retry timeout exceeded, abandoning export of batch."
+                    )
+                else:
+                    logger.debug(
+                        "Waiting %ss before retrying export", retry_delay
+                    )
+                    self._push(due_time, pending)
+
+    def _at_fork_reinit(self) -> None:
+        """Called in forked child processes, where the worker of the parent
+        does not exist. The batches of the parent are only retried by the
+        parent, a new worker is started once a batch fails in the child."""
+        self._heap = []
+        self._condition = threading.Condition(threading.Lock())
+        self._thread = None
+
+    def shutdown(self) -> None:
+        """Stops retrying, the batches waiting to be retried are
+        abandoned."""
+        with self._condition:
+            self._done = True
+            self._condition.notify()
+            if self._heap:
+                logger.warning(
+                    "Abandoning export of %s batches waiting to be retried.",
+                    len(self._heap),
+                )
+                self.abandoned_batches += len(self._heap)
+                self._heap.clear()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def _reinit_exporters() -> None:
+    for exporter in list(_exporters):
+        exporter._at_fork_reinit()  # pylint: disable=protected-access
+
+
+_exporters = weakref.WeakSet()  # type: weakref.WeakSet
+
+# os.register_at_fork is only available from Python 3.7
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(  # pylint: disable=no-member
+        after_in_child=_reinit_exporters
+    )
+
+
 def _load_credential_from_file(filepath) -> ChannelCredentials:
     try:
         with open(filepath, "rb") as f:
@@ -144,8 +359,25 @@ class OTLPExporterMixin(
         headers: Headers to send when exporting
         compression: Compression algorithm to be used in channel
         timeout: Backend request timeout in seconds
+        spool_directory: Directory to store batches in while the collector
+            is unavailable, see `opentelemetry.exporter.otlp.spool`
     """
 
+    _insecure_channel = staticmethod(insecure_channel)
+    _secure_channel = staticmethod(secure_channel)
+    #: The gRPC method exports are sent to
+    _export_method_path = None  # type: str
+
+    #: The maximum number of failed batches waiting to be retried
+    max_retry_batches = 32
+    #: The number of seconds failed batches are retried for
+    retry_timeout = 900
+    #: The maximum size of the spool in bytes
+    spool_max_bytes = 256 * 1024 * 1024
+    # the subdirectory of the spool directory, None if spooling is not
+    # supported
+    _spool_name = None  # type: Optional[str]
+
     def __init__(
         self,
         endpoint: Optional[str] = None,
@@ -154,6 +386,7 @@ class OTLPExporterMixin(
         headers: Optional[str] = None,
         timeout: Optional[int] = None,
         compression: str = None,
+        spool_directory: Optional[str] = None,
     ):
         super().__init__()
 
@@ -198,18 +431,64 @@ class OTLPExporterMixin(
                 )
 
         if insecure:
-            self._client = self._stub(
-                insecure_channel(endpoint, compression=compression_algorithm)
+            self._channel = self._insecure_channel(
+                endpoint, compression=compression_algorithm
             )
         else:
             credentials = credentials or _load_credential_from_file(
                 Configuration().EXPORTER_OTLP_CERTIFICATE
             )
-            self._client = self._stub(
-                secure_channel(
-                    endpoint, credentials, compression=compression_algorithm
-                )
+            self._channel = self._secure_channel(
+                endpoint, credentials, compression=compression_algorithm
             )
+        self._client = self._stub(self._channel)
+        # sends requests that are already encoded, the client would encode
+        # them again for every retry
+        self._export_method = self._channel.unary_unary(
+            self._export_method_path
+        )
+        self._retry_scheduler = None  # type: Optional[_RetryScheduler]
+        self._retry_scheduler_lock = threading.Lock()
+
+        spool_directory = (
+            spool_directory or Configuration().EXPORTER_OTLP_SPOOL_DIRECTORY
+        )
+        self._spool = None  # type: Optional[DiskSpool]
+        self._spool_condition = threading.Condition(threading.Lock())
+        self._spool_thread = None  # type: Optional[threading.Thread]
+        self._spool_idle = False
+        self._spool_done = False
+        if spool_directory is not None and self._spool_name is not None:
+            self._spool = DiskSpool(
+                os.path.join(spool_directory, self._spool_name),
+                max_bytes=self.spool_max_bytes,
+            )
+            if self._spool.pending_batches:
+                # batches spooled before a restart
+                self._notify_spool_replay(False)
+        _exporters.add(self)
+
+    def _at_fork_reinit(self) -> None:
+        """Called in forked child processes, where only the thread that
+        forked exists. Replaces the inherited locks, and restarts the retry
+        and spool threads once they are needed.
+
+        The child opens the spool again, it appends to a subdirectory named
+        after its process id while the parent holds the spool directory, and
+        adopts the batches of exited processes, see `DiskSpool`.
+        """
+        self._retry_scheduler_lock = threading.Lock()
+        if self._retry_scheduler is not None:
+            # pylint: disable=protected-access
+            self._retry_scheduler._at_fork_reinit()
+        self._spool_condition = threading.Condition(threading.Lock())
+        self._spool_thread = None
+        self._spool_idle = False
+        if self._spool is not None and not self._spool_done:
+            # pylint: disable=protected-access
+            self._spool._at_fork_reinit()
+            if self._spool.pending_batches:
+                self._notify_spool_replay(False)
 
     @abstractmethod
     def _translate_data(
@@ -217,58 +496,110 @@ class OTLPExporterMixin(
     ) -> ExportServiceRequestT:
         pass
 
-    def _export(self, data: TypingSequence[SDKDataT]) -> ExportResultT:
-        # expo returns a generator that yields delay values which grow
-        # exponentially. Once delay is greater than max_value, the yielded
-        # value will remain constant.
-        # max_value is set to 900 (900 seconds is 15 minutes) to use the same
-        # value as used in the Go implementation.
+    def _send(
+        self, payload: bytes, delay: float
+    ) -> Tuple[ExportResultT, Optional[float]]:
+        """Sends an encoded request once.
+
+        Returns the result, and the number of seconds to wait before
+        retrying if the export failed and may be retried.
+        """
+        try:
+            self._export_method(
+                payload, metadata=self._headers, timeout=self._timeout,
+            )
+            return self._result.SUCCESS, None
 
-        max_value = 900
+        except RpcError as error:
 
-        for delay in expo(max_value=max_value):
+            retry_delay = _get_retry_delay(error, delay)
+            if retry_delay is not None:
+                return self._result.FAILURE, retry_delay
 
-            if delay == max_value:
-                return self._result.FAILURE
+            if error.code() == StatusCode.OK:
+                return self._result.SUCCESS, None
+
+            return self._result.FAILURE, None
+
+    def _send_retry(
+        self, payload: bytes, delay: float
+    ) -> Tuple[bool, Optional[float]]:
+        result, retry_delay = self._send(payload, delay)
+        return result is self._result.SUCCESS, retry_delay
+
+    @property
+    def retried_batches(self) -> int:
+        """The number of failed batches that were scheduled to be
+        retried."""
+        if self._retry_scheduler is None:
+            return 0
+        return self._retry_scheduler.retried_batches
+
+    @property
+    def abandoned_batches(self) -> int:
+        """The number of failed batches that were given up on."""
+        if self._retry_scheduler is None:
+            return 0
+        return self._retry_scheduler.abandoned_batches
+
+    def _export(self, data: TypingSequence[SDKDataT]) -> ExportResultT:
+        """Sends the data once. If the export fails with a retryable error,
+        the encoded request is retried from a background thread with an
+        exponential backoff and `FAILURE` is returned."""
+        # the request is only encoded once, retries resend the same bytes
+        payload = self._translate_data(data).SerializeToString()
+        result, retry_delay = self._send(payload, _INITIAL_RETRY_DELAY)
+        if self._spool is not None:
+            if retry_delay is not None:
+                self._spool.append(payload)
+                self._notify_spool_replay(False)
+            elif self._spool.pending_batches:
+                self._notify_spool_replay(True)
+        elif retry_delay is not None:
+            with self._retry_scheduler_lock:
+                if self._retry_scheduler is None:
+                    self._retry_scheduler = _RetryScheduler(
+                        self._send_retry,
+                        self.max_retry_batches,
+                        self.retry_timeout,
+                    )
+            self._retry_scheduler.schedule(payload, retry_delay)
+        return result
 
+    async def _async_export(
+        self, data: TypingSequence[SDKDataT]
+    ) -> ExportResultT:
+        """Non-blocking version of `_export` for clients created on a
+        ``grpc.aio`` channel, it retries without blocking the event loop for
+        at most the exporter timeout."""
+        payload = self._translate_data(data).SerializeToString()
+        deadline = monotonic() + self._timeout
+
+        for delay in expo():
             try:
-                self._client.Export(
-                    request=self._translate_data(data),
+                await self._export_method(
+                    payload,
                     metadata=self._headers,
-                    timeout=self._timeout,
+                    timeout=max(deadline - monotonic(), 0),
                 )
 
                 return self._result.SUCCESS
 
             except RpcError as error:
 
-                if error.code() in [
-                    StatusCode.CANCELLED,
-                    StatusCode.DEADLINE_EXCEEDED,
-                    StatusCode.PERMISSION_DENIED,
-                    StatusCode.UNAUTHENTICATED,
-                    StatusCode.RESOURCE_EXHAUSTED,
-                    StatusCode.ABORTED,
-                    StatusCode.OUT_OF_RANGE,
-                    StatusCode.UNAVAILABLE,
-                    StatusCode.DATA_LOSS,
-                ]:
-
-                    retry_info_bin = dict(error.trailing_metadata()).get(
-                        "google.rpc.retryinfo-bin"
-                    )
-                    if retry_info_bin is not None:
-                        retry_info = RetryInfo()
-                        retry_info.ParseFromString(retry_info_bin)
-                        delay = (
-                            retry_info.retry_delay.seconds
-                            + retry_info.retry_delay.nanos / 1.0e9
+                retry_delay = _get_retry_delay(error, delay)
+                if retry_delay is not None:
+                    if monotonic() + retry_delay >= deadline:
+                        logger.warning(
+                            "Export timeout exceeded, abandoning export of "
+                            "batch."
                         )
-
+                        return self._result.FAILURE
                     logger.debug(
-                        "Waiting %ss before retrying export of span", delay
+                        "Waiting %ss before retrying export of span",
+                        retry_delay,
                     )
-                    sleep(delay)
+                    await asyncio.sleep(retry_delay)
                     continue
 
                 if error.code() == StatusCode.OK:
@@ -278,5 +609,68 @@ class OTLPExporterMixin(
 
         return self._result.FAILURE
 
+    def _notify_spool_replay(self, reachable: bool) -> None:
+        """Starts replaying the spool, right away if the collector is known
+        to be ``reachable`` or the spool was empty."""
+        with self._spool_condition:
+            if self._spool_done:
+                return
+            if self._spool_thread is None:
+                self._spool_thread = threading.Thread(
+                    target=self._replay_spool, daemon=True
+                )
+                self._spool_thread.start()
+            elif reachable or self._spool_idle:
+                self._spool_condition.notify()
+
+    def _replay_spool(self) -> None:
+        """Sends the spooled batches once the collector is reachable,
+        probing it with an exponential backoff."""
+        delay = _INITIAL_RETRY_DELAY
+        timeout = delay  # type: Optional[float]
+        retry_delays = []  # type: List[float]
+
+        def send(payload: bytes) -> bool:
+            _, retry_delay = self._send(payload, delay)
+            if retry_delay is None:
+                return True
+            retry_delays.append(retry_delay)
+            return False
+
+        while True:
+            with self._spool_condition:
+                if timeout is None and self._spool.pending_batches:
+                    # spooled while the spool was replayed
+                    timeout = 0
+                self._spool_idle = timeout is None
+                if not self._spool_done:
+                    self._spool_condition.wait(timeout)
+                self._spool_idle = False
+                if self._spool_done:
+                    return
+
+            del retry_delays[:]
+            self._spool.replay(send)
+            if retry_delays:
+                timeout = retry_delays[0]
+                delay = min(delay * 2, _MAX_SPOOL_RETRY_DELAY)
+            else:
+                # wait for new spooled batches
+                timeout = None
+                delay = _INITIAL_RETRY_DELAY
+
+    def _shutdown_retries(self) -> None:
+        """Stops retrying failed exports, abandoning the batches waiting to
+        be retried. Spooled batches stay on disk."""
+        if self._retry_scheduler is not None:
+            self._retry_scheduler.shutdown()
+        if self._spool is not None:
+            with self._spool_condition:
+                self._spool_done = True
+                self._spool_condition.notify()
+            if self._spool_thread is not None:
+                self._spool_thread.join()
+            self._spool.close()
+
     def shutdown(self) -> None:
-        pass
+        self._shutdown_retries()
@@ -37,10 +37,14 @@ from opentelemetry.proto.metrics.v1.metrics_pb2 import (
     AggregationTemporality,
     DoubleDataPoint,
     DoubleGauge,
+    DoubleHistogram,
+    DoubleHistogramDataPoint,
     DoubleSum,
     InstrumentationLibraryMetrics,
     IntDataPoint,
     IntGauge,
+    IntHistogram,
+    IntHistogramDataPoint,
     IntSum,
 )
 from opentelemetry.proto.metrics.v1.metrics_pb2 import Metric as OTLPMetric
@@ -59,6 +63,7 @@ from opentelemetry.sdk.metrics.export import (
     MetricsExportResult,
 )
 from opentelemetry.sdk.metrics.export.aggregate import (
+    DDSketchAggregator,
     HistogramAggregator,
     LastValueAggregator,
     MinMaxSumCountAggregator,
@@ -68,6 +73,16 @@ from opentelemetry.sdk.metrics.export.aggregate import (
 
 logger = logging.getLogger(__name__)
 DataPointT = TypeVar("DataPointT", IntDataPoint, DoubleDataPoint)
+HistogramDataPointT = TypeVar(
+    "HistogramDataPointT", IntHistogramDataPoint, DoubleHistogramDataPoint
+)
+
+
+def _get_labels(sdk_metric_record: MetricRecord) -> List[StringKeyValue]:
+    return [
+        StringKeyValue(key=str(label_key), value=str(label_value))
+        for label_key, label_value in sdk_metric_record.labels
+    ]
 
 
 def _get_data_points(
@@ -93,10 +108,7 @@ def _get_data_points(
 
     return [
         data_point_class(
-            labels=[
-                StringKeyValue(key=str(label_key), value=str(label_value))
-                for label_key, label_value in sdk_metric_record.labels
-            ],
+            labels=_get_labels(sdk_metric_record),
             value=value,
             start_time_unix_nano=(
                 sdk_metric_record.aggregator.initial_checkpoint_timestamp
@@ -108,6 +120,31 @@ def _get_data_points(
     ]
 
 
+def _get_histogram_data_points(
+    sdk_metric_record: MetricRecord,
+    data_point_class: Type[HistogramDataPointT],
+) -> List[HistogramDataPointT]:
+    # the buckets of the sketch, see DDSketch.buckets
+    sketch = sdk_metric_record.aggregator.checkpoint
+    buckets = sketch.buckets()
+
+    return [
+        data_point_class(
+            labels=_get_labels(sdk_metric_record),
+            count=sketch.count,
+            sum=sketch.sum,
+            bucket_counts=buckets.counts,
+            explicit_bounds=buckets.bounds,
+            start_time_unix_nano=(
+                sdk_metric_record.aggregator.initial_checkpoint_timestamp
+            ),
+            time_unix_nano=(
+                sdk_metric_record.aggregator.last_update_timestamp
+            ),
+        )
+    ]
+
+
 class OTLPMetricsExporter(
     MetricsExporter,
     OTLPExporterMixin[
@@ -123,10 +160,16 @@ class OTLPMetricsExporter(
         credentials: Credentials object for server authentication
         headers: Headers to send when exporting
         timeout: Backend request timeout in seconds
+        spool_directory: Directory to store metrics in while the collector
+            is unavailable, see `opentelemetry.exporter.otlp.spool`
     """
 
     _stub = MetricsServiceStub
+    _export_method_path = (
+        "/opentelemetry.proto.collector.metrics.v1.MetricsService/Export"
+    )
     _result = MetricsExportResult
+    _spool_name = "metrics"
 
     def __init__(
         self,
@@ -135,6 +178,7 @@ class OTLPMetricsExporter(
         credentials: Optional[ChannelCredentials] = None,
         headers: Optional[str] = None,
         timeout: Optional[int] = None,
+        spool_directory: Optional[str] = None,
     ):
         if insecure is None:
             insecure = Configuration().EXPORTER_OTLP_METRIC_INSECURE
@@ -157,6 +201,7 @@ class OTLPMetricsExporter(
                 or Configuration().EXPORTER_OTLP_METRIC_HEADERS,
                 "timeout": timeout
                 or Configuration().EXPORTER_OTLP_METRIC_TIMEOUT,
+                "spool_directory": spool_directory,
             }
         )
 
@@ -181,7 +226,8 @@ class OTLPMetricsExporter(
         #   ----------------------------------------------
         #   Counter            Sum(aggregation_temporality=delta;is_monotonic=true)
         #   UpDownCounter      Sum(aggregation_temporality=delta;is_monotonic=false)
-        #   ValueRecorder      TBD
+        #   ValueRecorder      Histogram(aggregation_temporality=delta), only
+        #                      with DDSketchAggregator
         #   SumObserver        Sum(aggregation_temporality=cumulative;is_monotonic=true)
         #   UpDownSumObserver  Sum(aggregation_temporality=cumulative;is_monotonic=false)
         #   ValueObserver      Gauge()
@@ -198,6 +244,11 @@ class OTLPMetricsExporter(
                 int: {
                     "sum": {"class": IntSum, "argument": "int_sum"},
                     "gauge": {"class": IntGauge, "argument": "int_gauge"},
+                    "histogram": {
+                        "class": IntHistogram,
+                        "argument": "int_histogram",
+                        "data_point_class": IntHistogramDataPoint,
+                    },
                     "data_point_class": IntDataPoint,
                 },
                 float: {
@@ -206,6 +257,11 @@ class OTLPMetricsExporter(
                         "class": DoubleGauge,
                         "argument": "double_gauge",
                     },
+                    "histogram": {
+                        "class": DoubleHistogram,
+                        "argument": "double_histogram",
+                        "data_point_class": DoubleHistogramDataPoint,
+                    },
                     "data_point_class": DoubleDataPoint,
                 },
             }
@@ -241,8 +297,23 @@ class OTLPMetricsExporter(
                 argument = type_class[value_type]["sum"]["argument"]
 
             elif isinstance(sdk_metric_record.instrument, (ValueRecorder)):
-                logger.warning("Skipping exporting of ValueRecorder metric")
-                continue
+                if not isinstance(
+                    sdk_metric_record.aggregator, DDSketchAggregator
+                ):
+                    logger.warning(
+                        "Skipping exporting of ValueRecorder metric"
+                    )
+                    continue
+                histogram_type = type_class[value_type]["histogram"]
+                otlp_metric_data = histogram_type["class"](
+                    data_points=_get_histogram_data_points(
+                        sdk_metric_record, histogram_type["data_point_class"]
+                    ),
+                    aggregation_temporality=(
+                        AggregationTemporality.AGGREGATION_TEMPORALITY_DELTA
+                    ),
+                )
+                argument = histogram_type["argument"]
 
             elif isinstance(sdk_metric_record.instrument, SumObserver):
                 otlp_metric_data = sum_class(
@@ -293,7 +364,13 @@ class OTLPMetricsExporter(
 
         return ExportMetricsServiceRequest(
             resource_metrics=_get_resource_data(
-                sdk_resource_instrumentation_library_metrics,
+                {
+                    sdk_resource: [instrumentation_library_metrics]
+                    for (
+                        sdk_resource,
+                        instrumentation_library_metrics,
+                    ) in sdk_resource_instrumentation_library_metrics.items()
+                },
                 ResourceMetrics,
                 "metrics",
             )
@@ -302,3 +379,6 @@ class OTLPMetricsExporter(
     def export(self, metrics: Sequence[MetricRecord]) -> MetricsExportResult:
         # pylint: disable=arguments-differ
         return self._export(metrics)
+
+    def shutdown(self) -> None:
+        self._shutdown_retries()
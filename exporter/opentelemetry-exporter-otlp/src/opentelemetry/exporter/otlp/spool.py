@@ -0,0 +1,412 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+The OTLP exporters keep batches that failed to export because the collector
+is unavailable in memory, up to a limit. With a spool directory they store
+them on disk in a `DiskSpool` instead, and send them again in the
+background once the collector is reachable. Spooled batches survive
+restarts of the process.
+
+The spool is a directory of append-only segment files, named after their
+sequence number. Each record in a segment is an encoded export request,
+prefixed by its length and CRC-32 checksum. When a segment grows past
+``segment_bytes`` a new one is started, and when the spool grows past
+``max_bytes`` the oldest segments are evicted.
+
+When the spool is opened, segments are read back and truncated after their
+last intact record, so records torn by a crash are discarded. A segment is
+deleted once all its records have been replayed, so a record may be sent
+again if the process stops in the middle of a segment.
+
+Several processes can use the same spool directory, for example the
+workers forked by a preforking server. A spool holds a lock on a ``.lock``
+file in the directory it appends to: the first process to open the spool
+directory appends to it, the others to a subdirectory named after their
+process id. When a spool is opened, the subdirectories whose lock is not
+held, those of processes that exited or crashed, are adopted: their segments
+are moved to the opened spool, which replays them. ``max_bytes`` caps the
+size of the whole spool directory, including the subdirectories of the other
+processes. As the size of their segments is only read when a segment is
+started, the spool directory can exceed ``max_bytes`` by up to
+``segment_bytes`` per process.
+
+Locks are taken with `fcntl.flock`. On platforms without `fcntl`, a spool
+directory cannot be shared by processes.
+"""
+
+import logging
+import mmap
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# length and CRC-32 of the record
+_HEADER = struct.Struct("<II")
+_SUFFIX = ".spool"
+_LOCK_NAME = ".lock"
+
+
+class _Segment:
+    __slots__ = ("path", "size", "records")
+
+    def __init__(self, path: str, size: int = 0, records: int = 0):
+        self.path = path
+        self.size = size
+        self.records = records
+
+
+def _recover_segment(path: str) -> Tuple[int, int]:
+    """Truncates the segment after its last intact record, returns its size
+    and number of records."""
+    size = 0
+    records = 0
+    with open(path, "r+b") as segment_file:
+        file_size = os.fstat(segment_file.fileno()).st_size
+        if file_size:
+            with mmap.mmap(
+                segment_file.fileno(), 0, access=mmap.ACCESS_READ
+            ) as data:
+                while size + _HEADER.size <= file_size:
+                    length, checksum = _HEADER.unpack_from(data, size)
+                    start = size + _HEADER.size
+                    end = start + length
+                    if (
+                        end > file_size
+                        or zlib.crc32(data[start:end]) != checksum
+                    ):
+                        break
+                    size = end
+                    records += 1
+        if size < file_size:
+            logger.warning(
+                "Truncating %s bytes of incomplete records in %s.",
+                file_size - size,
+                path,
+            )
+            segment_file.truncate(size)
+    return size, records
+
+
+def _lock(path: str, create: bool = True) -> Optional[int]:
+    """Takes an exclusive lock on the lock file at ``path``.
+
+    Returns the file descriptor holding the lock, or None if another spool
+    holds it. The lock is released when the descriptor is closed, or when
+    the process exits.
+    """
+    file_descriptor = os.open(
+        path, os.O_RDWR | (os.O_CREAT if create else 0), 0o644
+    )
+    if fcntl is not None:
+        try:
+            fcntl.flock(file_descriptor, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(file_descriptor)
+            return None
+    return file_descriptor
+
+
+def _list_segments(directory: str) -> List[Tuple[int, str]]:
+    """Returns the sequence numbers and paths of the segments in
+    ``directory``, oldest first."""
+    segments = []
+    for name in os.listdir(directory):
+        if not name.endswith(_SUFFIX):
+            continue
+        try:
+            sequence = int(name[: -len(_SUFFIX)])
+        except ValueError:
+            continue
+        segments.append((sequence, os.path.join(directory, name)))
+    return sorted(segments)
+
+
+class DiskSpool:
+    """Stores encoded export requests in segment files in ``directory``.
+
+    `append` and `replay` can be called from different threads, `replay`
+    must not be called concurrently.
+
+    Args:
+        directory: The spool directory, created if needed. If another spool
+            appends to it, the segment files are stored in a subdirectory
+            named after the process id, see `path`.
+        max_bytes: The maximum size of the spool directory, the oldest
+            segments of this spool are evicted when it is exceeded.
+        segment_bytes: The size after which a new segment is started.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = 256 * 1024 * 1024,
+        segment_bytes: int = 4 * 1024 * 1024,
+    ):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be a positive integer.")
+
+        if segment_bytes <= 0 or segment_bytes > max_bytes:
+            raise ValueError(
+                "segment_bytes must be a positive integer not larger than "
+                "max_bytes."
+            )
+
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.segment_bytes = segment_bytes
+        self.evicted_batches = 0
+        self._open()
+
+    def _open(self) -> None:
+        self._lock = threading.Lock()
+        # segments by sequence number, oldest first
+        self._segments = OrderedDict()  # type: OrderedDict
+        self._size = 0
+        self._records = 0
+        # the size of the segments of the other processes
+        self._others_size = 0
+        # the segment appended to and its file
+        self._active = None  # type: Optional[_Segment]
+        self._active_file = None
+        # the offset and number of records replayed in the oldest segment
+        self._replay_offset = 0
+        self._replayed_records = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        #: The directory of the segment files of this spool
+        self.path = self.directory
+        self._lock_file = _lock(os.path.join(self.directory, _LOCK_NAME))
+        if self._lock_file is None:
+            # another process appends to the spool directory
+            self.path = os.path.join(self.directory, str(os.getpid()))
+            os.makedirs(self.path, exist_ok=True)
+            self._lock_file = _lock(os.path.join(self.path, _LOCK_NAME))
+            if self._lock_file is None:
+                raise ValueError(
+                    "The spool directory {} is already used by two spools "
+                    "of this process.".format(self.directory)
+                )
+
+        segments = _list_segments(self.path)
+        next_sequence = segments[-1][0] + 1 if segments else 0
+        self._adopt_orphans(next_sequence)
+
+        for sequence, path in _list_segments(self.path):
+            size, records = _recover_segment(path)
+            if not records:
+                os.remove(path)
+                continue
+            self._segments[sequence] = _Segment(path, size, records)
+            self._size += size
+            self._records += records
+        self._next_sequence = max(self._segments, default=-1) + 1
+        self._others_size = self._get_others_size()
+        self._evict()
+
+    def _get_partitions(self) -> List[str]:
+        """Returns the subdirectories of the processes that use the spool
+        directory."""
+        return [
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.isdigit()
+            and os.path.isdir(os.path.join(self.directory, name))
+        ]
+
+    def _adopt_orphans(self, next_sequence: int) -> None:
+        """Moves the segments of the subdirectories whose lock is not held
+        to this spool, after its own segments."""
+        for partition in self._get_partitions():
+            if partition == self.path:
+                continue
+            try:
+                lock_file = _lock(
+                    os.path.join(partition, _LOCK_NAME), create=False
+                )
+            except OSError:
+                # being created, or adopted by another spool
+                continue
+            if lock_file is None:
+                continue
+            try:
+                for _, path in _list_segments(partition):
+                    os.rename(
+                        path,
+                        os.path.join(
+                            self.path,
+                            "{:020d}{}".format(next_sequence, _SUFFIX),
+                        ),
+                    )
+                    next_sequence += 1
+                os.remove(os.path.join(partition, _LOCK_NAME))
+                os.rmdir(partition)
+            except OSError:
+                logger.exception("Failed to adopt the spool %s.", partition)
+            finally:
+                os.close(lock_file)
+
+    def _get_others_size(self) -> int:
+        """Returns the size of the segments of the other processes using the
+        spool directory."""
+        size = 0
+        for directory in [self.directory] + self._get_partitions():
+            if directory == self.path:
+                continue
+            for _, path in _list_segments(directory):
+                try:
+                    size += os.path.getsize(path)
+                except OSError:
+                    # replayed meanwhile
+                    pass
+        return size
+
+    def _at_fork_reinit(self) -> None:
+        """Called in forked child processes. Closes the files inherited from
+        the parent without releasing its lock, and opens the spool again, in
+        a subdirectory of the child if the parent appends to the spool
+        directory. The batches spooled by the parent are only replayed by
+        the parent."""
+        if self._active_file is not None:
+            self._active_file.close()
+        if self._lock_file is not None:
+            os.close(self._lock_file)
+        self._open()
+
+    @property
+    def pending_batches(self) -> int:
+        """The number of spooled batches that were not replayed yet."""
+        return self._records - self._replayed_records
+
+    @property
+    def size(self) -> int:
+        """The size of the segment files in bytes."""
+        return self._size
+
+    def append(self, payload: bytes) -> None:
+        """Appends an encoded export request to the spool."""
+        record = _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+        with self._lock:
+            if (
+                self._active is None
+                or self._active.size + len(record) > self.segment_bytes
+            ):
+                self._start_segment()
+            self._active_file.write(record)
+            self._active_file.flush()
+            self._active.size += len(record)
+            self._active.records += 1
+            self._size += len(record)
+            self._records += 1
+            self._evict()
+
+    def _start_segment(self) -> None:
+        self._seal()
+        self._others_size = self._get_others_size()
+        path = os.path.join(
+            self.path, "{:020d}{}".format(self._next_sequence, _SUFFIX)
+        )
+        self._active = self._segments[self._next_sequence] = _Segment(path)
+        self._active_file = open(path, "ab")
+        self._next_sequence += 1
+
+    def _seal(self) -> None:
+        if self._active_file is not None:
+            self._active_file.close()
+            self._active_file = None
+            self._active = None
+
+    def _evict(self) -> None:
+        while (
+            self._size + self._others_size > self.max_bytes
+            and len(self._segments) > 1
+        ):
+            _, segment = self._segments.popitem(last=False)
+            evicted = segment.records - self._replayed_records
+            logger.warning(
+                "Spool is full, evicting %s batches from %s.",
+                evicted,
+                segment.path,
+            )
+            self.evicted_batches += evicted
+            self._remove(segment)
+
+    def _remove(self, segment: _Segment) -> None:
+        """Forgets the oldest segment and deletes its file."""
+        self._size -= segment.size
+        self._records -= segment.records
+        self._replay_offset = 0
+        self._replayed_records = 0
+        try:
+            os.remove(segment.path)
+        except OSError:
+            logger.exception("Failed to delete spool segment.")
+
+    def replay(self, send: Callable[[bytes], bool]) -> int:
+        """Passes the spooled requests to ``send``, oldest first.
+
+        Stops at the first request ``send`` returns False for, it is passed
+        again on the next call. Returns the number of replayed requests.
+        """
+        replayed = 0
+        while True:
+            with self._lock:
+                if not self._segments:
+                    return replayed
+                sequence, segment = next(iter(self._segments.items()))
+                if segment is self._active:
+                    # new requests go to a new segment while this one is read
+                    self._seal()
+                offset = self._replay_offset
+
+            with open(segment.path, "rb") as segment_file, mmap.mmap(
+                segment_file.fileno(), 0, access=mmap.ACCESS_READ
+            ) as data:
+                while offset < segment.size:
+                    length, _ = _HEADER.unpack_from(data, offset)
+                    start = offset + _HEADER.size
+                    if not send(data[start : start + length]):
+                        return replayed
+                    offset = start + length
+                    replayed += 1
+                    with self._lock:
+                        if next(iter(self._segments), None) != sequence:
+                            # evicted while it was replayed
+                            break
+                        self._replay_offset = offset
+                        self._replayed_records += 1
+
+            with self._lock:
+                if next(iter(self._segments), None) == sequence:
+                    self._segments.popitem(last=False)
+                    self._remove(segment)
+
+    def close(self) -> None:
+        """Closes the segment appended to and releases the lock of the spool,
+        the spooled requests stay on disk."""
+        with self._lock:
+            self._seal()
+            if self._lock_file is not None:
+                os.close(self._lock_file)
+                self._lock_file = None
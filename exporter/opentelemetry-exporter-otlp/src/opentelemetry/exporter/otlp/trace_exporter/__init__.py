@@ -15,7 +15,9 @@
 
 import logging
 import os
-from typing import Optional, Sequence
+import threading
+from functools import lru_cache
+from typing import Any, Optional, Sequence, Text
 
 from grpc import ChannelCredentials
 
@@ -24,6 +26,7 @@ from opentelemetry.exporter.otlp.exporter import (
     OTLPExporterMixin,
     _get_resource_data,
     _load_credential_from_file,
+    _translate_instrumentation_library,
     _translate_key_values,
 )
 from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
@@ -32,7 +35,7 @@ from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
 from opentelemetry.proto.collector.trace.v1.trace_service_pb2_grpc import (
     TraceServiceStub,
 )
-from opentelemetry.proto.common.v1.common_pb2 import InstrumentationLibrary
+from opentelemetry.proto.common.v1.common_pb2 import KeyValue
 from opentelemetry.proto.trace.v1.trace_pb2 import (
     InstrumentationLibrarySpans,
     ResourceSpans,
@@ -40,30 +43,52 @@ from opentelemetry.proto.trace.v1.trace_pb2 import (
 from opentelemetry.proto.trace.v1.trace_pb2 import Span as CollectorSpan
 from opentelemetry.proto.trace.v1.trace_pb2 import Status
 from opentelemetry.sdk.trace import Span as SDKSpan
-from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.export import (
+    AsyncSpanExporter,
+    SpanBatch,
+    SpanExporter,
+    SpanExportResult,
+)
+from opentelemetry.trace import SpanKind
 from opentelemetry.trace.status import StatusCode
 
+try:
+    from grpc import aio
+except ImportError:  # grpcio < 1.32
+    aio = None
+
 logger = logging.getLogger(__name__)
 
+# KeyValue messages of attributes with these value types are cached, longer
+# strings are unlikely to repeat and are encoded every time
+_CACHED_VALUE_TYPES = (bool, str, int, float)
+_MAX_CACHED_STRING_LENGTH = 256
 
 # pylint: disable=no-member
-class OTLPSpanExporter(
-    SpanExporter,
-    OTLPExporterMixin[SDKSpan, ExportTraceServiceRequest, SpanExportResult],
+_SPAN_KINDS = {
+    kind.value: getattr(
+        CollectorSpan.SpanKind, "SPAN_KIND_{}".format(kind.name)
+    )
+    for kind in SpanKind
+}
+
+
+# pylint: disable=no-member
+class _BaseOTLPSpanExporter(
+    OTLPExporterMixin[SDKSpan, ExportTraceServiceRequest, SpanExportResult]
 ):
     # pylint: disable=unsubscriptable-object
-    """OTLP span exporter
-
-    Args:
-        endpoint: OpenTelemetry Collector receiver endpoint
-        insecure: Connection type
-        credentials: Credentials object for server authentication
-        headers: Headers to send when exporting
-        timeout: Backend request timeout in seconds
-    """
+    """Configuration and span translation shared by `OTLPSpanExporter` and
+    `AsyncOTLPSpanExporter`."""
 
     _result = SpanExportResult
     _stub = TraceServiceStub
+    _export_method_path = (
+        "/opentelemetry.proto.collector.trace.v1.TraceService/Export"
+    )
+
+    #: The number of encoded attribute key/value pairs that are cached
+    key_value_cache_size = 1024
 
     def __init__(
         self,
@@ -72,6 +97,7 @@ class OTLPSpanExporter(
         credentials: Optional[ChannelCredentials] = None,
         headers: Optional[str] = None,
         timeout: Optional[int] = None,
+        spool_directory: Optional[str] = None,
     ):
         if insecure is None:
             insecure = Configuration().EXPORTER_OTLP_SPAN_INSECURE
@@ -94,35 +120,32 @@ class OTLPSpanExporter(
                 or Configuration().EXPORTER_OTLP_SPAN_HEADERS,
                 "timeout": timeout
                 or Configuration().EXPORTER_OTLP_SPAN_TIMEOUT,
+                "spool_directory": spool_directory,
             }
         )
-
-    def _translate_name(self, sdk_span: SDKSpan) -> None:
-        self._collector_span_kwargs["name"] = sdk_span.name
-
-    def _translate_start_time(self, sdk_span: SDKSpan) -> None:
-        self._collector_span_kwargs[
-            "start_time_unix_nano"
-        ] = sdk_span.start_time
-
-    def _translate_end_time(self, sdk_span: SDKSpan) -> None:
-        self._collector_span_kwargs["end_time_unix_nano"] = sdk_span.end_time
-
-    def _translate_span_id(self, sdk_span: SDKSpan) -> None:
-        self._collector_span_kwargs[
-            "span_id"
-        ] = sdk_span.context.span_id.to_bytes(8, "big")
-
-    def _translate_trace_id(self, sdk_span: SDKSpan) -> None:
-        self._collector_span_kwargs[
-            "trace_id"
-        ] = sdk_span.context.trace_id.to_bytes(16, "big")
-
-    def _translate_parent(self, sdk_span: SDKSpan) -> None:
-        if sdk_span.parent is not None:
-            self._collector_span_kwargs[
-                "parent_span_id"
-            ] = sdk_span.parent.span_id.to_bytes(8, "big")
+        # the _translate_* methods share _collector_span_kwargs, the lock
+        # allows concurrent exports to still send their requests in parallel
+        self._translate_lock = threading.Lock()
+        # typed, as True, 1 and 1.0 are equal but encode differently
+        self._translate_cached_key_values = lru_cache(
+            maxsize=self.key_value_cache_size, typed=True
+        )(_translate_key_values)
+
+    def key_value_cache_info(self):
+        """Returns the statistics of the cache of encoded attributes.
+
+        The result is the named tuple of `functools.lru_cache`'s
+        ``cache_info()``: ``hits``, ``misses``, ``maxsize`` and
+        ``currsize``.
+        """
+        return self._translate_cached_key_values.cache_info()
+
+    def _translate_key_value(self, key: Text, value: Any) -> KeyValue:
+        if type(value) in _CACHED_VALUE_TYPES and (
+            type(value) is not str or len(value) <= _MAX_CACHED_STRING_LENGTH
+        ):
+            return self._translate_cached_key_values(key, value)
+        return _translate_key_values(key, value)
 
     def _translate_context_trace_state(self, sdk_span: SDKSpan) -> None:
         if sdk_span.context.trace_state is not None:
@@ -142,7 +165,7 @@ class OTLPSpanExporter(
 
                 try:
                     self._collector_span_kwargs["attributes"].append(
-                        _translate_key_values(key, value)
+                        self._translate_key_value(key, value)
                     )
                 except Exception as error:  # pylint: disable=broad-except
                     logger.exception(error)
@@ -161,7 +184,7 @@ class OTLPSpanExporter(
                 for key, value in sdk_span_event.attributes.items():
                     try:
                         collector_span_event.attributes.append(
-                            _translate_key_values(key, value)
+                            self._translate_key_value(key, value)
                         )
                     # pylint: disable=broad-except
                     except Exception as error:
@@ -187,7 +210,7 @@ class OTLPSpanExporter(
                 for key, value in sdk_span_link.attributes.items():
                     try:
                         collector_span_link.attributes.append(
-                            _translate_key_values(key, value)
+                            self._translate_key_value(key, value)
                         )
                     # pylint: disable=broad-except
                     except Exception as error:
@@ -210,54 +233,77 @@ class OTLPSpanExporter(
     def _translate_data(
         self, data: Sequence[SDKSpan]
     ) -> ExportTraceServiceRequest:
-        # pylint: disable=attribute-defined-outside-init
-
-        sdk_resource_instrumentation_library_spans = {}
+        with self._translate_lock:
+            return self._translate_spans(data)
 
-        for sdk_span in data:
+    def _translate_spans(
+        self, data: Sequence[SDKSpan]
+    ) -> ExportTraceServiceRequest:
+        # pylint: disable=attribute-defined-outside-init
 
-            if sdk_span.resource not in (
-                sdk_resource_instrumentation_library_spans.keys()
-            ):
-                if sdk_span.instrumentation_info is not None:
-                    instrumentation_library_spans = InstrumentationLibrarySpans(
-                        instrumentation_library=InstrumentationLibrary(
-                            name=sdk_span.instrumentation_info.name,
-                            version=sdk_span.instrumentation_info.version,
+        batch = SpanBatch.create(data)
+        # ids and kinds are encoded from the batch columns, trace ids once
+        # per distinct trace
+        trace_ids = [
+            trace_id.to_bytes(16, "big") for trace_id in batch.trace_ids
+        ]
+        # keyed by the resource and instrumentation info indices of the batch
+        # to avoid hashing resources per span
+        library_spans_by_index = {}
+
+        for index, sdk_span in enumerate(batch):
+            key = (
+                batch.resource_indices[index],
+                batch.instrumentation_info_indices[index],
+            )
+            library_spans = library_spans_by_index.get(key)
+
+            if library_spans is None:
+                instrumentation_info = batch.instrumentation_infos[key[1]]
+                if instrumentation_info is not None:
+                    library_spans = InstrumentationLibrarySpans(
+                        instrumentation_library=(
+                            _translate_instrumentation_library(
+                                instrumentation_info
+                            )
                         )
                     )
-
                 else:
-                    instrumentation_library_spans = (
-                        InstrumentationLibrarySpans()
-                    )
+                    library_spans = InstrumentationLibrarySpans()
 
-                sdk_resource_instrumentation_library_spans[
-                    sdk_span.resource
-                ] = instrumentation_library_spans
+                library_spans_by_index[key] = library_spans
 
-            self._collector_span_kwargs = {}
+            self._collector_span_kwargs = {
+                "name": batch.names[batch.name_indices[index]],
+                "start_time_unix_nano": batch.start_times[index],
+                "end_time_unix_nano": batch.end_times[index],
+                "span_id": batch.span_ids[index].to_bytes(8, "big"),
+                "trace_id": trace_ids[batch.trace_id_indices[index]],
+                "kind": _SPAN_KINDS[batch.kinds[index]],
+            }
+            if batch.parent_span_ids[index]:
+                self._collector_span_kwargs[
+                    "parent_span_id"
+                ] = batch.parent_span_ids[index].to_bytes(8, "big")
 
-            self._translate_name(sdk_span)
-            self._translate_start_time(sdk_span)
-            self._translate_end_time(sdk_span)
-            self._translate_span_id(sdk_span)
-            self._translate_trace_id(sdk_span)
-            self._translate_parent(sdk_span)
             self._translate_context_trace_state(sdk_span)
             self._translate_attributes(sdk_span)
             self._translate_events(sdk_span)
             self._translate_links(sdk_span)
             self._translate_status(sdk_span)
 
-            self._collector_span_kwargs["kind"] = getattr(
-                CollectorSpan.SpanKind,
-                "SPAN_KIND_{}".format(sdk_span.kind.name),
+            library_spans.spans.append(
+                CollectorSpan(**self._collector_span_kwargs)
             )
 
-            sdk_resource_instrumentation_library_spans[
-                sdk_span.resource
-            ].spans.append(CollectorSpan(**self._collector_span_kwargs))
+        sdk_resource_instrumentation_library_spans = {}
+        for (
+            (resource_index, _),
+            library_spans,
+        ) in library_spans_by_index.items():
+            sdk_resource_instrumentation_library_spans.setdefault(
+                batch.resources[resource_index], []
+            ).append(library_spans)
 
         return ExportTraceServiceRequest(
             resource_spans=_get_resource_data(
@@ -267,5 +313,77 @@ class OTLPSpanExporter(
             )
         )
 
+
+class OTLPSpanExporter(SpanExporter, _BaseOTLPSpanExporter):
+    """OTLP span exporter
+
+    Args:
+        endpoint: OpenTelemetry Collector receiver endpoint
+        insecure: Connection type
+        credentials: Credentials object for server authentication
+        headers: Headers to send when exporting
+        timeout: Backend request timeout in seconds
+        spool_directory: Directory to store spans in while the collector is
+            unavailable, see `opentelemetry.exporter.otlp.spool`
+    """
+
+    _spool_name = "traces"
+    accepts_span_batch = True
+
     def export(self, spans: Sequence[SDKSpan]) -> SpanExportResult:
         return self._export(spans)
+
+    def shutdown(self) -> None:
+        self._shutdown_retries()
+
+
+class AsyncOTLPSpanExporter(AsyncSpanExporter, _BaseOTLPSpanExporter):
+    """OTLP span exporter sending spans through the non-blocking
+    ``grpc.aio`` API, requires grpcio 1.32 or newer.
+
+    It has to be created and used on the event loop of an
+    `AsyncBatchSpanProcessor`.
+
+    Args:
+        endpoint: OpenTelemetry Collector receiver endpoint
+        insecure: Connection type
+        credentials: Credentials object for server authentication
+        headers: Headers to send when exporting
+        timeout: Backend request timeout in seconds
+    """
+
+    accepts_span_batch = True
+
+    def __init__(
+        self,
+        endpoint: Optional[str] = None,
+        insecure: Optional[bool] = None,
+        credentials: Optional[ChannelCredentials] = None,
+        headers: Optional[str] = None,
+        timeout: Optional[int] = None,
+    ):
+        if aio is None:
+            raise ImportError(
+                "AsyncOTLPSpanExporter requires grpcio 1.32 or newer."
+            )
+        super().__init__(
+            endpoint=endpoint,
+            insecure=insecure,
+            credentials=credentials,
+            headers=headers,
+            timeout=timeout,
+        )
+
+    @staticmethod
+    def _insecure_channel(*args, **kwargs):
+        return aio.insecure_channel(*args, **kwargs)
+
+    @staticmethod
+    def _secure_channel(*args, **kwargs):
+        return aio.secure_channel(*args, **kwargs)
+
+    async def export(self, spans: Sequence[SDKSpan]) -> SpanExportResult:
+        return await self._async_export(spans)
+
+    async def shutdown(self) -> None:
+        await self._channel.close()
@@ -0,0 +1,47 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import tempfile
+
+import pytest
+
+from opentelemetry.exporter.otlp.spool import DiskSpool
+
+# the size of an encoded batch of a few hundred spans
+PAYLOAD = bytes(range(256)) * 256
+
+
+@pytest.mark.parametrize("segment_bytes", [1024 * 1024, 16 * 1024 * 1024])
+def test_append(benchmark, segment_bytes):
+    with tempfile.TemporaryDirectory() as directory:
+        spool = DiskSpool(
+            directory, max_bytes=64 * 1024 * 1024, segment_bytes=segment_bytes,
+        )
+        benchmark(spool.append, PAYLOAD)
+        spool.close()
+    benchmark.extra_info["payload_bytes"] = len(PAYLOAD)
+
+
+def test_replay(benchmark):
+    with tempfile.TemporaryDirectory() as directory:
+        spool = DiskSpool(directory)
+
+        def setup():
+            for _ in range(64):
+                spool.append(PAYLOAD)
+
+        benchmark.pedantic(
+            spool.replay, args=(lambda payload: True,), setup=setup, rounds=20
+        )
+        spool.close()
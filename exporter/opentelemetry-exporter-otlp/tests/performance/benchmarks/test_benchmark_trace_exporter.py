@@ -0,0 +1,58 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from opentelemetry.exporter.otlp.trace_exporter import OTLPSpanExporter
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SpanBatch
+
+NUM_SPANS = 512
+
+
+def _create_batch():
+    tracer = TracerProvider(
+        resource=Resource({"service.name": "benchmark"}),
+        shutdown_on_exit=False,
+    ).get_tracer("benchmark")
+    spans = []
+    for index in range(NUM_SPANS):
+        span = tracer.start_span(
+            "benchmarkedSpan",
+            attributes={
+                "http.method": "GET",
+                "http.scheme": "https",
+                "http.status_code": 200,
+                "http.target": "/resource/{}".format(index % 16),
+                "db.system": "postgresql",
+            },
+        )
+        span.end()
+        spans.append(span)
+    return SpanBatch(spans)
+
+
+def test_translate_and_serialize(benchmark):
+    exporter = OTLPSpanExporter(insecure=True)
+    batch = _create_batch()
+
+    def translate_and_serialize():
+        # pylint: disable=protected-access
+        return exporter._translate_data(batch).SerializeToString()
+
+    benchmark(translate_and_serialize)
+    cache_info = exporter.key_value_cache_info()
+    benchmark.extra_info["spans"] = NUM_SPANS
+    benchmark.extra_info["key_value_cache_hit_rate"] = cache_info.hits / (
+        cache_info.hits + cache_info.misses
+    )
@@ -30,6 +30,8 @@ from opentelemetry.proto.common.v1.common_pb2 import (
 )
 from opentelemetry.proto.metrics.v1.metrics_pb2 import (
     AggregationTemporality,
+    DoubleHistogram,
+    DoubleHistogramDataPoint,
     InstrumentationLibraryMetrics,
     IntDataPoint,
     IntSum,
@@ -39,9 +41,12 @@ from opentelemetry.proto.metrics.v1.metrics_pb2 import ResourceMetrics
 from opentelemetry.proto.resource.v1.resource_pb2 import (
     Resource as OTLPResource,
 )
-from opentelemetry.sdk.metrics import Counter, MeterProvider
+from opentelemetry.sdk.metrics import Counter, MeterProvider, ValueRecorder
 from opentelemetry.sdk.metrics.export import MetricRecord
-from opentelemetry.sdk.metrics.export.aggregate import SumAggregator
+from opentelemetry.sdk.metrics.export.aggregate import (
+    DDSketchAggregator,
+    SumAggregator,
+)
 from opentelemetry.sdk.resources import Resource as SDKResource
 
 
@@ -149,3 +154,55 @@ class TestOTLPMetricExporter(TestCase):
         actual = self.exporter._translate_data([self.counter_metric_record])
 
         self.assertEqual(expected, actual)
+
+    def test_translate_value_recorder_sketch(self):
+        # pylint: disable=no-member
+        resource = self.counter_metric_record.resource
+        aggregator = DDSketchAggregator()
+        for value in (-1.5, 0.0, 1.0, 2.0, 2.0):
+            aggregator.update(value)
+        aggregator.take_checkpoint()
+        record = MetricRecord(
+            ValueRecorder(
+                "latency",
+                "d",
+                "ms",
+                float,
+                MeterProvider(resource=resource).get_meter(__name__),
+                ("f",),
+            ),
+            [("g", "h")],
+            aggregator,
+            resource,
+        )
+
+        # pylint: disable=protected-access
+        actual = self.exporter._translate_data([record])
+
+        gamma = aggregator.checkpoint.gamma
+        metric = (
+            actual.resource_metrics[0]
+            .instrumentation_library_metrics[0]
+            .metrics[0]
+        )
+        self.assertEqual(
+            metric.double_histogram,
+            DoubleHistogram(
+                data_points=[
+                    DoubleHistogramDataPoint(
+                        labels=[StringKeyValue(key="g", value="h")],
+                        count=5,
+                        sum=3.5,
+                        bucket_counts=[1, 1, 1, 2, 0],
+                        explicit_bounds=[-(gamma ** 20), 0, 1.0, gamma ** 35,],
+                        start_time_unix_nano=(
+                            aggregator.initial_checkpoint_timestamp
+                        ),
+                        time_unix_nano=aggregator.last_update_timestamp,
+                    )
+                ],
+                aggregation_temporality=(
+                    AggregationTemporality.AGGREGATION_TEMPORALITY_DELTA
+                ),
+            ),
+        )
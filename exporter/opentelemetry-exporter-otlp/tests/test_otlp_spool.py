@@ -0,0 +1,189 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+from unittest import TestCase
+
+from opentelemetry.exporter.otlp.spool import DiskSpool
+
+
+class TestDiskSpool(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def _open(self, **kwargs):
+        spool = DiskSpool(self.directory, **kwargs)
+        self.addCleanup(spool.close)
+        return spool
+
+    @staticmethod
+    def _replay_all(spool):
+        payloads = []
+        spool.replay(lambda payload: payloads.append(payload) or True)
+        return payloads
+
+    def _segments(self):
+        return sorted(
+            name
+            for name in os.listdir(self.directory)
+            if name.endswith(".spool")
+        )
+
+    def test_append_and_replay(self):
+        spool = self._open(max_bytes=1024, segment_bytes=64)
+        payloads = [bytes([index]) * 20 for index in range(6)]
+        for payload in payloads:
+            spool.append(payload)
+
+        self.assertEqual(spool.pending_batches, 6)
+        self.assertEqual(len(self._segments()), 3)
+        self.assertEqual(self._replay_all(spool), payloads)
+        self.assertEqual(spool.pending_batches, 0)
+        self.assertEqual(spool.size, 0)
+        self.assertEqual(self._segments(), [])
+
+        spool.append(b"after")
+        self.assertEqual(self._replay_all(spool), [b"after"])
+
+    def test_replay_stops_on_failure(self):
+        spool = self._open()
+        for payload in (b"a", b"b", b"c"):
+            spool.append(payload)
+
+        sent = []
+
+        def send(payload):
+            sent.append(payload)
+            return payload != b"b"
+
+        self.assertEqual(spool.replay(send), 1)
+        self.assertEqual(spool.pending_batches, 2)
+        # new batches are appended while a segment is replayed
+        spool.append(b"d")
+        self.assertEqual(self._replay_all(spool), [b"b", b"c", b"d"])
+        self.assertEqual(sent, [b"a", b"b"])
+
+    def test_reopen(self):
+        spool = self._open()
+        spool.append(b"first")
+        spool.append(b"second")
+        spool.close()
+
+        spool = self._open()
+        self.assertEqual(spool.pending_batches, 2)
+        spool.append(b"third")
+        self.assertEqual(
+            self._replay_all(spool), [b"first", b"second", b"third"]
+        )
+
+    def test_truncate_incomplete_record(self):
+        spool = self._open()
+        spool.append(b"intact")
+        spool.append(b"torn")
+        spool.close()
+
+        path = os.path.join(self.directory, self._segments()[0])
+        size = os.path.getsize(path)
+        with open(path, "r+b") as segment_file:
+            segment_file.truncate(size - 1)
+
+        with self.assertLogs(level="WARNING"):
+            spool = self._open()
+        self.assertEqual(spool.pending_batches, 1)
+        self.assertEqual(os.path.getsize(path), size - len(b"torn") - 8)
+        self.assertEqual(self._replay_all(spool), [b"intact"])
+
+    def test_truncate_corrupt_record(self):
+        spool = self._open()
+        spool.append(b"intact")
+        spool.append(b"corrupt")
+        spool.close()
+
+        path = os.path.join(self.directory, self._segments()[0])
+        with open(path, "r+b") as segment_file:
+            segment_file.seek(-1, os.SEEK_END)
+            segment_file.write(b"!")
+
+        with self.assertLogs(level="WARNING"):
+            spool = self._open()
+        self.assertEqual(self._replay_all(spool), [b"intact"])
+
+    def test_evict_oldest(self):
+        # records of 25 bytes, two per segment
+        spool = self._open(max_bytes=100, segment_bytes=50)
+        payloads = [bytes([index]) * 17 for index in range(6)]
+        for payload in payloads[:4]:
+            spool.append(payload)
+        self.assertEqual(spool.evicted_batches, 0)
+        with self.assertLogs(level="WARNING"):
+            spool.append(payloads[4])
+        spool.append(payloads[5])
+
+        self.assertEqual(spool.evicted_batches, 2)
+        self.assertLessEqual(spool.size, 100)
+        self.assertEqual(self._replay_all(spool), payloads[2:])
+
+    def test_shared_directory(self):
+        # records of 25 bytes, two per segment
+        spool = self._open(max_bytes=100, segment_bytes=50)
+        other_spool = self._open(max_bytes=100, segment_bytes=50)
+        self.assertEqual(spool.path, self.directory)
+        self.assertEqual(
+            other_spool.path, os.path.join(self.directory, str(os.getpid())),
+        )
+
+        payloads = [bytes([index]) * 17 for index in range(4)]
+        for payload in payloads:
+            spool.append(payload)
+        other_payloads = [bytes([index]) * 17 for index in range(4, 7)]
+        with self.assertLogs(level="WARNING"):
+            for payload in other_payloads:
+                other_spool.append(payload)
+        # the segments of the other spool count towards the cap
+        self.assertEqual(other_spool.evicted_batches, 2)
+        with self.assertLogs(level="WARNING"):
+            spool.append(b"\xff" * 17)
+        self.assertEqual(spool.evicted_batches, 2)
+        self.assertEqual(spool.size + other_spool.size, 100)
+
+        self.assertEqual(
+            self._replay_all(spool), payloads[2:] + [b"\xff" * 17]
+        )
+        self.assertEqual(self._replay_all(other_spool), other_payloads[2:])
+
+    def test_adopt_orphans(self):
+        orphan = DiskSpool(os.path.join(self.directory, "1"))
+        orphan.append(b"orphan")
+        # the lock is released as when the process exits
+        orphan.close()
+        live = DiskSpool(os.path.join(self.directory, "2"))
+        self.addCleanup(live.close)
+        live.append(b"live")
+
+        spool = self._open()
+        self.assertEqual(spool.path, self.directory)
+        self.assertEqual(self._replay_all(spool), [b"orphan"])
+        self.assertFalse(os.path.exists(os.path.join(self.directory, "1")))
+        # the lock of the live spool is held
+        self.assertEqual(live.pending_batches, 1)
+        self.assertEqual(self._replay_all(live), [b"live"])
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            DiskSpool(self.directory, max_bytes=0)
+        with self.assertRaises(ValueError):
+            DiskSpool(self.directory, max_bytes=10, segment_bytes=20)
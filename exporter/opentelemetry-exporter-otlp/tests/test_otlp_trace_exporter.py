@@ -12,6 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import os
+import select
+import signal
+import tempfile
+import time
+import unittest
 from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor
 from unittest import TestCase
@@ -22,7 +29,15 @@ from google.rpc.error_details_pb2 import RetryInfo
 from grpc import ChannelCredentials, StatusCode, server
 
 from opentelemetry.configuration import Configuration
-from opentelemetry.exporter.otlp.trace_exporter import OTLPSpanExporter
+from opentelemetry.exporter.otlp.exporter import (
+    _translate_instrumentation_library,
+    _translate_resource,
+)
+from opentelemetry.exporter.otlp.spool import DiskSpool, _list_segments
+from opentelemetry.exporter.otlp.trace_exporter import (
+    AsyncOTLPSpanExporter,
+    OTLPSpanExporter,
+)
 from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
     ExportTraceServiceRequest,
     ExportTraceServiceResponse,
@@ -48,7 +63,9 @@ from opentelemetry.proto.trace.v1.trace_pb2 import Status
 from opentelemetry.sdk.resources import Resource as SDKResource
 from opentelemetry.sdk.trace import TracerProvider, _Span
 from opentelemetry.sdk.trace.export import (
+    BatchExportSpanProcessor,
     SimpleExportSpanProcessor,
+    SpanBatch,
     SpanExportResult,
 )
 from opentelemetry.sdk.util.instrumentation import InstrumentationInfo
@@ -84,6 +101,21 @@ class TraceServiceServicerUNAVAILABLE(TraceServiceServicer):
         return ExportTraceServiceResponse()
 
 
+class TraceServiceServicerUNAVAILABLEOnce(TraceServiceServicer):
+    # pylint: disable=invalid-name,unused-argument,no-self-use
+    def __init__(self):
+        self.requests = []
+
+    def Export(self, request, context):
+        self.requests.append(request)
+        if len(self.requests) == 1:
+            context.set_code(StatusCode.UNAVAILABLE)
+        else:
+            context.set_code(StatusCode.OK)
+
+        return ExportTraceServiceResponse()
+
+
 class TraceServiceServicerSUCCESS(TraceServiceServicer):
     # pylint: disable=invalid-name,unused-argument,no-self-use
     def Export(self, request, context):
@@ -158,6 +190,7 @@ class TestOTLPSpanExporter(TestCase):
         Configuration._reset()  # pylint: disable=protected-access
 
     def tearDown(self):
+        self.exporter.shutdown()
         self.server.stop(None)
         Configuration._reset()  # pylint: disable=protected-access
 
@@ -183,11 +216,8 @@ class TestOTLPSpanExporter(TestCase):
         self.assertIsNotNone(kwargs["credentials"])
         self.assertIsInstance(kwargs["credentials"], ChannelCredentials)
 
-    @patch("opentelemetry.exporter.otlp.exporter.expo")
-    @patch("opentelemetry.exporter.otlp.exporter.sleep")
-    def test_unavailable(self, mock_sleep, mock_expo):
-
-        mock_expo.configure_mock(**{"return_value": [1]})
+    @patch("opentelemetry.exporter.otlp.exporter._RetryScheduler.schedule")
+    def test_unavailable(self, mock_schedule):
 
         add_TraceServiceServicer_to_server(
             TraceServiceServicerUNAVAILABLE(), self.server
@@ -195,13 +225,12 @@ class TestOTLPSpanExporter(TestCase):
         self.assertEqual(
             self.exporter.export([self.span]), SpanExportResult.FAILURE
         )
-        mock_sleep.assert_called_with(1)
-
-    @patch("opentelemetry.exporter.otlp.exporter.expo")
-    @patch("opentelemetry.exporter.otlp.exporter.sleep")
-    def test_unavailable_delay(self, mock_sleep, mock_expo):
+        mock_schedule.assert_called_once_with(
+            self.exporter._translate_data([self.span]).SerializeToString(), 1,
+        )
 
-        mock_expo.configure_mock(**{"return_value": [1]})
+    @patch("opentelemetry.exporter.otlp.exporter._RetryScheduler.schedule")
+    def test_unavailable_delay(self, mock_schedule):
 
         add_TraceServiceServicer_to_server(
             TraceServiceServicerUNAVAILABLEDelay(), self.server
@@ -209,7 +238,179 @@ class TestOTLPSpanExporter(TestCase):
         self.assertEqual(
             self.exporter.export([self.span]), SpanExportResult.FAILURE
         )
-        mock_sleep.assert_called_with(4)
+        self.assertEqual(mock_schedule.call_args[0][1], 4)
+
+    def _wait_for(self, condition):
+        for _ in range(500):
+            if condition():
+                return
+            time.sleep(0.01)
+        self.fail("Timed out waiting for retries")
+
+    @patch("opentelemetry.exporter.otlp.exporter._INITIAL_RETRY_DELAY", 0)
+    def test_retry(self):
+        servicer = TraceServiceServicerUNAVAILABLEOnce()
+        add_TraceServiceServicer_to_server(servicer, self.server)
+
+        self.assertEqual(
+            self.exporter.export([self.span]), SpanExportResult.FAILURE
+        )
+        self._wait_for(lambda: len(servicer.requests) == 2)
+
+        self.assertEqual(servicer.requests[0], servicer.requests[1])
+        self.assertEqual(self.exporter.retried_batches, 1)
+        self.assertEqual(self.exporter.abandoned_batches, 0)
+        # fresh batches are sent while the failed one waits to be retried
+        self.assertEqual(
+            self.exporter.export([self.span]), SpanExportResult.SUCCESS
+        )
+
+    @patch("opentelemetry.exporter.otlp.exporter._INITIAL_RETRY_DELAY", 0.01)
+    def test_retry_timeout(self):
+        add_TraceServiceServicer_to_server(
+            TraceServiceServicerUNAVAILABLE(), self.server
+        )
+        self.exporter.retry_timeout = 0.05
+
+        with self.assertLogs(level="WARNING"):
+            self.exporter.export([self.span])
+            self._wait_for(lambda: self.exporter.abandoned_batches == 1)
+        self.assertEqual(self.exporter.retried_batches, 1)
+
+    @patch("opentelemetry.exporter.otlp.exporter._INITIAL_RETRY_DELAY", 60)
+    def test_max_retry_batches(self):
+        add_TraceServiceServicer_to_server(
+            TraceServiceServicerUNAVAILABLE(), self.server
+        )
+        self.exporter.max_retry_batches = 1
+
+        with self.assertLogs(level="WARNING"):
+            self.exporter.export([self.span])
+            self.exporter.export([self.span])
+        self.assertEqual(self.exporter.retried_batches, 1)
+        self.assertEqual(self.exporter.abandoned_batches, 1)
+
+        with self.assertLogs(level="WARNING"):
+            self.exporter.shutdown()
+        self.assertEqual(self.exporter.abandoned_batches, 2)
+
+    @patch("opentelemetry.exporter.otlp.exporter._INITIAL_RETRY_DELAY", 0.01)
+    def test_spool(self):
+        servicer = TraceServiceServicerUNAVAILABLEOnce()
+        add_TraceServiceServicer_to_server(servicer, self.server)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        exporter = OTLPSpanExporter(
+            insecure=True, spool_directory=directory.name
+        )
+        self.addCleanup(exporter.shutdown)
+        spool_directory = os.path.join(directory.name, "traces")
+
+        self.assertEqual(
+            exporter.export([self.span]), SpanExportResult.FAILURE
+        )
+        self.assertEqual(exporter.retried_batches, 0)
+        self._wait_for(lambda: len(servicer.requests) == 2)
+
+        self.assertEqual(servicer.requests[0], servicer.requests[1])
+        self._wait_for(lambda: not _list_segments(spool_directory))
+
+    @patch("opentelemetry.exporter.otlp.exporter._INITIAL_RETRY_DELAY", 0.01)
+    def test_spool_replay_after_restart(self):
+        servicer = TraceServiceServicerSUCCESS()
+        add_TraceServiceServicer_to_server(servicer, self.server)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        spool_directory = os.path.join(directory.name, "traces")
+
+        spool = DiskSpool(spool_directory)
+        spool.append(
+            self.exporter._translate_data([self.span]).SerializeToString()
+        )
+        spool.close()
+
+        exporter = OTLPSpanExporter(
+            insecure=True, spool_directory=directory.name
+        )
+        self.addCleanup(exporter.shutdown)
+        self._wait_for(lambda: not _list_segments(spool_directory))
+
+    @patch("opentelemetry.exporter.otlp.exporter._INITIAL_RETRY_DELAY", 60)
+    def test_at_fork_reinit(self):
+        add_TraceServiceServicer_to_server(
+            TraceServiceServicerUNAVAILABLE(), self.server
+        )
+        self.exporter.export([self.span])
+        retry_scheduler = self.exporter._retry_scheduler
+        self.assertIsNotNone(retry_scheduler._thread)
+
+        # as called in a forked child process
+        self.exporter._at_fork_reinit()
+
+        # the batches of the parent are only retried by the parent
+        self.assertEqual(retry_scheduler._heap, [])
+        self.assertIsNone(retry_scheduler._thread)
+
+        self.exporter.export([self.span])
+        self.assertIsNotNone(retry_scheduler._thread)
+        self.assertEqual(len(retry_scheduler._heap), 1)
+
+    @unittest.skipUnless(
+        hasattr(os, "register_at_fork"), "requires os.register_at_fork"
+    )
+    @patch("opentelemetry.exporter.otlp.exporter._INITIAL_RETRY_DELAY", 60)
+    def test_fork_spool_adopted(self):
+        add_TraceServiceServicer_to_server(
+            TraceServiceServicerUNAVAILABLE(), self.server
+        )
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        exporter = OTLPSpanExporter(
+            insecure=True, spool_directory=directory.name
+        )
+        self.addCleanup(exporter.shutdown)
+        spool_directory = os.path.join(directory.name, "traces")
+        payload = self.exporter._translate_data(
+            [self.span]
+        ).SerializeToString()
+
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            try:
+                os.close(read_fd)
+                # the collector stays unavailable to the child, which does
+                # not use the gRPC channel of the parent
+                exporter._send = lambda payload, delay: (
+                    SpanExportResult.FAILURE,
+                    60,
+                )
+                exporter.export([self.span])
+                os.write(write_fd, exporter._spool.path.encode())
+                time.sleep(60)
+            finally:
+                os._exit(0)  # pylint: disable=protected-access
+
+        os.close(write_fd)
+        readable, _, _ = select.select([read_fd], [], [], 10)
+        child_path = os.read(read_fd, 1024).decode() if readable else ""
+        os.close(read_fd)
+        # the child crashes with its batch spooled
+        os.kill(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+        self.assertEqual(child_path, os.path.join(spool_directory, str(pid)))
+
+        # as opened by the next worker forked by the parent
+        spool = DiskSpool(spool_directory)
+        self.addCleanup(spool.close)
+        self.assertEqual(
+            spool.path, os.path.join(spool_directory, str(os.getpid()))
+        )
+        self.assertFalse(os.path.exists(child_path))
+        self.assertEqual(spool.pending_batches, 1)
+        replayed = []
+        spool.replay(lambda payload: replayed.append(payload) or True)
+        self.assertEqual(replayed, [payload])
 
     def test_success(self):
         add_TraceServiceServicer_to_server(
@@ -219,6 +420,31 @@ class TestOTLPSpanExporter(TestCase):
             self.exporter.export([self.span]), SpanExportResult.SUCCESS
         )
 
+    def test_export_span_batch(self):
+        add_TraceServiceServicer_to_server(
+            TraceServiceServicerSUCCESS(), self.server
+        )
+        span_processor = BatchExportSpanProcessor(self.exporter)
+
+        with patch.object(
+            SpanBatch,
+            "__init__",
+            autospec=True,
+            side_effect=SpanBatch.__init__,
+        ) as init_mock, patch.object(
+            self.exporter,
+            "_translate_data",
+            wraps=self.exporter._translate_data,
+        ) as translate_mock:
+            span_processor.on_end(self.span)
+            span_processor.force_flush()
+        span_processor.shutdown()
+
+        # the exporter translates the batch of the span processor
+        (batch,), _ = translate_mock.call_args
+        self.assertIsInstance(batch, SpanBatch)
+        self.assertEqual(init_mock.call_count, 1)
+
     def test_failure(self):
         add_TraceServiceServicer_to_server(
             TraceServiceServicerALREADY_EXISTS(), self.server
@@ -227,6 +453,53 @@ class TestOTLPSpanExporter(TestCase):
             self.exporter.export([self.span]), SpanExportResult.FAILURE
         )
 
+    def _async_export(self, **kwargs):
+        async def export():
+            exporter = AsyncOTLPSpanExporter(insecure=True, **kwargs)
+            try:
+                return await exporter.export([self.span])
+            finally:
+                await exporter.shutdown()
+
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(export())
+        finally:
+            loop.close()
+
+    def test_async_success(self):
+        add_TraceServiceServicer_to_server(
+            TraceServiceServicerSUCCESS(), self.server
+        )
+        self.assertEqual(self._async_export(), SpanExportResult.SUCCESS)
+
+    def test_async_failure(self):
+        add_TraceServiceServicer_to_server(
+            TraceServiceServicerALREADY_EXISTS(), self.server
+        )
+        self.assertEqual(self._async_export(), SpanExportResult.FAILURE)
+
+    @patch("opentelemetry.exporter.otlp.exporter.expo")
+    def test_async_unavailable(self, mock_expo):
+        mock_expo.configure_mock(**{"return_value": [0]})
+
+        add_TraceServiceServicer_to_server(
+            TraceServiceServicerUNAVAILABLE(), self.server
+        )
+        self.assertEqual(self._async_export(), SpanExportResult.FAILURE)
+
+    def test_async_unavailable_timeout(self):
+        add_TraceServiceServicer_to_server(
+            TraceServiceServicerUNAVAILABLEDelay(), self.server
+        )
+        start = time.monotonic()
+        with self.assertLogs(level="WARNING"):
+            self.assertEqual(
+                self._async_export(timeout=2), SpanExportResult.FAILURE
+            )
+        # the 4s retry delay would exceed the timeout, so it is not awaited
+        self.assertLess(time.monotonic() - start, 2)
+
     def test_translate_spans(self):
 
         expected = ExportTraceServiceRequest(
@@ -329,3 +602,88 @@ class TestOTLPSpanExporter(TestCase):
 
         # pylint: disable=protected-access
         self.assertEqual(expected, self.exporter._translate_data([self.span]))
+
+    def test_translate_spans_instrumentation_libraries(self):
+        tracer_provider = TracerProvider(
+            resource=SDKResource({"service.name": "service"})
+        )
+        spans = []
+        for name in ("first", "second", "first"):
+            span = tracer_provider.get_tracer(name, "1.0").start_span(name)
+            span.end()
+            spans.append(span)
+
+        # pylint: disable=protected-access
+        request = self.exporter._translate_data(spans)
+
+        self.assertEqual(len(request.resource_spans), 1)
+        resource_spans = request.resource_spans[0]
+        self.assertEqual(
+            resource_spans.resource, _translate_resource(spans[0].resource)
+        )
+        self.assertEqual(
+            [
+                (
+                    library_spans.instrumentation_library.name,
+                    [span.name for span in library_spans.spans],
+                )
+                for library_spans in resource_spans.instrumentation_library_spans
+            ],
+            [("first", ["first", "first"]), ("second", ["second"])],
+        )
+
+    def test_translate_resource_cache(self):
+        collector_resource = _translate_resource(SDKResource({"a": 1}))
+        self.assertIs(
+            _translate_resource(SDKResource({"a": 1})), collector_resource
+        )
+        self.assertEqual(
+            collector_resource,
+            OTLPResource(
+                attributes=[KeyValue(key="a", value=AnyValue(int_value=1))]
+            ),
+        )
+        self.assertIs(
+            _translate_instrumentation_library(
+                InstrumentationInfo("name", "version")
+            ),
+            _translate_instrumentation_library(
+                InstrumentationInfo("name", "version")
+            ),
+        )
+
+    def test_key_value_cache(self):
+        tracer_provider = TracerProvider()
+        tracer = tracer_provider.get_tracer(__name__)
+        spans = []
+        for value in ("GET", "GET", True, 1, 1.0, "x" * 257):
+            span = tracer.start_span("span", attributes={"key": value})
+            span.end()
+            spans.append(span)
+
+        # pylint: disable=protected-access
+        request = self.exporter._translate_data(spans)
+
+        self.assertEqual(
+            [
+                span.attributes[0].value
+                for span in request.resource_spans[0]
+                .instrumentation_library_spans[0]
+                .spans
+            ],
+            [
+                AnyValue(string_value="GET"),
+                AnyValue(string_value="GET"),
+                AnyValue(bool_value=True),
+                AnyValue(int_value=1),
+                AnyValue(double_value=1.0),
+                AnyValue(string_value="x" * 257),
+            ],
+        )
+        cache_info = self.exporter.key_value_cache_info()
+        self.assertEqual(cache_info.hits, 1)
+        self.assertEqual(cache_info.misses, 4)
+        self.assertEqual(cache_info.currsize, 4)
+        self.assertEqual(
+            cache_info.maxsize, OTLPSpanExporter.key_value_cache_size
+        )
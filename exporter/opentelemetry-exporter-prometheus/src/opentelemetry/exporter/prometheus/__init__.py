@@ -81,7 +81,10 @@ from opentelemetry.sdk.metrics.export import (
     MetricsExporter,
     MetricsExportResult,
 )
-from opentelemetry.sdk.metrics.export.aggregate import MinMaxSumCountAggregator
+from opentelemetry.sdk.metrics.export.aggregate import (
+    DDSketchAggregator,
+    MinMaxSumCountAggregator,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -173,6 +176,27 @@ class CustomCollector:
                     count_value=value.count,
                     sum_value=value.sum,
                 )
+            elif isinstance(metric_record.aggregator, DDSketchAggregator):
+                prometheus_metric = SummaryMetricFamily(
+                    name=metric_name,
+                    documentation=description,
+                    labels=label_keys,
+                )
+                if value.count:
+                    for quantile in metric_record.aggregator.quantiles:
+                        prometheus_metric.add_sample(
+                            metric_name,
+                            dict(
+                                zip(label_keys, label_values),
+                                quantile=str(quantile),
+                            ),
+                            value.quantile(quantile),
+                        )
+                prometheus_metric.add_metric(
+                    labels=label_values,
+                    count_value=value.count,
+                    sum_value=value.sum,
+                )
             else:
                 prometheus_metric = UnknownMetricFamily(
                     name=metric_name,
@@ -16,7 +16,7 @@ import unittest
 from unittest import mock
 
 from prometheus_client import generate_latest
-from prometheus_client.core import CounterMetricFamily
+from prometheus_client.core import CounterMetricFamily, SummaryMetricFamily
 
 from opentelemetry.exporter.prometheus import (
     CustomCollector,
@@ -26,6 +26,7 @@ from opentelemetry.metrics import get_meter_provider, set_meter_provider
 from opentelemetry.sdk import metrics
 from opentelemetry.sdk.metrics.export import MetricRecord, MetricsExportResult
 from opentelemetry.sdk.metrics.export.aggregate import (
+    DDSketchAggregator,
     MinMaxSumCountAggregator,
     SumAggregator,
 )
@@ -99,6 +100,37 @@ class TestPrometheusMetricExporter(unittest.TestCase):
         self.assertIn("testprefix_test_name_count 2.0", result)
         self.assertIn("testprefix_test_name_sum 579.0", result)
 
+    def test_sketch_aggregator_to_prometheus(self):
+        meter = get_meter_provider().get_meter(__name__)
+        metric = meter.create_valuerecorder(
+            "test@name", "testdesc", "unit", float, []
+        )
+        key_labels = get_dict_as_key({"os": "Windows"})
+        aggregator = DDSketchAggregator({"quantiles": (0.5, 1)})
+        for value in range(1, 101):
+            aggregator.update(value)
+        aggregator.take_checkpoint()
+        record = MetricRecord(
+            metric, key_labels, aggregator, get_meter_provider().resource
+        )
+        collector = CustomCollector("testprefix")
+        collector.add_metrics_data([record])
+
+        (prometheus_metric,) = collector.collect()
+        self.assertEqual(type(prometheus_metric), SummaryMetricFamily)
+        samples = {
+            (sample.name, sample.labels.get("quantile")): sample.value
+            for sample in prometheus_metric.samples
+        }
+        self.assertAlmostEqual(
+            samples["testprefix_test_name", "0.5"], 50, delta=0.5
+        )
+        self.assertEqual(samples["testprefix_test_name", "1"], 100)
+        self.assertEqual(samples["testprefix_test_name_count", None], 100)
+        self.assertEqual(samples["testprefix_test_name_sum", None], 5050)
+        for sample in prometheus_metric.samples:
+            self.assertEqual(sample.labels["os"], "Windows")
+
     def test_counter_to_prometheus(self):
         meter = get_meter_provider().get_meter(__name__)
         metric = meter.create_counter("test@name", "testdesc", "unit", int,)
@@ -55,26 +55,36 @@ This exporter always send traces to the configured Zipkin collector using HTTP.
     with tracer.start_as_current_span("foo"):
         print("Hello world!")
 
+Applications running on asyncio can use `AsyncZipkinSpanExporter` together
+with an `opentelemetry.sdk.trace.export.AsyncBatchSpanProcessor` instead.
+
 The exporter supports endpoint configuration via the OTEL_EXPORTER_ZIPKIN_ENDPOINT environment variables as defined in the `Specification`_
 
 API
 ---
 """
 
+import asyncio
 import json
 import logging
 import os
-from typing import Optional, Sequence
+from typing import Optional, Sequence, Tuple
 from urllib.parse import urlparse
 
 import requests
 
-from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
-from opentelemetry.trace import Span, SpanContext, SpanKind
+from opentelemetry.sdk.trace.export import (
+    AsyncSpanExporter,
+    SpanBatch,
+    SpanExporter,
+    SpanExportResult,
+)
+from opentelemetry.trace import Span, SpanKind
 
 DEFAULT_RETRY = False
 DEFAULT_URL = "http://localhost:9411/api/v2/spans"
 DEFAULT_MAX_TAG_VALUE_LENGTH = 128
+DEFAULT_TIMEOUT = 10
 ZIPKIN_HEADERS = {"Content-Type": "application/json"}
 
 SPAN_KIND_MAP = {
@@ -90,17 +100,9 @@ SUCCESS_STATUS_CODES = (200, 202)
 logger = logging.getLogger(__name__)
 
 
-class ZipkinSpanExporter(SpanExporter):
-    """Zipkin span exporter for OpenTelemetry.
-
-    Args:
-        service_name: Service that logged an annotation in a trace.Classifier
-            when query for spans.
-        url: The Zipkin endpoint URL
-        ipv4: Primary IPv4 address associated with this connection.
-        ipv6: Primary IPv6 address associated with this connection.
-        retry: Set to True to configure the exporter to retry on failure.
-    """
+class _BaseZipkinSpanExporter:
+    """Configuration and span translation shared by `ZipkinSpanExporter` and
+    `AsyncZipkinSpanExporter`."""
 
     def __init__(
         self,
@@ -126,17 +128,12 @@ class ZipkinSpanExporter(SpanExporter):
         self.retry = retry
         self.max_tag_value_length = max_tag_value_length
 
-    def export(self, spans: Sequence[Span]) -> SpanExportResult:
-        zipkin_spans = self._translate_to_zipkin(spans)
-        result = requests.post(
-            url=self.url, data=json.dumps(zipkin_spans), headers=ZIPKIN_HEADERS
-        )
-
-        if result.status_code not in SUCCESS_STATUS_CODES:
+    def _get_export_result(self, status_code: int, text: str):
+        if status_code not in SUCCESS_STATUS_CODES:
             logger.error(
                 "Traces cannot be uploaded; status code: %s, message %s",
-                result.status_code,
-                result.text,
+                status_code,
+                text,
             )
 
             if self.retry:
@@ -144,9 +141,6 @@ class ZipkinSpanExporter(SpanExporter):
             return SpanExportResult.FAILURE
         return SpanExportResult.SUCCESS
 
-    def shutdown(self) -> None:
-        pass
-
     def _translate_to_zipkin(self, spans: Sequence[Span]):
 
         local_endpoint = {"serviceName": self.service_name, "port": self.port}
@@ -157,21 +151,25 @@ class ZipkinSpanExporter(SpanExporter):
         if self.ipv6 is not None:
             local_endpoint["ipv6"] = self.ipv6
 
+        batch = SpanBatch.create(spans)
+        # Ensure left-zero-padding of traceId, spanId, parentId
+        trace_ids = [format(trace_id, "032x") for trace_id in batch.trace_ids]
+
         zipkin_spans = []
-        for span in spans:
+        for index, span in enumerate(batch):
             context = span.get_span_context()
-            trace_id = context.trace_id
-            span_id = context.span_id
+            start_time = batch.start_times[index]
 
             # Timestamp in zipkin spans is int of microseconds.
             # see: https://zipkin.io/pages/instrumenting.html
-            start_timestamp_mus = _nsec_to_usec_round(span.start_time)
-            duration_mus = _nsec_to_usec_round(span.end_time - span.start_time)
+            start_timestamp_mus = _nsec_to_usec_round(start_time)
+            duration_mus = _nsec_to_usec_round(
+                batch.end_times[index] - start_time
+            )
 
             zipkin_span = {
-                # Ensure left-zero-padding of traceId, spanId, parentId
-                "traceId": format(trace_id, "032x"),
-                "id": format(span_id, "016x"),
+                "traceId": trace_ids[batch.trace_id_indices[index]],
+                "id": format(batch.span_ids[index], "016x"),
                 "name": span.name,
                 "timestamp": start_timestamp_mus,
                 "duration": duration_mus,
@@ -203,12 +201,10 @@ class ZipkinSpanExporter(SpanExporter):
             if context.trace_flags.sampled:
                 zipkin_span["debug"] = True
 
-            if isinstance(span.parent, Span):
+            if batch.parent_span_ids[index]:
                 zipkin_span["parentId"] = format(
-                    span.parent.get_span_context().span_id, "016x"
+                    batch.parent_span_ids[index], "016x"
                 )
-            elif isinstance(span.parent, SpanContext):
-                zipkin_span["parentId"] = format(span.parent.span_id, "016x")
 
             zipkin_spans.append(zipkin_span)
         return zipkin_spans
@@ -258,6 +254,155 @@ class ZipkinSpanExporter(SpanExporter):
         return annotations
 
 
+class ZipkinSpanExporter(SpanExporter, _BaseZipkinSpanExporter):
+    """Zipkin span exporter for OpenTelemetry.
+
+    Args:
+        service_name: Service that logged an annotation in a trace.Classifier
+            when query for spans.
+        url: The Zipkin endpoint URL
+        ipv4: Primary IPv4 address associated with this connection.
+        ipv6: Primary IPv6 address associated with this connection.
+        retry: Set to True to configure the exporter to retry on failure.
+    """
+
+    accepts_span_batch = True
+
+    def export(self, spans: Sequence[Span]) -> SpanExportResult:
+        zipkin_spans = self._translate_to_zipkin(spans)
+        result = requests.post(
+            url=self.url, data=json.dumps(zipkin_spans), headers=ZIPKIN_HEADERS
+        )
+        return self._get_export_result(result.status_code, result.text)
+
+    def shutdown(self) -> None:
+        pass
+
+
+class AsyncZipkinSpanExporter(AsyncSpanExporter, _BaseZipkinSpanExporter):
+    """Zipkin span exporter for OpenTelemetry posting spans without blocking
+    the event loop of an `AsyncBatchSpanProcessor`.
+
+    Spans are sent with a minimal HTTP/1.1 client on top of asyncio streams,
+    opening one connection per export. Exports that fail to connect, time
+    out or get an invalid response fail.
+
+    Args:
+        service_name: Service that logged an annotation in a trace.Classifier
+            when query for spans.
+        url: The Zipkin endpoint URL
+        ipv4: Primary IPv4 address associated with this connection.
+        ipv6: Primary IPv6 address associated with this connection.
+        retry: Set to True to configure the exporter to retry on failure.
+        max_tag_value_length: Max length string attribute values can have.
+        timeout: The number of seconds an export can take.
+    """
+
+    accepts_span_batch = True
+
+    def __init__(
+        self,
+        service_name: str,
+        url: str = None,
+        ipv4: Optional[str] = None,
+        ipv6: Optional[str] = None,
+        retry: Optional[str] = DEFAULT_RETRY,
+        max_tag_value_length: Optional[int] = DEFAULT_MAX_TAG_VALUE_LENGTH,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        # pylint: disable=too-many-arguments
+        super().__init__(
+            service_name, url, ipv4, ipv6, retry, max_tag_value_length
+        )
+        self.timeout = timeout
+
+    async def export(self, spans: Sequence[Span]) -> SpanExportResult:
+        zipkin_spans = self._translate_to_zipkin(spans)
+        try:
+            status_code, text = await asyncio.wait_for(
+                self._post(json.dumps(zipkin_spans).encode("utf-8")),
+                self.timeout,
+            )
+        except asyncio.TimeoutError:
+            logger.error("Traces cannot be uploaded; timed out")
+            return SpanExportResult.FAILURE
+        except (OSError, EOFError, ValueError) as error:
+            # ValueError for invalid responses, EOFError for truncated ones
+            logger.error("Traces cannot be uploaded; %s", error)
+            return SpanExportResult.FAILURE
+        return self._get_export_result(status_code, text)
+
+    async def _post(self, body: bytes) -> Tuple[int, str]:
+        url = urlparse(self.url)
+        use_ssl = url.scheme == "https"
+        reader, writer = await asyncio.open_connection(
+            url.hostname, url.port or (443 if use_ssl else 80), ssl=use_ssl
+        )
+        try:
+            path = url.path or "/"
+            if url.query:
+                path = "{}?{}".format(path, url.query)
+            headers = dict(ZIPKIN_HEADERS)
+            headers["Host"] = url.netloc
+            headers["Content-Length"] = str(len(body))
+            headers["Connection"] = "close"
+            head = "POST {} HTTP/1.1\r\n{}\r\n".format(
+                path,
+                "".join(
+                    "{}: {}\r\n".format(key, value)
+                    for key, value in headers.items()
+                ),
+            )
+            writer.write(head.encode("latin-1") + body)
+            await writer.drain()
+            return await _read_response(reader)
+        finally:
+            writer.close()
+            # StreamWriter.wait_closed is only available from Python 3.7
+            if hasattr(writer, "wait_closed"):
+                try:
+                    await writer.wait_closed()
+                except OSError:
+                    pass
+
+
+async def _read_response(reader: asyncio.StreamReader) -> Tuple[int, str]:
+    """Reads the status code and body of an HTTP/1.1 response, raising
+    `ValueError` for invalid responses."""
+    status_line = await reader.readline()
+    parts = status_line.split(None, 2)
+    if len(parts) < 2 or not parts[0].startswith(b"HTTP/"):
+        raise ValueError("invalid status line {!r}".format(status_line))
+    status_code = int(parts[1])
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if not line.strip():
+            break
+        key, _, value = line.partition(b":")
+        headers[key.strip().lower()] = value.strip().lower()
+
+    if headers.get(b"transfer-encoding", b"").endswith(b"chunked"):
+        chunks = []
+        while True:
+            size = int(
+                (await reader.readline()).partition(b";")[0].strip(), 16
+            )
+            if size == 0:
+                break
+            chunks.append(await reader.readexactly(size))
+            # the CRLF ending the chunk
+            await reader.readexactly(2)
+        body = b"".join(chunks)
+    elif b"content-length" in headers:
+        body = await reader.readexactly(int(headers[b"content-length"]))
+    else:
+        # the server closes the connection after the response
+        body = await reader.read()
+    return status_code, body.decode("utf-8", "replace")
+
+
 def _nsec_to_usec_round(nsec):
     """Round nanoseconds to microseconds"""
     return (nsec + 500) // 10 ** 3
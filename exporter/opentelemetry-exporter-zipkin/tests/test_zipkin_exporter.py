@@ -12,16 +12,24 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import json
 import os
 import unittest
 from unittest.mock import MagicMock, patch
 
 from opentelemetry import trace as trace_api
-from opentelemetry.exporter.zipkin import ZipkinSpanExporter
+from opentelemetry.exporter.zipkin import (
+    AsyncZipkinSpanExporter,
+    ZipkinSpanExporter,
+)
 from opentelemetry.sdk import trace
 from opentelemetry.sdk.trace import Resource
-from opentelemetry.sdk.trace.export import SpanExportResult
+from opentelemetry.sdk.trace.export import (
+    BatchExportSpanProcessor,
+    SpanBatch,
+    SpanExportResult,
+)
 from opentelemetry.sdk.util.instrumentation import InstrumentationInfo
 from opentelemetry.trace import TraceFlags
 from opentelemetry.trace.status import Status, StatusCode
@@ -383,6 +391,37 @@ class TestZipkinSpanExporter(unittest.TestCase):
         status = exporter.export(spans)
         self.assertEqual(SpanExportResult.FAILURE, status)
 
+    @patch("requests.post")
+    def test_export_span_batch(self, mock_post):
+        mock_post.return_value = MockResponse(200)
+        exporter = ZipkinSpanExporter("test-service")
+        span_processor = BatchExportSpanProcessor(exporter)
+        span = trace._Span(
+            "test_span",
+            context=trace_api.SpanContext(
+                trace_id=0x000000000000000000000000DEADBEEF,
+                span_id=0x00000000DEADBEF0,
+                is_remote=False,
+                trace_flags=TraceFlags(TraceFlags.SAMPLED),
+            ),
+        )
+        span.start()
+        span.end()
+
+        with patch.object(
+            SpanBatch,
+            "__init__",
+            autospec=True,
+            side_effect=SpanBatch.__init__,
+        ) as init_mock:
+            span_processor.on_end(span)
+            span_processor.force_flush()
+        span_processor.shutdown()
+
+        # the exporter translates the batch of the span processor
+        self.assertEqual(init_mock.call_count, 1)
+        self.assertEqual(mock_post.call_count, 1)
+
     def test_max_tag_length(self):
         service_name = "test-service"
 
@@ -427,3 +466,140 @@ class TestZipkinSpanExporter(unittest.TestCase):
         tags = json.loads(kwargs["data"])[0]["tags"]
         self.assertEqual(len(tags["k1"]), 2)
         self.assertEqual(len(tags["k2"]), 2)
+
+
+class TestAsyncZipkinSpanExporter(unittest.TestCase):
+    def setUp(self):
+        context = trace_api.SpanContext(
+            trace_id=0x000000000000000000000000DEADBEEF,
+            span_id=0x00000000DEADBEF0,
+            is_remote=False,
+        )
+
+        self._test_span = trace._Span("test_span", context=context)
+        self._test_span.start()
+        self._test_span.end()
+        self.loop = asyncio.new_event_loop()
+        self.requests = []
+
+    def tearDown(self):
+        self.loop.close()
+
+    def _export(self, response_status, response=None, **kwargs):
+        if response is None:
+            response = "HTTP/1.1 {}\r\nContent-Length: 5\r\n\r\nerror".format(
+                response_status
+            )
+
+        async def handle(reader, writer):
+            head = await reader.readuntil(b"\r\n\r\n")
+            headers = dict(
+                line.split(": ", 1)
+                for line in head.decode("latin-1").split("\r\n")[1:]
+                if line
+            )
+            body = await reader.readexactly(int(headers["Content-Length"]))
+            self.requests.append((head.split(b"\r\n")[0], body))
+            writer.write(response.encode("latin-1"))
+            await writer.drain()
+            writer.close()
+
+        async def run():
+            server = await asyncio.start_server(handle, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            exporter = AsyncZipkinSpanExporter(
+                "test-service",
+                url="http://127.0.0.1:{}/api/v2/spans".format(port),
+                **kwargs
+            )
+            try:
+                return await exporter.export([self._test_span])
+            finally:
+                server.close()
+                await server.wait_closed()
+
+        return self.loop.run_until_complete(run())
+
+    def test_export(self):
+        status = self._export("202 Accepted")
+        self.assertEqual(SpanExportResult.SUCCESS, status)
+
+        request_line, body = self.requests[0]
+        self.assertEqual(request_line, b"POST /api/v2/spans HTTP/1.1")
+        zipkin_spans = json.loads(body.decode("utf-8"))
+        self.assertEqual(len(zipkin_spans), 1)
+        self.assertEqual(zipkin_spans[0]["name"], "test_span")
+        self.assertEqual(
+            zipkin_spans[0]["traceId"], "000000000000000000000000deadbeef"
+        )
+
+    def test_invalid_response(self):
+        with self.assertLogs(level="ERROR"):
+            status = self._export("500 Internal Server Error")
+        self.assertEqual(SpanExportResult.FAILURE, status)
+
+    def test_chunked_response(self):
+        with self.assertLogs(level="ERROR") as logs:
+            status = self._export(
+                None,
+                "HTTP/1.1 400 Bad Request\r\n"
+                "Transfer-Encoding: chunked\r\n\r\n"
+                "3\r\nbad\r\n5\r\n span\r\n0\r\n\r\n",
+            )
+        self.assertEqual(SpanExportResult.FAILURE, status)
+        self.assertIn("bad span", logs.output[0])
+
+    def test_malformed_response(self):
+        for response in ("", "garbage\r\n\r\n", "HTTP/1.1 OK\r\n\r\n"):
+            with self.subTest(response=response):
+                with self.assertLogs(level="ERROR"):
+                    status = self._export(None, response)
+                self.assertEqual(SpanExportResult.FAILURE, status)
+
+    def test_timeout(self):
+        async def run():
+            responded = asyncio.Event()
+            handled = []
+
+            async def handle(reader, writer):
+                await responded.wait()
+                writer.close()
+                handled.append(True)
+
+            server = await asyncio.start_server(handle, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            exporter = AsyncZipkinSpanExporter(
+                "test-service",
+                url="http://127.0.0.1:{}/api/v2/spans".format(port),
+                timeout=0.05,
+            )
+            try:
+                return await exporter.export([self._test_span])
+            finally:
+                responded.set()
+                while not handled:
+                    await asyncio.sleep(0.01)
+                server.close()
+                await server.wait_closed()
+
+        with self.assertLogs(level="ERROR"):
+            status = self.loop.run_until_complete(run())
+        self.assertEqual(SpanExportResult.FAILURE, status)
+
+    def test_connection_error(self):
+        async def run():
+            server = await asyncio.start_server(
+                lambda reader, writer: None, "127.0.0.1", 0
+            )
+            port = server.sockets[0].getsockname()[1]
+            server.close()
+            await server.wait_closed()
+            exporter = AsyncZipkinSpanExporter(
+                "test-service",
+                url="http://127.0.0.1:{}/api/v2/spans".format(port),
+            )
+            return await exporter.export([self._test_span])
+
+        with self.assertLogs(level="ERROR"):
+            status = self.loop.run_until_complete(run())
+        self.assertEqual(SpanExportResult.FAILURE, status)
@@ -19,6 +19,21 @@ from opentelemetry.context import get_value, set_value
 from opentelemetry.context.context import Context
 
 _BAGGAGE_KEY = "baggage"
+_EMPTY_BAGGAGE = {}  # type: typing.Dict[str, object]
+
+
+def _get_baggage(
+    context: typing.Optional[Context] = None,
+) -> typing.Dict[str, object]:
+    """Returns the dict stored in the Context, which must not be modified.
+
+    Every function in this module stores a new dict instead of updating the
+    one in the Context, so derived contexts can share it without copies.
+    """
+    baggage = get_value(_BAGGAGE_KEY, context=context)
+    if isinstance(baggage, dict):
+        return baggage
+    return _EMPTY_BAGGAGE
 
 
 def get_all(
@@ -32,10 +47,7 @@ def get_all(
     Returns:
         The name/value pairs in the Baggage
     """
-    baggage = get_value(_BAGGAGE_KEY, context=context)
-    if isinstance(baggage, dict):
-        return MappingProxyType(baggage.copy())
-    return MappingProxyType({})
+    return MappingProxyType(_get_baggage(context))
 
 
 def get_baggage(
@@ -52,7 +64,7 @@ def get_baggage(
         The value associated with the given name, or null if the given name is
         not present.
     """
-    return get_all(context=context).get(name)
+    return _get_baggage(context).get(name)
 
 
 def set_baggage(
@@ -68,7 +80,7 @@ def set_baggage(
     Returns:
         A Context with the value updated
     """
-    baggage = dict(get_all(context=context))
+    baggage = dict(_get_baggage(context))
     baggage[name] = value
     return set_value(_BAGGAGE_KEY, baggage, context=context)
 
@@ -85,7 +97,7 @@ def remove_baggage(
     Returns:
         A Context with the name/value removed
     """
-    baggage = dict(get_all(context=context))
+    baggage = dict(_get_baggage(context))
     baggage.pop(name, None)
 
     return set_value(_BAGGAGE_KEY, baggage, context=context)
@@ -16,7 +16,7 @@ import typing
 import urllib.parse
 
 from opentelemetry import baggage
-from opentelemetry.context import get_current
+from opentelemetry.context import get_current, set_value
 from opentelemetry.context.context import Context
 from opentelemetry.trace.propagation import textmap
 
@@ -49,11 +49,12 @@ class BaggagePropagator(textmap.TextMapPropagator):
         if not header or len(header) > self.MAX_HEADER_LENGTH:
             return context
 
-        baggage_entries = header.split(",")
+        baggage_entries = dict(baggage.get_all(context=context))
         total_baggage_entries = self.MAX_PAIRS
-        for entry in baggage_entries:
+        extracted = False
+        for entry in header.split(","):
             if total_baggage_entries <= 0:
-                return context
+                break
             total_baggage_entries -= 1
             if len(entry) > self.MAX_PAIR_LENGTH:
                 continue
@@ -61,13 +62,20 @@ class BaggagePropagator(textmap.TextMapPropagator):
                 name, value = entry.split("=", 1)
             except Exception:  # pylint: disable=broad-except
                 continue
-            context = baggage.set_baggage(
-                urllib.parse.unquote(name).strip(),
-                urllib.parse.unquote(value).strip(),
-                context=context,
-            )
+            baggage_entries[
+                urllib.parse.unquote(name).strip()
+            ] = urllib.parse.unquote(value).strip()
+            extracted = True
 
-        return context
+        if not extracted:
+            return context
+        # set all entries at once instead of copying the baggage and the
+        # context for each of them
+        return set_value(
+            baggage._BAGGAGE_KEY,  # pylint: disable=protected-access
+            baggage_entries,
+            context=context,
+        )
 
     def inject(
         self,
@@ -15,7 +15,6 @@
 import logging
 import threading
 import typing
-from functools import wraps
 from os import environ
 
 from pkg_resources import iter_entry_points
@@ -26,45 +25,37 @@ logger = logging.getLogger(__name__)
 _RUNTIME_CONTEXT = None  # type: typing.Optional[RuntimeContext]
 _RUNTIME_CONTEXT_LOCK = threading.Lock()
 
-_F = typing.TypeVar("_F", bound=typing.Callable[..., typing.Any])
 
+def _load_runtime_context() -> RuntimeContext:
+    """Initializes the global RuntimeContext
 
-def _load_runtime_context(func: _F) -> _F:
-    """A decorator used to initialize the global RuntimeContext
+    Only called while the global RuntimeContext has not been loaded yet,
+    afterwards `get_current`, `attach` and `detach` use it directly without
+    acquiring any lock.
 
     Returns:
-        A wrapper of the decorated method.
+        The global RuntimeContext.
     """
-
-    @wraps(func)  # type: ignore
-    def wrapper(
-        *args: typing.Tuple[typing.Any, typing.Any],
-        **kwargs: typing.Dict[typing.Any, typing.Any]
-    ) -> typing.Optional[typing.Any]:
-        global _RUNTIME_CONTEXT  # pylint: disable=global-statement
-
-        with _RUNTIME_CONTEXT_LOCK:
-            if _RUNTIME_CONTEXT is None:
-                # FIXME use a better implementation of a configuration manager to avoid having
-                # to get configuration values straight from environment variables
-                default_context = "contextvars_context"
-
-                configured_context = environ.get(
-                    "OTEL_CONTEXT", default_context
-                )  # type: str
-                try:
-                    _RUNTIME_CONTEXT = next(
-                        iter_entry_points(
-                            "opentelemetry_context", configured_context
-                        )
-                    ).load()()
-                except Exception:  # pylint: disable=broad-except
-                    logger.error(
-                        "Failed to load context: %s", configured_context
+    global _RUNTIME_CONTEXT  # pylint: disable=global-statement
+
+    with _RUNTIME_CONTEXT_LOCK:
+        if _RUNTIME_CONTEXT is None:
+            # FIXME use a better implementation of a configuration manager to avoid having
+            # to get configuration values straight from environment variables
+            default_context = "contextvars_context"
+
+            configured_context = environ.get(
+                "OTEL_CONTEXT", default_context
+            )  # type: str
+            try:
+                _RUNTIME_CONTEXT = next(
+                    iter_entry_points(
+                        "opentelemetry_context", configured_context
                     )
-        return func(*args, **kwargs)  # type: ignore
-
-    return wrapper  # type:ignore
+                ).load()()
+            except Exception:  # pylint: disable=broad-except
+                logger.error("Failed to load context: %s", configured_context)
+    return _RUNTIME_CONTEXT  # type: ignore
 
 
 def get_value(key: str, context: typing.Optional[Context] = None) -> "object":
@@ -100,12 +91,12 @@ def set_value(
     """
     if context is None:
         context = get_current()
-    new_values = context.copy()
-    new_values[key] = value
-    return Context(new_values)
+    new_context = Context(context)
+    # Context is immutable once returned, the new one is still private here
+    dict.__setitem__(new_context, key, value)
+    return new_context
 
 
-@_load_runtime_context  # type: ignore
 def get_current() -> Context:
     """To access the context associated with program execution,
     the Context API provides a function which takes no arguments
@@ -114,10 +105,12 @@ def get_current() -> Context:
     Returns:
         The current `Context` object.
     """
-    return _RUNTIME_CONTEXT.get_current()  # type:ignore
+    runtime_context = _RUNTIME_CONTEXT
+    if runtime_context is None:
+        runtime_context = _load_runtime_context()
+    return runtime_context.get_current()
 
 
-@_load_runtime_context  # type: ignore
 def attach(context: Context) -> object:
     """Associates a Context with the caller's current execution unit. Returns
     a token that can be used to restore the previous Context.
@@ -128,10 +121,12 @@ def attach(context: Context) -> object:
     Returns:
         A token that can be used with `detach` to reset the context.
     """
-    return _RUNTIME_CONTEXT.attach(context)  # type:ignore
+    runtime_context = _RUNTIME_CONTEXT
+    if runtime_context is None:
+        runtime_context = _load_runtime_context()
+    return runtime_context.attach(context)
 
 
-@_load_runtime_context  # type: ignore
 def detach(token: object) -> None:
     """Resets the Context associated with the caller's current execution unit
     to the value it had before attaching a specified Context.
@@ -139,7 +134,10 @@ def detach(token: object) -> None:
     Args:
         token: The Token that was returned by a previous call to attach a Context.
     """
+    runtime_context = _RUNTIME_CONTEXT
+    if runtime_context is None:
+        runtime_context = _load_runtime_context()
     try:
-        _RUNTIME_CONTEXT.detach(token)  # type: ignore
+        runtime_context.detach(token)
     except Exception:  # pylint: disable=broad-except
         logger.error("Failed to detach context")
@@ -17,6 +17,8 @@ from abc import ABC, abstractmethod
 
 
 class Context(typing.Dict[str, object]):
+    __slots__ = ()
+
     def __setitem__(self, key: str, value: object) -> None:
         raise ValueError
 
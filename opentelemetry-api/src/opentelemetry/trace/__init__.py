@@ -81,7 +81,11 @@ from contextlib import contextmanager
 from logging import getLogger
 
 from opentelemetry.context.context import Context
-from opentelemetry.trace.ids_generator import IdsGenerator, RandomIdsGenerator
+from opentelemetry.trace.ids_generator import (
+    ForkSafeRandomIdsGenerator,
+    IdsGenerator,
+    RandomIdsGenerator,
+)
 from opentelemetry.trace.propagation import (
     get_current_span,
     set_span_in_context,
@@ -461,6 +465,7 @@ __all__ = [
     "DefaultSpan",
     "DefaultTracer",
     "DefaultTracerProvider",
+    "ForkSafeRandomIdsGenerator",
     "Link",
     "LinkBase",
     "RandomIdsGenerator",
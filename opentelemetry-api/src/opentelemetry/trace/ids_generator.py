@@ -13,7 +13,10 @@
 # limitations under the License.
 
 import abc
+import functools
+import os
 import random
+import weakref
 
 
 class IdsGenerator(abc.ABC):
@@ -41,8 +44,11 @@ class IdsGenerator(abc.ABC):
 
 
 class RandomIdsGenerator(IdsGenerator):
-    """The default IDs generator for TracerProvider which randomly generates all
-    bits when generating IDs.
+    """IDs generator which randomly generates all bits when generating IDs,
+    using the global `random` state.
+
+    `ForkSafeRandomIdsGenerator` is the default IDs generator for
+    TracerProvider.
     """
 
     def generate_span_id(self) -> int:
@@ -50,3 +56,61 @@ class RandomIdsGenerator(IdsGenerator):
 
     def generate_trace_id(self) -> int:
         return random.getrandbits(128)
+
+
+class ForkSafeRandomIdsGenerator(IdsGenerator):
+    """The default IDs generator for TracerProvider, with its own random
+    number generator.
+
+    The generator is seeded from `os.urandom` instead of sharing the global
+    `random` state, so calls to `random.seed` elsewhere in the application
+    do not affect it, and it is reseeded in forked child processes so that
+    preforked workers do not generate the same ids. Where
+    `os.register_at_fork` is available the ``generate_*`` methods are bound
+    directly to the underlying generator, which makes them cheaper to call
+    than those of `RandomIdsGenerator`.
+    """
+
+    def __init__(self):
+        self._random = random.Random()
+        self._pid = os.getpid()
+        if not _CHECK_PID:
+            # getrandbits is a single C call, so this is thread safe
+            self.generate_span_id = functools.partial(
+                self._random.getrandbits, 64
+            )
+            self.generate_trace_id = functools.partial(
+                self._random.getrandbits, 128
+            )
+            _fork_safe_generators.add(self)
+
+    def _reseed(self) -> None:
+        self._random.seed()
+        self._pid = os.getpid()
+
+    def generate_span_id(self) -> int:
+        if self._pid != os.getpid():
+            self._reseed()
+        return self._random.getrandbits(64)
+
+    def generate_trace_id(self) -> int:
+        if self._pid != os.getpid():
+            self._reseed()
+        return self._random.getrandbits(128)
+
+
+_fork_safe_generators = weakref.WeakSet()  # type: weakref.WeakSet
+
+
+def _reseed_fork_safe_generators() -> None:
+    for generator in list(_fork_safe_generators):
+        generator._reseed()  # pylint: disable=protected-access
+
+
+# os.register_at_fork is only available from Python 3.7, older versions
+# compare the process id on every call instead
+_CHECK_PID = not hasattr(os, "register_at_fork")
+if not _CHECK_PID:
+    os.register_at_fork(  # pylint: disable=no-member
+        after_in_child=_reseed_fork_safe_generators
+    )
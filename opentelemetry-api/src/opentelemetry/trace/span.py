@@ -12,6 +12,8 @@ _logger = logging.getLogger(__name__)
 class Span(abc.ABC):
     """A span represents a single operation within a trace."""
 
+    __slots__ = ()
+
     @abc.abstractmethod
     def end(self, end_time: typing.Optional[int] = None) -> None:
         """Sets the current time as the span's end time.
@@ -241,6 +243,8 @@ class DefaultSpan(Span):
     All operations are no-op except context propagation.
     """
 
+    __slots__ = ("_context",)
+
     def __init__(self, context: "SpanContext") -> None:
         self._context = context
 
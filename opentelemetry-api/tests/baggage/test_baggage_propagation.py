@@ -109,6 +109,20 @@ class TestBaggagePropagation(unittest.TestCase):
         expected = {"key1": "value1", "key3": "value3"}
         self.assertEqual(self._extract(header), expected)
 
+    def test_extract_into_context_with_baggage(self):
+        ctx = baggage.set_baggage("key1", "value1")
+        ctx = baggage.set_baggage("key2", "value2", context=ctx)
+        extracted = self.propagator.extract(
+            carrier_getter, {"baggage": ["key2=val2,key3=val3"]}, context=ctx,
+        )
+        self.assertEqual(
+            baggage.get_all(extracted),
+            {"key1": "value1", "key2": "val2", "key3": "val3"},
+        )
+        self.assertEqual(
+            baggage.get_all(ctx), {"key1": "value1", "key2": "value2"}
+        )
+
     def test_inject_no_baggage_entries(self):
         values = {}
         output = self._inject(values)
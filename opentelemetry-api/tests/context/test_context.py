@@ -13,9 +13,11 @@
 # limitations under the License.
 
 import unittest
+from unittest.mock import patch
 
 from opentelemetry import context
 from opentelemetry.context.context import Context
+from opentelemetry.context.contextvars_context import ContextVarsRuntimeContext
 
 
 def do_work() -> None:
@@ -62,3 +64,14 @@ class TestContext(unittest.TestCase):
 
         context.detach(token)
         self.assertEqual("yyy", context.get_value("a"))
+
+    def test_load_runtime_context(self):
+        with patch.object(context, "_RUNTIME_CONTEXT", None):
+            token = context.attach(context.set_value("a", "yyy"))
+            self.assertIsInstance(
+                context._RUNTIME_CONTEXT,  # pylint: disable=protected-access
+                ContextVarsRuntimeContext,
+            )
+            self.assertEqual("yyy", context.get_value("a"))
+            context.detach(token)
+            self.assertIsNone(context.get_value("a"))
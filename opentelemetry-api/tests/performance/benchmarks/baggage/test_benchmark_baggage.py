@@ -0,0 +1,34 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from opentelemetry import baggage
+from opentelemetry.baggage.propagation import BaggagePropagator
+from opentelemetry.trace.propagation.textmap import DictGetter
+
+_CARRIER = {
+    "baggage": [
+        ",".join("key{}=value{}".format(index, index) for index in range(12))
+    ]
+}
+_GETTER = DictGetter()
+_PROPAGATOR = BaggagePropagator()
+
+
+def test_extract(benchmark):
+    benchmark(_PROPAGATOR.extract, _GETTER, _CARRIER)
+
+
+def test_get_baggage(benchmark):
+    ctx = _PROPAGATOR.extract(_GETTER, _CARRIER)
+    benchmark(baggage.get_baggage, "key6", ctx)
@@ -0,0 +1,111 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import tracemalloc
+
+import pytest
+
+from opentelemetry import baggage, context
+from opentelemetry.test.concurrency import run_in_threads
+
+OPERATIONS_PER_THREAD = 10000
+NESTING_DEPTH = 32
+BAGGAGE_ENTRIES = 12
+THREAD_COUNTS = [1, 8]
+
+_LOCK = threading.Lock()
+
+
+def _locked_attach(ctx):
+    """The path attach took before the loaded RuntimeContext was used
+    directly: every call acquired the process-wide lock."""
+    with _LOCK:
+        pass
+    return context.attach(ctx)
+
+
+def _locked_detach(token):
+    with _LOCK:
+        pass
+    context.detach(token)
+
+
+def _attach_detach(attach, detach, num_threads):
+    ctx = context.set_value("key", "value")
+
+    def target():
+        for _ in range(OPERATIONS_PER_THREAD):
+            detach(attach(ctx))
+
+    run_in_threads(target, num_threads)
+
+
+@pytest.mark.parametrize("num_threads", THREAD_COUNTS)
+def test_locked_attach_detach(benchmark, num_threads):
+    benchmark.pedantic(
+        _attach_detach,
+        args=(_locked_attach, _locked_detach, num_threads),
+        rounds=10,
+    )
+
+
+@pytest.mark.parametrize("num_threads", THREAD_COUNTS)
+def test_attach_detach(benchmark, num_threads):
+    benchmark.pedantic(
+        _attach_detach,
+        args=(context.attach, context.detach, num_threads),
+        rounds=10,
+    )
+
+
+def test_get_current(benchmark):
+    benchmark(context.get_current)
+
+
+def _create_base_context():
+    ctx = context.get_current()
+    for index in range(BAGGAGE_ENTRIES):
+        ctx = baggage.set_baggage("key{}".format(index), "value", ctx)
+    return ctx
+
+
+def _nest(base_context):
+    """Derives a context per level the way nested spans and a baggage update
+    per level do."""
+    contexts = [base_context]
+    for level in range(NESTING_DEPTH):
+        ctx = context.set_value("current-span", level, contexts[-1])
+        if level % 4 == 0:
+            ctx = baggage.set_baggage("level", level, ctx)
+        contexts.append(ctx)
+    return contexts
+
+
+def _bytes_per_level(base_context):
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        contexts = _nest(base_context)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert len(contexts) == NESTING_DEPTH + 1
+    return (after - before) // NESTING_DEPTH
+
+
+def test_deep_nesting(benchmark):
+    base_context = _create_base_context()
+    benchmark.extra_info["bytes_per_level"] = _bytes_per_level(base_context)
+    benchmark(_nest, base_context)
@@ -0,0 +1,79 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import random
+import threading
+import unittest
+
+from opentelemetry.trace.ids_generator import ForkSafeRandomIdsGenerator
+
+
+class TestForkSafeRandomIdsGenerator(unittest.TestCase):
+    def test_ids(self):
+        ids_generator = ForkSafeRandomIdsGenerator()
+        span_ids = {ids_generator.generate_span_id() for _ in range(100)}
+        trace_ids = {ids_generator.generate_trace_id() for _ in range(100)}
+
+        self.assertEqual(len(span_ids), 100)
+        self.assertEqual(len(trace_ids), 100)
+        for span_id in span_ids:
+            self.assertTrue(0 <= span_id < 2 ** 64)
+        for trace_id in trace_ids:
+            self.assertTrue(0 <= trace_id < 2 ** 128)
+
+    def test_independent_of_global_random(self):
+        random.seed(0)
+        first = ForkSafeRandomIdsGenerator().generate_span_id()
+        random.seed(0)
+        second = ForkSafeRandomIdsGenerator().generate_span_id()
+        self.assertNotEqual(first, second)
+
+    def test_threads(self):
+        ids_generator = ForkSafeRandomIdsGenerator()
+        span_ids = []
+
+        def generate():
+            span_ids.extend(
+                [ids_generator.generate_span_id() for _ in range(1000)]
+            )
+
+        threads = [threading.Thread(target=generate) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(set(span_ids)), 8000)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires os.fork")
+    def test_fork(self):
+        ids_generator = ForkSafeRandomIdsGenerator()
+
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            os.close(read_fd)
+            os.write(
+                write_fd,
+                ids_generator.generate_span_id().to_bytes(8, "little"),
+            )
+            os._exit(0)  # pylint: disable=protected-access
+
+        os.close(write_fd)
+        child_span_id = int.from_bytes(os.read(read_fd, 8), "little")
+        os.close(read_fd)
+        os.waitpid(pid, 0)
+
+        self.assertNotEqual(child_span_id, ids_generator.generate_span_id())
@@ -15,6 +15,7 @@
 import atexit
 import logging
 import threading
+from collections import deque
 from typing import Dict, Sequence, Tuple, Type, TypeVar
 
 from opentelemetry import metrics as metrics_api
@@ -43,6 +44,10 @@ class BaseBoundInstrument:
     Bound metric instruments are responsible for operating on data for metric
     instruments for a specific set of labels.
 
+    A bound instrument that was released and did not record any value since
+    the previous collection expires on collection, values recorded with it
+    afterwards go to a new bound instrument of the same labels.
+
     Args:
         labels: A set of labels as keys that bind this metric instrument.
         metric: The metric that created this bound instrument.
@@ -54,9 +59,12 @@ class BaseBoundInstrument:
         self.view_datas = metric.meter.view_manager.get_view_datas(
             metric, labels
         )
-        self._view_datas_lock = threading.Lock()
+        # a marker per update in progress, appending to and popping from a
+        # deque being atomic, updates do not take a lock
+        self._updating = deque()
         self._ref_count = 0
         self._ref_count_lock = threading.Lock()
+        self._expired = False
 
     def _validate_update(self, value: metrics_api.ValueT) -> bool:
         if not self._metric.enabled:
@@ -70,10 +78,69 @@ class BaseBoundInstrument:
         return True
 
     def update(self, value: metrics_api.ValueT):
-        with self._view_datas_lock:
-            # record the value for each view_data belonging to this aggregator
-            for view_data in self.view_datas:
-                view_data.record(value)
+        bound_instrument = self
+        while True:
+            # pylint: disable=protected-access
+            updating = bound_instrument._updating
+            updating.append(None)
+            try:
+                if not bound_instrument._expired:
+                    # record the value for each view_data belonging to this
+                    # aggregator
+                    for view_data in bound_instrument.view_datas:
+                        view_data.record(value)
+                    return
+            finally:
+                updating.pop()
+            # expired since it was looked up
+            with self._metric.bound_instruments_lock:
+                bound_instrument = self._metric._get_bound_instrument(
+                    self._labels
+                )
+
+    def update_many(self, values: Sequence[metrics_api.ValueT]):
+        """Same as `update`, for a sequence of values."""
+        bound_instrument = self
+        while True:
+            # pylint: disable=protected-access
+            updating = bound_instrument._updating
+            updating.append(None)
+            try:
+                if not bound_instrument._expired:
+                    for view_data in bound_instrument.view_datas:
+                        view_data.record_many(values)
+                    return
+            finally:
+                updating.pop()
+            with self._metric.bound_instruments_lock:
+                bound_instrument = self._metric._get_bound_instrument(
+                    self._labels
+                )
+
+    def _expire_if_idle(self) -> bool:
+        """Expires the bound instrument if it was released and recorded no
+        value since the last checkpoint of its aggregators, returns whether it
+        expired.
+
+        Updates check whether the bound instrument expired after marking
+        themselves in progress, so it only stays expired if no update is in
+        progress once it is marked expired.
+        """
+        if self.ref_count():
+            return False
+        self._expired = True
+        if self._updating or not all(
+            view_data.aggregator.checkpointed for view_data in self.view_datas
+        ):
+            self._expired = False
+        return self._expired
+
+    def _at_fork_reinit(self):
+        self._ref_count_lock = threading.Lock()
+        # updates in progress in other threads of the parent never end
+        self._updating.clear()
+        for view_data in self.view_datas:
+            view_data.aggregator._at_fork_reinit()
 
     def release(self):
         self.decrease_ref_count()
@@ -109,6 +176,8 @@ class BoundCounter(metrics_api.BoundCounter, BaseBoundInstrument):
             return False
         return True
 
+    UPDATE_FUNCTION = add
+
 
 class BoundUpDownCounter(metrics_api.BoundUpDownCounter, BaseBoundInstrument):
     def add(self, value: metrics_api.ValueT) -> None:
@@ -116,6 +185,8 @@ class BoundUpDownCounter(metrics_api.BoundUpDownCounter, BaseBoundInstrument):
         if self._validate_update(value):
             self.update(value)
 
+    UPDATE_FUNCTION = add
+
 
 class BoundValueRecorder(metrics_api.BoundValueRecorder, BaseBoundInstrument):
     def record(self, value: metrics_api.ValueT) -> None:
@@ -123,6 +194,33 @@ class BoundValueRecorder(metrics_api.BoundValueRecorder, BaseBoundInstrument):
         if self._validate_update(value):
             self.update(value)
 
+    def record_many(self, values: Sequence[metrics_api.ValueT]) -> None:
+        """Records a sequence of values at once, folding them into the
+        aggregators in one call instead of one update per value.
+
+        ``values`` can also be an array with a ``tolist`` method, such as a
+        NumPy array, converted to a list of numbers at once.
+        """
+        if not self._metric.enabled:
+            return
+        if hasattr(values, "tolist"):
+            values = values.tolist()
+        else:
+            values = list(values)
+        value_type = self._metric.value_type
+        if not all(
+            issubclass(type_, value_type) for type_ in set(map(type, values))
+        ):
+            logger.warning(
+                "Invalid values passed for %s.", value_type.__name__
+            )
+            values = [
+                value for value in values if isinstance(value, value_type)
+            ]
+        self.update_many(values)
+
+    UPDATE_FUNCTION = record
+
 
 class Metric(metrics_api.Metric):
     """Base class for all synchronous metric types.
@@ -154,27 +252,84 @@ class Metric(metrics_api.Metric):
         self.value_type = value_type
         self.meter = meter
         self.enabled = enabled
+        # bound instruments by their labels, as returned by get_dict_as_key
         self.bound_instruments = {}
         self.bound_instruments_lock = threading.Lock()
+        # the bound instruments of unbound updates, by the items of the labels
+        # dicts they were passed, looked up without sorting the labels
+        self._unbound_instruments = {}
 
     def bind(self, labels: Dict[str, str]) -> BaseBoundInstrument:
         """See `opentelemetry.metrics.Metric.bind`."""
         key = get_dict_as_key(labels)
         with self.bound_instruments_lock:
-            bound_instrument = self.bound_instruments.get(key)
-            if bound_instrument is None:
-                bound_instrument = self.BOUND_INSTR_TYPE(key, self)
-                self.bound_instruments[key] = bound_instrument
-        bound_instrument.increase_ref_count()
+            bound_instrument = self._get_bound_instrument(key)
+            bound_instrument.increase_ref_count()
+        return bound_instrument
+
+    def _get_bound_instrument(self, key: Tuple) -> BaseBoundInstrument:
+        """Returns the bound instrument of the labels, creating it if
+        needed. Must be called with ``bound_instruments_lock`` held."""
+        bound_instrument = self.bound_instruments.get(key)
+        if bound_instrument is None:
+            bound_instrument = self.BOUND_INSTR_TYPE(key, self)
+            self.bound_instruments[key] = bound_instrument
+        return bound_instrument
+
+    def _get_unbound_instrument(
+        self, labels: Dict[str, str]
+    ) -> BaseBoundInstrument:
+        """Returns the bound instrument of the labels for a single update,
+        without binding it."""
+        try:
+            items = tuple(labels.items())
+            bound_instrument = self._unbound_instruments.get(items)
+        except TypeError:
+            # unhashable label values such as lists
+            items = None
+            bound_instrument = None
+        if bound_instrument is None:
+            key = get_dict_as_key(labels)
+            with self.bound_instruments_lock:
+                bound_instrument = self._get_bound_instrument(key)
+                if items is not None:
+                    self._unbound_instruments[items] = bound_instrument
         return bound_instrument
 
+    def _expire_idle_bound_instruments(self) -> None:
+        """Forgets the bound instruments that were released and recorded no
+        values since the last collection. Must be called with
+        ``bound_instruments_lock`` held."""
+        expired = [
+            key
+            for key, bound_instrument in self.bound_instruments.items()
+            # pylint: disable=protected-access
+            if bound_instrument._expire_if_idle()
+        ]
+        if not expired:
+            return
+        for key in expired:
+            self.meter.view_manager.release_view_datas(
+                self, self.bound_instruments.pop(key).view_datas
+            )
+        self._unbound_instruments = {
+            items: bound_instrument
+            for items, bound_instrument in self._unbound_instruments.items()
+            # pylint: disable=protected-access
+            if not bound_instrument._expired
+        }
+
+    def _at_fork_reinit(self) -> None:
+        self.bound_instruments_lock = threading.Lock()
+        for bound_instrument in self.bound_instruments.values():
+            # pylint: disable=protected-access
+            bound_instrument._at_fork_reinit()
+
     def __repr__(self):
         return '{}(name="{}", description="{}")'.format(
             type(self).__name__, self.name, self.description
         )
 
-    UPDATE_FUNCTION = lambda x, y: None  # noqa: E731
-
 
 class Counter(Metric, metrics_api.Counter):
     """See `opentelemetry.metrics.Counter`.
@@ -184,9 +339,7 @@ class Counter(Metric, metrics_api.Counter):
 
     def add(self, value: metrics_api.ValueT, labels: Dict[str, str]) -> None:
         """See `opentelemetry.metrics.Counter.add`."""
-        bound_intrument = self.bind(labels)
-        bound_intrument.add(value)
-        bound_intrument.release()
+        self._get_unbound_instrument(labels).add(value)
 
     UPDATE_FUNCTION = add
 
@@ -199,9 +352,7 @@ class UpDownCounter(Metric, metrics_api.UpDownCounter):
 
     def add(self, value: metrics_api.ValueT, labels: Dict[str, str]) -> None:
         """See `opentelemetry.metrics.UpDownCounter.add`."""
-        bound_intrument = self.bind(labels)
-        bound_intrument.add(value)
-        bound_intrument.release()
+        self._get_unbound_instrument(labels).add(value)
 
     UPDATE_FUNCTION = add
 
@@ -215,9 +366,14 @@ class ValueRecorder(Metric, metrics_api.ValueRecorder):
         self, value: metrics_api.ValueT, labels: Dict[str, str]
     ) -> None:
         """See `opentelemetry.metrics.ValueRecorder.record`."""
-        bound_intrument = self.bind(labels)
-        bound_intrument.record(value)
-        bound_intrument.release()
+        self._get_unbound_instrument(labels).record(value)
+
+    def record_many(
+        self, values: Sequence[metrics_api.ValueT], labels: Dict[str, str]
+    ) -> None:
+        """Records a sequence of values with the same labels at once, see
+        `BoundValueRecorder.record_many`."""
+        self._get_unbound_instrument(labels).record_many(values)
 
     UPDATE_FUNCTION = record
 
@@ -360,6 +516,23 @@ class Meter(metrics_api.Meter):
         self.observers_lock = threading.Lock()
         self.view_manager = ViewManager()
 
+    def _at_fork_reinit(self) -> None:
+        """Called in forked child processes, where locks held by other
+        threads of the parent would never be released. Replaces the locks of
+        the meter and of its metrics, without acquiring them, and discards
+        the values recorded and collected by the parent, which exports
+        them."""
+        # pylint: disable=protected-access
+        self.metrics_lock = threading.Lock()
+        self.observers_lock = threading.Lock()
+        self.view_manager._at_fork_reinit()
+        for metric in self.metrics:
+            metric._at_fork_reinit()
+        for observer in self.observers:
+            # observers report their values again on the next collection
+            observer.aggregators = {}
+        self.processor._at_fork_reinit()
+
     def collect(self) -> None:
         """Collects all the metrics created with this `Meter` for export.
 
@@ -375,25 +548,16 @@ class Meter(metrics_api.Meter):
         for metric in self.metrics:
             if not metric.enabled:
                 continue
-            to_remove = []
             with metric.bound_instruments_lock:
-                for (
-                    labels,
-                    bound_instrument,
-                ) in metric.bound_instruments.items():
+                # pylint: disable=protected-access
+                metric._expire_idle_bound_instruments()
+                for bound_instrument in metric.bound_instruments.values():
                     for view_data in bound_instrument.view_datas:
                         record = Record(
                             metric, view_data.labels, view_data.aggregator
                         )
                         self.processor.process(record)
 
-                    if bound_instrument.ref_count() == 0:
-                        to_remove.append(labels)
-
-            # Remove handles that were released
-            for labels in to_remove:
-                del metric.bound_instruments[labels]
-
     def _collect_observers(self) -> None:
         with self.observers_lock:
             for observer in self.observers:
@@ -413,10 +577,20 @@ class Meter(metrics_api.Meter):
         record_tuples: Sequence[Tuple[metrics_api.Metric, metrics_api.ValueT]],
     ) -> None:
         """See `opentelemetry.metrics.Meter.record_batch`."""
-        # TODO: Avoid enconding the labels for each instrument, encode once
-        # and reuse.
+        # the items of the labels are computed once to look up the bound
+        # instruments of all the metrics, the labels are only encoded for
+        # the metrics that were not updated with them yet
+        try:
+            items = tuple(labels.items())
+            hash(items)
+        except TypeError:
+            items = None
         for metric, value in record_tuples:
-            metric.UPDATE_FUNCTION(value, labels)
+            # pylint: disable=protected-access
+            bound_instrument = metric._unbound_instruments.get(items)
+            if bound_instrument is None:
+                bound_instrument = metric._get_unbound_instrument(labels)
+            bound_instrument.UPDATE_FUNCTION(value)
 
     def create_counter(
         self,
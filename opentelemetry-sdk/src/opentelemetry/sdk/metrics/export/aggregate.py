@@ -14,9 +14,16 @@
 
 import abc
 import logging
+import sys
 import threading
-from collections import OrderedDict, namedtuple
-from math import inf
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter, deque, namedtuple
+from collections.abc import Mapping
+from functools import partial
+from itertools import chain
+from math import ceil, inf, log
+from operator import add
 
 from opentelemetry.util import time_ns
 
@@ -48,6 +55,11 @@ class Aggregator(abc.ABC):
             self.checkpointed = False
         self.last_update_timestamp = time_ns()
 
+    def update_many(self, values):
+        """Updates the current with a sequence of values."""
+        for value in values:
+            self.update(value)
+
     @abc.abstractmethod
     def take_checkpoint(self):
         """Stores a snapshot of the current value."""
@@ -64,6 +76,13 @@ class Aggregator(abc.ABC):
             other.initial_checkpoint_timestamp,
         )
 
+    def _at_fork_reinit(self):
+        """Called in forked child processes, where a lock held by another
+        thread of the parent would never be released. Replaces the lock and
+        discards the values recorded by the parent."""
+        self._lock = threading.Lock()
+        self.take_checkpoint()
+
     def _verify_type(self, other):
         if isinstance(other, self.__class__):
             return True
@@ -75,7 +94,78 @@ class Aggregator(abc.ABC):
         return False
 
 
-class SumAggregator(Aggregator):
+class _BufferedAggregator(Aggregator):
+    """Base class for aggregators of synchronous instruments, which are
+    updated concurrently by the threads recording values.
+
+    Updates are appended to a buffer without taking a lock, appending to a
+    deque being atomic. The buffered values are folded into the current
+    value on checkpoint, when the current value is read, or by the updating
+    thread once ``_MAX_PENDING`` values are buffered and the lock is free.
+    Past ``_MAX_BUFFERED`` values, the updating thread waits for the lock, so
+    that the buffer stays bounded while another thread holds it. Sequences
+    of values passed to `update_many` are folded at once instead.
+    """
+
+    _MAX_PENDING = 1024
+    _MAX_BUFFERED = 2 * _MAX_PENDING
+
+    def __init__(self, config=None):
+        super().__init__(config=config)
+        self._pending = deque()
+
+    @property
+    def current(self):
+        with self._lock:
+            self._fold_pending()
+            return self._current
+
+    @current.setter
+    def current(self, current):
+        self._current = current
+
+    def update(self, value):
+        pending = self._pending
+        pending.append(value)
+        # values buffered while a checkpoint is taken are folded into the
+        # next one, so checkpointed is only cleared after appending
+        super().update(value)
+        buffered = len(pending)
+        if buffered >= self._MAX_PENDING and self._lock.acquire(
+            buffered >= self._MAX_BUFFERED
+        ):
+            try:
+                self._fold_pending()
+            finally:
+                self._lock.release()
+
+    def update_many(self, values):
+        """Folds a sequence of values into the current value at once."""
+        if not values:
+            return
+        with self._lock:
+            self._fold(values)
+            super().update(values[-1])
+
+    def take_checkpoint(self):
+        """Folds the buffered values into the current value, must be called
+        with the lock held."""
+        super().take_checkpoint()
+        self._fold_pending()
+
+    def _fold_pending(self):
+        pending = self._pending
+        # values appended meanwhile stay buffered
+        values = [pending.popleft() for _ in range(len(pending))]
+        if values:
+            self._fold(values)
+
+    @abc.abstractmethod
+    def _fold(self, values):
+        """Folds the values into the current value."""
+
+
+class SumAggregator(_BufferedAggregator):
     """Aggregator for counter metrics."""
 
     def __init__(self, config=None):
@@ -83,16 +173,14 @@ class SumAggregator(Aggregator):
         self.current = 0
         self.checkpoint = 0
 
-    def update(self, value):
-        with self._lock:
-            self.current += value
-            super().update(value)
+    def _fold(self, values):
+        self._current += sum(values)
 
     def take_checkpoint(self):
         with self._lock:
-            self.checkpoint = self.current
-            self.current = 0
             super().take_checkpoint()
+            self.checkpoint = self._current
+            self._current = 0
 
     def merge(self, other):
         if self._verify_type(other):
@@ -101,7 +189,7 @@ class SumAggregator(Aggregator):
                 super().merge(other)
 
 
-class MinMaxSumCountAggregator(Aggregator):
+class MinMaxSumCountAggregator(_BufferedAggregator):
     """Aggregator for ValueRecorder metrics that keeps min, max, sum, count."""
 
     _TYPE = namedtuple("minmaxsumcount", "min max sum count")
@@ -112,21 +200,20 @@ class MinMaxSumCountAggregator(Aggregator):
         self.current = self._EMPTY
         self.checkpoint = self._EMPTY
 
-    def update(self, value):
-        with self._lock:
-            self.current = self._TYPE(
-                min(self.current.min, value),
-                max(self.current.max, value),
-                self.current.sum + value,
-                self.current.count + 1,
-            )
-            super().update(value)
+    def _fold(self, values):
+        current = self._current
+        self._current = self._TYPE(
+            min(current.min, min(values)),
+            max(current.max, max(values)),
+            current.sum + sum(values),
+            current.count + len(values),
+        )
 
     def take_checkpoint(self):
         with self._lock:
-            self.checkpoint = self.current
-            self.current = self._EMPTY
             super().take_checkpoint()
+            self.checkpoint = self._current
+            self._current = self._EMPTY
 
     def merge(self, other):
         if self._verify_type(other):
@@ -140,8 +227,67 @@ class MinMaxSumCountAggregator(Aggregator):
                 super().merge(other)
 
 
-class HistogramAggregator(Aggregator):
-    """Aggregator for ValueRecorder metrics that keeps a histogram of values."""
+def linear_bounds(start, width, count):
+    """Returns ``count`` histogram bounds, the first one being ``start`` and
+    each next one ``width`` larger."""
+    if count <= 0 or width <= 0:
+        raise ValueError("count and width must be positive.")
+    return [start + width * index for index in range(count)]
+
+
+def exponential_bounds(start, factor, count):
+    """Returns ``count`` histogram bounds, the first one being ``start`` and
+    each next one ``factor`` times larger."""
+    if count <= 0 or start <= 0 or factor <= 1:
+        raise ValueError(
+            "count and start must be positive and factor larger than 1."
+        )
+    return [start * factor ** index for index in range(count)]
+
+
+class _HistogramBuckets(Mapping):
+    """The counts of the buckets of a histogram by their upper bound.
+
+    ``counts`` holds one count per bound, in increasing order of the bounds,
+    and the count of the values not lower than any bound last, the bucket of
+    `math.inf`.
+    """
+
+    __slots__ = ("bounds", "counts")
+
+    def __init__(self, bounds, counts):
+        self.bounds = bounds
+        self.counts = counts
+
+    def __getitem__(self, bound):
+        index = bisect_left(self.bounds, bound)
+        if index < len(self.bounds) and self.bounds[index] == bound:
+            return self.counts[index]
+        if bound == inf:
+            return self.counts[-1]
+        raise KeyError(bound)
+
+    def __iter__(self):
+        return chain(self.bounds, (inf,))
+
+    def __len__(self):
+        return len(self.counts)
+
+    def __repr__(self):
+        return repr(dict(zip(self, self.counts)))
+
+
+class HistogramAggregator(_BufferedAggregator):
+    """Aggregator for ValueRecorder metrics that keeps a histogram of values.
+
+    The bucket bounds are given by the ``bounds`` config, for example with
+    `linear_bounds` or `exponential_bounds`. ``current`` and ``checkpoint``
+    map the upper bound of each bucket to its count.
+
+    The counts of ``current`` and ``checkpoint`` are swapped on checkpoint,
+    and the retired checkpoint counts are zeroed when next updated, so a
+    checkpoint is only valid until the next one is taken.
+    """
 
     def __init__(self, config=None):
         super().__init__(config=config)
@@ -160,37 +306,274 @@ class HistogramAggregator(Aggregator):
                     " order. Using default."
                 )
 
-        self.current = OrderedDict([(bb, 0) for bb in bounds])
-        self.current[inf] = 0
-        self.checkpoint = OrderedDict([(bb, 0) for bb in bounds])
-        self.checkpoint[inf] = 0
+        self._bounds = tuple(bound for bound in bounds if bound != inf)
+        self._empty_counts = array("q", [0]) * (len(self._bounds) + 1)
+        self._bucket_index = partial(bisect_right, self._bounds)
+        self.current = self._create_buckets()
+        self.checkpoint = self._create_buckets()
+        # whether the current counts are those of a retired checkpoint
+        self._stale = False
+
+    def _create_buckets(self):
+        return _HistogramBuckets(self._bounds, self._empty_counts[:])
+
+    def _get_current_counts(self):
+        counts = self._current.counts
+        if self._stale:
+            counts[:] = self._empty_counts
+            self._stale = False
+        return counts
+
+    def _fold_pending(self):
+        self._get_current_counts()
+        super()._fold_pending()
+
+    def _fold(self, values):
+        counts = self._get_current_counts()
+        # the index of the first bucket whose bound is larger than the value
+        for index, count in Counter(map(self._bucket_index, values)).items():
+            counts[index] += count
 
-    def update(self, value):
+    def take_checkpoint(self):
         with self._lock:
-            for bb in self.current.keys():
-                # find first bucket that value is less than
-                if value < bb:
-                    self.current[bb] += 1
-                    break
-            super().update(value)
+            super().take_checkpoint()
+            self.checkpoint, self._current = self._current, self.checkpoint
+            self._stale = True
+
+    def merge(self, other):
+        if self._verify_type(other):
+            with self._lock:
+                if self.checkpoint.bounds == other.checkpoint.bounds:
+                    self.checkpoint = _HistogramBuckets(
+                        self._bounds,
+                        array(
+                            "q",
+                            map(
+                                add,
+                                self.checkpoint.counts,
+                                other.checkpoint.counts,
+                            ),
+                        ),
+                    )
+                    super().merge(other)
+                else:
+                    logger.warning(
+                        "Cannot merge histograms with different buckets."
+                    )
+
+
+# values closer to 0 are counted in the zero bucket of sketches, and
+# infinities in the bucket of the largest float
+_MIN_SKETCH_VALUE = sys.float_info.min
+_MAX_SKETCH_VALUE = sys.float_info.max
+
+
+class DDSketch:
+    """Estimates quantiles of values with a relative error, as the DDSketch
+    algorithm does.
+
+    Values are counted in buckets whose bounds grow exponentially: the
+    bucket of a positive value ``v`` has the index ``ceil(log(v, gamma))``,
+    with ``gamma = (1 + relative_accuracy) / (1 - relative_accuracy)``, so
+    all its values are within ``relative_accuracy`` of the value estimated
+    for the bucket. Negative values are counted in buckets by their absolute
+    value, and values close to 0 in a zero bucket.
+
+    At most ``max_buckets`` buckets are kept for each sign, the buckets of
+    the values closest to 0 are collapsed when there are more, which only
+    lowers the accuracy of the quantiles of these values. Sketches with the
+    same relative accuracy can be merged, and pickled to be merged across
+    processes.
+    """
+
+    def __init__(self, relative_accuracy=0.01, max_buckets=2048):
+        if not 0 < relative_accuracy < 1 or max_buckets <= 0:
+            raise ValueError(
+                "relative_accuracy must be between 0 and 1 and max_buckets "
+                "positive."
+            )
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._multiplier = 1 / log(self.gamma)
+        # counts of the positive and negative values by bucket index
+        self.positive = {}
+        self.negative = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0
+        self.min = inf
+        self.max = -inf
+
+    def add(self, values):
+        """Counts a sequence of values."""
+        if not values:
+            return
+        positive = self.positive
+        negative = self.negative
+        multiplier = self._multiplier
+        for value in values:
+            if value > _MIN_SKETCH_VALUE:
+                index = ceil(log(min(value, _MAX_SKETCH_VALUE)) * multiplier)
+                positive[index] = positive.get(index, 0) + 1
+            elif value < -_MIN_SKETCH_VALUE:
+                index = ceil(log(min(-value, _MAX_SKETCH_VALUE)) * multiplier)
+                negative[index] = negative.get(index, 0) + 1
+            else:
+                self.zero_count += 1
+        self.count += len(values)
+        self.sum += sum(values)
+        self.min = min(self.min, min(values))
+        self.max = max(self.max, max(values))
+        self._collapse()
+
+    def merge(self, other):
+        """Counts the values counted by another sketch with the same
+        relative accuracy."""
+        if other.gamma != self.gamma:
+            raise ValueError(
+                "Cannot merge sketches with different relative accuracy."
+            )
+        for buckets, other_buckets in (
+            (self.positive, other.positive),
+            (self.negative, other.negative),
+        ):
+            for index, count in other_buckets.items():
+                buckets[index] = buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._collapse()
+
+    def copy(self):
+        sketch = DDSketch(self.relative_accuracy, self.max_buckets)
+        sketch.merge(self)
+        return sketch
+
+    def _collapse(self):
+        for buckets in (self.positive, self.negative):
+            if len(buckets) > self.max_buckets:
+                indexes = sorted(buckets)
+                collapsed = indexes[: -self.max_buckets]
+                buckets[indexes[-self.max_buckets]] += sum(
+                    map(buckets.pop, collapsed)
+                )
+
+    def _upper_bound(self, index):
+        try:
+            return self.gamma ** index
+        except OverflowError:
+            # the bucket of infinities
+            return inf
+
+    def _value(self, index):
+        # the value with the same relative error to both bucket bounds
+        return 2 * self._upper_bound(index) / (self.gamma + 1)
+
+    def _values(self):
+        """Yields the estimated value and count of each bucket, in
+        increasing order of the values."""
+        for index in sorted(self.negative, reverse=True):
+            yield -self._value(index), self.negative[index]
+        if self.zero_count:
+            yield 0, self.zero_count
+        for index in sorted(self.positive):
+            yield self._value(index), self.positive[index]
+
+    def quantile(self, quantile):
+        """Returns an estimate of the ``quantile`` of the values, between 0
+        and 1, or None if there are no values."""
+        if not 0 <= quantile <= 1:
+            raise ValueError("quantile must be between 0 and 1.")
+        if not self.count:
+            return None
+        rank = quantile * (self.count - 1)
+        seen = 0
+        for value, count in self._values():
+            seen += count
+            if seen > rank:
+                break
+        return min(max(value, self.min), self.max)
+
+    def buckets(self):
+        """Returns the counts of the buckets by their upper bound, as the
+        buckets of `HistogramAggregator`."""
+        bounds = [
+            -self._upper_bound(index - 1)
+            for index in sorted(self.negative, reverse=True)
+        ]
+        counts = [
+            self.negative[index]
+            for index in sorted(self.negative, reverse=True)
+        ]
+        if self.zero_count:
+            bounds.append(0)
+            counts.append(self.zero_count)
+        for index in sorted(self.positive):
+            bounds.append(self._upper_bound(index))
+            counts.append(self.positive[index])
+        overflow = 0
+        if bounds and bounds[-1] == inf:
+            # infinities are counted in the bucket of `math.inf`
+            bounds.pop()
+            overflow = counts.pop()
+        counts.append(overflow)
+        return _HistogramBuckets(bounds, array("q", counts))
+
+
+class DDSketchAggregator(_BufferedAggregator):
+    """Aggregator for ValueRecorder metrics that keeps a `DDSketch` of the
+    values, to estimate their quantiles.
+
+    The sketches are created with the ``relative_accuracy`` and
+    ``max_buckets`` config, 0.01 and 2048 by default. Exporters report the
+    quantiles of the ``quantiles`` config, 0.5, 0.9 and 0.99 by default.
+    ``current`` and ``checkpoint`` are sketches.
+    """
+
+    def __init__(self, config=None):
+        super().__init__(config=config)
+        sketch_args = (
+            self.config.get("relative_accuracy", 0.01),
+            self.config.get("max_buckets", 2048),
+        )
+        try:
+            DDSketch(*sketch_args)
+        except ValueError:
+            logger.warning("Invalid sketch config. Using default.")
+            sketch_args = ()
+        self.quantiles = tuple(self.config.get("quantiles", (0.5, 0.9, 0.99)))
+        if not all(0 <= quantile <= 1 for quantile in self.quantiles):
+            logger.warning("Quantiles must be between 0 and 1. Using default.")
+            self.quantiles = (0.5, 0.9, 0.99)
+
+        self._create_sketch = partial(DDSketch, *sketch_args)
+        self.current = self._create_sketch()
+        self.checkpoint = self._create_sketch()
+
+    def _fold(self, values):
+        self._current.add(values)
 
     def take_checkpoint(self):
         with self._lock:
-            self.checkpoint = self.current.copy()
-            for bb in self.current.keys():
-                self.current[bb] = 0
             super().take_checkpoint()
+            self.checkpoint = self._current
+            self._current = self._create_sketch()
 
     def merge(self, other):
         if self._verify_type(other):
             with self._lock:
-                if self.checkpoint.keys() == other.checkpoint.keys():
-                    for ii, bb in other.checkpoint.items():
-                        self.checkpoint[ii] += bb
+                if self.checkpoint.gamma == other.checkpoint.gamma:
+                    checkpoint = self.checkpoint.copy()
+                    checkpoint.merge(other.checkpoint)
+                    self.checkpoint = checkpoint
                     super().merge(other)
                 else:
                     logger.warning(
-                        "Cannot merge histograms with different buckets."
+                        "Cannot merge sketches with different relative "
+                        "accuracy."
                     )
 
 
@@ -242,6 +625,10 @@ class ValueObserverAggregator(Aggregator):
         self.checkpoint = self._TYPE(*(self.mmsc.checkpoint + (self.current,)))
         super().take_checkpoint()
 
+    def _at_fork_reinit(self):
+        self.mmsc._at_fork_reinit()  # pylint: disable=protected-access
+        super()._at_fork_reinit()
+
     def merge(self, other):
         if self._verify_type(other):
             self.mmsc.merge(other.mmsc)
@@ -12,19 +12,58 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import threading
+import weakref
 
 from opentelemetry.context import attach, detach, set_value
 from opentelemetry.metrics import Meter
 from opentelemetry.sdk.metrics.export import MetricsExporter
 
 
+def _acquire_collect_locks() -> None:
+    _held_controllers.extend(_push_controllers)
+    for controller in _held_controllers:
+        controller._collect_lock.acquire()  # pylint: disable=protected-access
+
+
+def _release_collect_locks() -> None:
+    for controller in _held_controllers:
+        controller._collect_lock.release()  # pylint: disable=protected-access
+    del _held_controllers[:]
+
+
+def _reinit_push_controllers() -> None:
+    del _held_controllers[:]
+    for controller in list(_push_controllers):
+        controller._at_fork_reinit()  # pylint: disable=protected-access
+
+
+_push_controllers = weakref.WeakSet()  # type: weakref.WeakSet
+# the controllers whose collect lock is held while forking
+_held_controllers = []  # type: list
+
+# os.register_at_fork is only available from Python 3.7
+if hasattr(os, "register_at_fork"):
+    # forking while a controller collects would leave the meter locked in
+    # the child process
+    os.register_at_fork(  # pylint: disable=no-member
+        before=_acquire_collect_locks,
+        after_in_parent=_release_collect_locks,
+        after_in_child=_reinit_push_controllers,
+    )
+
+
 class PushController(threading.Thread):
     """A push based controller, used for collecting and exporting.
 
     Uses a worker thread that periodically collects metrics for exporting,
     exports them and performs some post-processing.
 
+    In a child process forked from the process that started it, the
+    controller starts a new worker thread. Values that were not collected
+    before the fork are only exported by the parent.
+
     Args:
         meter: The meter used to collect metrics.
         exporter: The exporter used to export metrics.
@@ -41,6 +80,22 @@ class PushController(threading.Thread):
         self.exporter = exporter
         self.interval = interval
         self.finished = threading.Event()
+        # held while the meter is collected
+        self._collect_lock = threading.Lock()
+        self.start()
+        _push_controllers.add(self)
+
+    def _at_fork_reinit(self):
+        self._collect_lock = threading.Lock()
+        if self.finished.is_set():
+            return
+        self.finished = threading.Event()
+        # the meter is not collected, as locks held by other threads of the
+        # parent would never be released. Its locks are replaced and the
+        # values of the parent discarded instead.
+        self.meter._at_fork_reinit()  # pylint: disable=protected-access
+        # the thread of the parent does not exist in the child process
+        threading.Thread.__init__(self)
         self.start()
 
     def run(self):
@@ -53,11 +108,14 @@ class PushController(threading.Thread):
         self.tick()
 
     def tick(self):
-        # Collect all of the meter's metrics to be exported
-        self.meter.collect()
+        with self._collect_lock:
+            # Collect all of the meter's metrics to be exported
+            self.meter.collect()
+            metric_records = self.meter.processor.checkpoint_set()
         # Export the collected metrics
         token = attach(set_value("suppress_instrumentation", True))
-        self.exporter.export(self.meter.processor.checkpoint_set())
+        self.exporter.export(metric_records)
         detach(token)
         # Perform post-exporting logic
-        self.meter.processor.finished_collection()
+        with self._collect_lock:
+            self.meter.processor.finished_collection()
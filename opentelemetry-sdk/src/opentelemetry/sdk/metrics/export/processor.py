@@ -61,6 +61,10 @@ class Processor:
         if not self.stateful:
             self._batch_map = {}
 
+    def _at_fork_reinit(self):
+        # the parent exports the values it collected
+        self._batch_map = {}
+
     def process(self, record) -> None:
         """Stores record information to be ready for exporting."""
         # Checkpoints the current aggregator value to be collected for export
@@ -15,7 +15,7 @@
 import logging
 import threading
 from collections import defaultdict
-from typing import Optional, Sequence, Tuple
+from typing import Dict, Optional, Sequence, Tuple
 
 from opentelemetry.metrics import (
     Counter,
@@ -42,10 +42,15 @@ class ViewData:
     def __init__(self, labels: Tuple[Tuple[str, str]], aggregator: Aggregator):
         self.labels = labels
         self.aggregator = aggregator
+        # the number of bound instruments recording in this view data
+        self.bound_count = 0
 
     def record(self, value: ValueT):
         self.aggregator.update(value)
 
+    def record_many(self, values: Sequence[ValueT]):
+        self.aggregator.update_many(values)
+
     # Uniqueness is based on labels and aggregator type
     def __hash__(self):
         return hash((self.labels, self.aggregator.__class__))
@@ -82,30 +87,38 @@ class View:
             label_keys = []
         self.label_keys = sorted(label_keys)
         self.view_config = view_config
-        self.view_datas = set()
+        # view datas by their labels
+        self.view_datas = {}  # type: Dict[Tuple, ViewData]
 
     def get_view_data(self, labels):
         """Find an existing ViewData for this set of labels. If that ViewData
             does not exist, create a new one to represent the labels
         """
-        active_labels = []
+        active_labels = ()
         if self.view_config == ViewConfig.LABEL_KEYS:
             # reduce the set of labels to only labels specified in label_keys
-            active_labels = {
-                (lk, lv) for lk, lv in labels if lk in set(self.label_keys)
-            }
-            active_labels = tuple(active_labels)
+            active_labels = tuple(
+                (lk, lv) for lk, lv in labels if lk in self.label_keys
+            )
         elif self.view_config == ViewConfig.UNGROUPED:
             active_labels = labels
 
-        for view_data in self.view_datas:
-            if view_data.labels == active_labels:
-                return view_data
-        new_view_data = ViewData(
-            active_labels, self.aggregator(self.aggregator_config)
-        )
-        self.view_datas.add(new_view_data)
-        return new_view_data
+        view_data = self.view_datas.get(active_labels)
+        if view_data is None:
+            view_data = ViewData(
+                active_labels, self.aggregator(self.aggregator_config)
+            )
+            self.view_datas[active_labels] = view_data
+        view_data.bound_count += 1
+        return view_data
+
+    def release_view_data(self, view_data):
+        """Forgets the ViewData once no bound instrument records in it."""
+        if self.view_datas.get(view_data.labels) is not view_data:
+            return
+        view_data.bound_count -= 1
+        if view_data.bound_count == 0:
+            del self.view_datas[view_data.labels]
 
     # Uniqueness is based on metric, aggregator type, aggregator config,
     # ordered label keys and ViewConfig
@@ -136,6 +149,9 @@ class ViewManager:
         self._view_lock = threading.Lock()
         self.view_datas = set()
 
+    def _at_fork_reinit(self):
+        self._view_lock = threading.Lock()
+
     def register_view(self, view):
         with self._view_lock:
             if view not in self.views[view.metric]:
@@ -166,6 +182,12 @@ class ViewManager:
 
         return view_datas
 
+    def release_view_datas(self, metric, view_datas):
+        """Releases the view datas of an expired bound instrument."""
+        for view in self.views.get(metric, ()):
+            for view_data in view_datas:
+                view.release_view_data(view_data)
+
 
 def get_default_aggregator(instrument: InstrumentT) -> Aggregator:
     """Returns an aggregator based on metric instrument's type.
@@ -16,17 +16,18 @@
 import abc
 import atexit
 import concurrent.futures
+import functools
+import inspect
 import json
 import logging
+import os
 import threading
 import traceback
 from collections import OrderedDict
-from contextlib import contextmanager
 from types import MappingProxyType, TracebackType
 from typing import (
     Any,
     Callable,
-    Iterator,
     MutableSequence,
     Optional,
     Sequence,
@@ -58,6 +59,32 @@ MAX_NUM_EVENTS = 1000
 MAX_NUM_LINKS = 1000
 VALID_ATTR_VALUE_TYPES = (bool, str, int, float)
 
+# spans share a fixed set of locks instead of allocating one each
+_SPAN_LOCKS = tuple(threading.Lock() for _ in range(64))
+_EMPTY_ATTRIBUTES = MappingProxyType({})  # type: types.Attributes
+_UNSET_STATUS = Status(StatusCode.UNSET)
+_SAMPLED_FLAGS = trace_api.TraceFlags(trace_api.TraceFlags.SAMPLED)
+_DEFAULT_FLAGS = trace_api.TraceFlags(trace_api.TraceFlags.DEFAULT)
+
+
+def _get_span_lock(span) -> threading.Lock:
+    # looked up on every use, the locks are replaced in forked children
+    return _SPAN_LOCKS[(id(span) >> 4) % len(_SPAN_LOCKS)]
+
+
+def _reinit_span_locks() -> None:
+    # in forked child processes, locks held by other threads of the parent
+    # would never be released
+    global _SPAN_LOCKS  # pylint: disable=global-statement
+    _SPAN_LOCKS = tuple(threading.Lock() for _ in range(64))
+
+
+# os.register_at_fork is only available from Python 3.7
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(  # pylint: disable=no-member
+        after_in_child=_reinit_span_locks
+    )
+
 
 class SpanProcessor:
     """Interface which allows hooks for SDK's `Span` start and end method
@@ -314,6 +341,10 @@ def _is_valid_attribute_value(value: types.AttributeValue) -> bool:
       - are not a sequence
     """
 
+    # most attribute values are scalars, check them before the ABC lookup
+    if type(value) in VALID_ATTR_VALUE_TYPES:
+        return True
+
     if isinstance(value, Sequence):
         if len(value) == 0:
             return True
@@ -375,7 +406,7 @@ def _check_span_ended(func):
     def wrapper(self, *args, **kwargs):
         already_ended = False
         with self._lock:  # pylint: disable=protected-access
-            if self.end_time is None:
+            if self._end_time is None:  # pylint: disable=protected-access
                 func(self, *args, **kwargs)
             else:
                 already_ended = True
@@ -405,13 +436,39 @@ class Span(trace_api.Span):
         links: Links to other spans to be exported
         span_processor: `SpanProcessor` to invoke when starting and ending
             this `Span`.
+
+    Spans define ``__slots__``, share a striped lock, and only allocate their
+    attribute, event and link containers once they are needed.
     """
 
+    __slots__ = (
+        "name",
+        "context",
+        "parent",
+        "sampler",
+        "trace_config",
+        "resource",
+        "kind",
+        "_set_status_on_exception",
+        "span_processor",
+        "status",
+        "_attributes",
+        "_events",
+        "_links",
+        "_end_time",
+        "_start_time",
+        "instrumentation_info",
+    )
+
     def __new__(cls, *args, **kwargs):
         if cls is Span:
             raise TypeError("Span must be instantiated via a tracer.")
         return super().__new__(cls)
 
+    @property
+    def _lock(self) -> threading.Lock:
+        return _get_span_lock(self)
+
     def __init__(
         self,
         name: str,
@@ -439,31 +496,31 @@ class Span(trace_api.Span):
         self._set_status_on_exception = set_status_on_exception
 
         self.span_processor = span_processor
-        self.status = Status(StatusCode.UNSET)
-        self._lock = threading.Lock()
+        self.status = _UNSET_STATUS
 
         _filter_attribute_values(attributes)
         if not attributes:
-            self.attributes = self._new_attributes()
+            self._attributes = None  # type: Optional[BoundedDict]
         else:
-            self.attributes = BoundedDict.from_map(
+            self._attributes = BoundedDict.from_map(
                 MAX_NUM_ATTRIBUTES, attributes
             )
 
-        self.events = self._new_events()
+        self._events = None  # type: Optional[BoundedList]
         if events:
+            self._events = self._new_events()
             for event in events:
                 _filter_attribute_values(event.attributes)
                 # pylint: disable=protected-access
                 event._attributes = _create_immutable_attributes(
                     event.attributes
                 )
-                self.events.append(event)
+                self._events.append(event)
 
-        if links is None:
-            self.links = self._new_links()
+        if not links:
+            self._links = None  # type: Optional[BoundedList]
         else:
-            self.links = BoundedList.from_seq(MAX_NUM_LINKS, links)
+            self._links = BoundedList.from_seq(MAX_NUM_LINKS, links)
 
         self._end_time = None  # type: Optional[int]
         self._start_time = None  # type: Optional[int]
@@ -477,6 +534,24 @@ class Span(trace_api.Span):
     def end_time(self):
         return self._end_time
 
+    @property
+    def attributes(self) -> types.Attributes:
+        if self._attributes is None:
+            return _EMPTY_ATTRIBUTES
+        return self._attributes
+
+    @property
+    def events(self) -> Sequence[Event]:
+        if self._events is None:
+            return ()
+        return self._events
+
+    @property
+    def links(self) -> Sequence[trace_api.Link]:
+        if self._links is None:
+            return ()
+        return self._links
+
     def __repr__(self):
         return '{}(name="{}", context={})'.format(
             type(self).__name__, self.name, self.context
@@ -583,7 +658,7 @@ class Span(trace_api.Span):
             return
 
         with self._lock:
-            if self.end_time is not None:
+            if self._end_time is not None:
                 logger.warning("Setting attribute on ended span.")
                 return
 
@@ -596,11 +671,15 @@ class Span(trace_api.Span):
                 except ValueError:
                     logger.warning("Byte attribute could not be decoded.")
                     return
-            self.attributes[key] = value
+            if self._attributes is None:
+                self._attributes = self._new_attributes()
+            self._attributes[key] = value
 
     @_check_span_ended
     def _add_event(self, event: EventBase) -> None:
-        self.events.append(event)
+        if self._events is None:
+            self._events = self._new_events()
+        self._events.append(event)
 
     def add_event(
         self,
@@ -624,7 +703,7 @@ class Span(trace_api.Span):
         parent_context: Optional[context_api.Context] = None,
     ) -> None:
         with self._lock:
-            if self.start_time is not None:
+            if self._start_time is not None:
                 logger.warning("Calling start() on a started span.")
                 return
             self._start_time = (
@@ -635,9 +714,9 @@ class Span(trace_api.Span):
 
     def end(self, end_time: Optional[int] = None) -> None:
         with self._lock:
-            if self.start_time is None:
+            if self._start_time is None:
                 raise RuntimeError("Calling end() on a not started span.")
-            if self.end_time is not None:
+            if self._end_time is not None:
                 logger.warning("Calling end() on an ended span.")
                 return
 
@@ -712,6 +791,182 @@ class _Span(Span):
     This constructor should only be used internally.
     """
 
+    __slots__ = ()
+
+
+class _NonRecordingSpan(trace_api.DefaultSpan):
+    """The span `Tracer.start_span` returns when the sampler drops a span.
+
+    The span id is only generated once the span context is requested, e.g.
+    to inject it into outgoing requests, and dropped children of this span
+    reuse it instead of allocating a new one.
+    """
+
+    __slots__ = ("_trace_id", "_trace_state", "_ids_generator")
+
+    def __init__(
+        self,
+        trace_id: int,
+        trace_state: Optional[trace_api.TraceState],
+        ids_generator: trace_api.IdsGenerator,
+    ) -> None:
+        # pylint: disable=super-init-not-called
+        self._context = None
+        self._trace_id = trace_id
+        self._trace_state = trace_state
+        self._ids_generator = ids_generator
+
+    def get_span_context(self) -> trace_api.SpanContext:
+        if self._context is None:
+            with _get_span_lock(self):
+                if self._context is None:
+                    self._context = trace_api.SpanContext(
+                        self._trace_id,
+                        self._ids_generator.generate_span_id(),
+                        is_remote=False,
+                        trace_flags=_DEFAULT_FLAGS,
+                        trace_state=self._trace_state,
+                    )
+        return self._context
+
+
+class _UseSpan:
+    """The context manager `Tracer.use_span` returns.
+
+    Sets the span as current on enter and, on exit, restores the previous
+    context, records exceptions on the span and optionally ends it. It can
+    also decorate a function, each call then uses a new instance.
+    """
+
+    __slots__ = ("_span", "_end_on_exit", "_record_exception", "_token")
+
+    def __init__(
+        self, span: trace_api.Span, end_on_exit: bool, record_exception: bool
+    ) -> None:
+        self._span = span
+        self._end_on_exit = end_on_exit
+        self._record_exception = record_exception
+        self._token = None  # type: Optional[object]
+
+    def _recreate(self) -> "_UseSpan":
+        return _UseSpan(self._span, self._end_on_exit, self._record_exception)
+
+    def __enter__(self) -> trace_api.Span:
+        self._token = context_api.attach(
+            context_api.set_value(SPAN_KEY, self._span)
+        )
+        return self._span
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> bool:
+        context_api.detach(self._token)
+        span = self._span
+
+        if isinstance(exc_val, Exception) and isinstance(span, Span):
+            if self._record_exception:
+                span.record_exception(exc_val)
+
+            # Records status if use_span is used
+            # i.e. with tracer.start_as_current_span() as span:
+            # pylint:disable=protected-access
+            if (
+                span.status.status_code is StatusCode.UNSET
+                and span._set_status_on_exception
+            ):
+                span.set_status(
+                    Status(
+                        status_code=getattr(
+                            exc_val, EXCEPTION_STATUS_FIELD, StatusCode.ERROR,
+                        ),
+                        description="{}: {}".format(
+                            type(exc_val).__name__, exc_val
+                        ),
+                    )
+                )
+
+        if self._end_on_exit:
+            span.end()
+        return False
+
+    def __call__(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with self._recreate():
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self._recreate():
+                return func(*args, **kwargs)
+
+        return wrapper
+
+
+class _StartAsCurrentSpan(_UseSpan):
+    """The context manager `Tracer.start_as_current_span` returns.
+
+    The span is started on enter, so that a function decorated with it
+    starts a new span for each call.
+    """
+
+    __slots__ = (
+        "_tracer",
+        "_name",
+        "_context",
+        "_kind",
+        "_attributes",
+        "_links",
+    )
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        context: Optional[context_api.Context],
+        kind: trace_api.SpanKind,
+        attributes: types.Attributes,
+        links: Sequence[trace_api.Link],
+        record_exception: bool,
+    ) -> None:
+        # pylint: disable=too-many-arguments
+        super().__init__(None, True, record_exception)
+        self._tracer = tracer
+        self._name = name
+        self._context = context
+        self._kind = kind
+        self._attributes = attributes
+        self._links = links
+
+    def _recreate(self) -> "_StartAsCurrentSpan":
+        return _StartAsCurrentSpan(
+            self._tracer,
+            self._name,
+            self._context,
+            self._kind,
+            self._attributes,
+            self._links,
+            self._record_exception,
+        )
+
+    def __enter__(self) -> trace_api.Span:
+        self._span = span = self._tracer.start_span(
+            self._name,
+            self._context,
+            self._kind,
+            self._attributes,
+            self._links,
+        )
+        self._token = context_api.attach(context_api.set_value(SPAN_KEY, span))
+        return span
+
 
 class Tracer(trace_api.Tracer):
     """See `opentelemetry.trace.Tracer`.
@@ -733,6 +988,16 @@ class Tracer(trace_api.Tracer):
         self.ids_generator = ids_generator
         self.instrumentation_info = instrumentation_info
 
+    @property
+    def sampler(self) -> sampling.Sampler:
+        return self._sampler
+
+    @sampler.setter
+    def sampler(self, sampler: sampling.Sampler) -> None:
+        self._sampler = sampler
+        # pylint: disable=protected-access
+        self._should_sample = sampling._get_should_sample(sampler)
+
     def start_as_current_span(
         self,
         name: str,
@@ -741,10 +1006,9 @@ class Tracer(trace_api.Tracer):
         attributes: types.Attributes = None,
         links: Sequence[trace_api.Link] = (),
         record_exception: bool = True,
-    ) -> Iterator[trace_api.Span]:
-        span = self.start_span(name, context, kind, attributes, links)
-        return self.use_span(
-            span, end_on_exit=True, record_exception=record_exception
+    ) -> _StartAsCurrentSpan:
+        return _StartAsCurrentSpan(
+            self, name, context, kind, attributes, links, record_exception
         )
 
     def start_span(  # pylint: disable=too-many-locals
@@ -758,41 +1022,65 @@ class Tracer(trace_api.Tracer):
         set_status_on_exception: bool = True,
     ) -> trace_api.Span:
 
-        parent_span_context = trace_api.get_current_span(
-            context
-        ).get_span_context()
+        parent_span = trace_api.get_current_span(context)
 
-        if parent_span_context is not None and not isinstance(
-            parent_span_context, trace_api.SpanContext
-        ):
-            raise TypeError(
-                "parent_span_context must be a SpanContext or None."
-            )
-
-        # is_valid determines root span
-        if parent_span_context is None or not parent_span_context.is_valid:
+        if type(parent_span) is _NonRecordingSpan:
+            # read the trace of a dropped parent without generating its span
+            # id, the parent span context is only needed if this span records
+            # pylint:disable=protected-access
             parent_span_context = None
-            trace_id = self.ids_generator.generate_trace_id()
-            trace_flags = None
-            trace_state = None
+            trace_id = parent_span._trace_id
+            trace_state = parent_span._trace_state
         else:
-            trace_id = parent_span_context.trace_id
-            trace_flags = parent_span_context.trace_flags
-            trace_state = parent_span_context.trace_state
+            parent_span_context = parent_span.get_span_context()
+            parent_span = None
+
+            if (
+                parent_span_context is not None
+                and type(parent_span_context) is not trace_api.SpanContext
+                and not isinstance(parent_span_context, trace_api.SpanContext)
+            ):
+                raise TypeError(
+                    "parent_span_context must be a SpanContext or None."
+                )
+
+            # is_valid determines root span
+            if parent_span_context is None or not parent_span_context.is_valid:
+                parent_span_context = None
+                trace_id = self.ids_generator.generate_trace_id()
+                trace_state = None
+            else:
+                trace_id = parent_span_context.trace_id
+                trace_state = parent_span_context.trace_state
 
         # The sampler decides whether to create a real or no-op span at the
         # time of span creation. No-op spans do not record events, and are not
         # exported.
         # The sampler may also add attributes to the newly-created span, e.g.
         # to include information about the sampling result.
-        sampling_result = self.sampler.should_sample(
-            context, trace_id, name, attributes, links, trace_state
+        sampling_result = self._should_sample(
+            context, trace_id, name, attributes, links, trace_state, kind
         )
 
+        # Dropped spans skip the span context and reuse a dropped parent
+        if not sampling_result.decision.is_recording():
+            if parent_span is not None and (
+                sampling_result.trace_state is None
+                # pylint:disable=protected-access
+                or sampling_result.trace_state is parent_span._trace_state
+            ):
+                return parent_span
+            return _NonRecordingSpan(
+                trace_id, sampling_result.trace_state, self.ids_generator
+            )
+
+        if parent_span is not None:
+            parent_span_context = parent_span.get_span_context()
+
         trace_flags = (
-            trace_api.TraceFlags(trace_api.TraceFlags.SAMPLED)
+            _SAMPLED_FLAGS
             if sampling_result.decision.is_sampled()
-            else trace_api.TraceFlags(trace_api.TraceFlags.DEFAULT)
+            else _DEFAULT_FLAGS
         )
         span_context = trace_api.SpanContext(
             trace_id,
@@ -802,70 +1090,34 @@ class Tracer(trace_api.Tracer):
             trace_state=sampling_result.trace_state,
         )
 
-        # Only record if is_recording() is true
-        if sampling_result.decision.is_recording():
-            # pylint:disable=protected-access
-            span = _Span(
-                name=name,
-                context=span_context,
-                parent=parent_span_context,
-                sampler=self.sampler,
-                resource=self.resource,
-                attributes=sampling_result.attributes.copy(),
-                span_processor=self.span_processor,
-                kind=kind,
-                links=links,
-                instrumentation_info=self.instrumentation_info,
-                set_status_on_exception=set_status_on_exception,
-            )
-            span.start(start_time=start_time, parent_context=context)
-        else:
-            span = trace_api.DefaultSpan(context=span_context)
+        # the span filters its attributes in place, so only copy them
+        # when there is something to copy
+        attributes = sampling_result.attributes
+        attributes = attributes.copy() if attributes else None
+        # pylint:disable=protected-access
+        span = _Span(
+            name=name,
+            context=span_context,
+            parent=parent_span_context,
+            sampler=self.sampler,
+            resource=self.resource,
+            attributes=attributes,
+            span_processor=self.span_processor,
+            kind=kind,
+            links=links,
+            instrumentation_info=self.instrumentation_info,
+            set_status_on_exception=set_status_on_exception,
+        )
+        span.start(start_time=start_time, parent_context=context)
         return span
 
-    @contextmanager
     def use_span(
         self,
         span: trace_api.Span,
         end_on_exit: bool = False,
         record_exception: bool = True,
-    ) -> Iterator[trace_api.Span]:
-        try:
-            token = context_api.attach(context_api.set_value(SPAN_KEY, span))
-            try:
-                yield span
-            finally:
-                context_api.detach(token)
-
-        except Exception as error:  # pylint: disable=broad-except
-            # pylint:disable=protected-access
-            if isinstance(span, Span):
-                if record_exception:
-                    span.record_exception(error)
-
-                # Records status if use_span is used
-                # i.e. with tracer.start_as_current_span() as span:
-                if (
-                    span.status.status_code is StatusCode.UNSET
-                    and span._set_status_on_exception
-                ):
-                    span.set_status(
-                        Status(
-                            status_code=getattr(
-                                error,
-                                EXCEPTION_STATUS_FIELD,
-                                StatusCode.ERROR,
-                            ),
-                            description="{}: {}".format(
-                                type(error).__name__, error
-                            ),
-                        )
-                    )
-            raise
-
-        finally:
-            if end_on_exit:
-                span.end()
+    ) -> _UseSpan:
+        return _UseSpan(span, end_on_exit, record_exception)
 
 
 class TracerProvider(trace_api.TracerProvider):
@@ -883,7 +1135,7 @@ class TracerProvider(trace_api.TracerProvider):
             active_span_processor or SynchronousMultiSpanProcessor()
         )
         if ids_generator is None:
-            self.ids_generator = trace_api.RandomIdsGenerator()
+            self.ids_generator = trace_api.ForkSafeRandomIdsGenerator()
         else:
             self.ids_generator = ids_generator
         self.resource = resource
@@ -12,18 +12,26 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import collections
+import abc
+import asyncio
+import concurrent.futures
 import logging
 import os
 import sys
 import threading
 import typing
+import weakref
+from array import array
 from enum import Enum
 
+from opentelemetry import trace as trace_api
 from opentelemetry.configuration import Configuration
 from opentelemetry.context import Context, attach, detach, set_value
+from opentelemetry.sdk.resources import Resource
 from opentelemetry.sdk.trace import Span, SpanProcessor
-from opentelemetry.util import time_ns
+from opentelemetry.sdk.util import BoundedDict, BoundedQueue, BytesBoundedQueue
+from opentelemetry.sdk.util.instrumentation import InstrumentationInfo
+from opentelemetry.util import time_ns, types
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +41,124 @@ class SpanExportResult(Enum):
     FAILURE = 1
 
 
+class SpanBatch(typing.Sequence[Span]):
+    """A batch of ended spans, as passed to the `SpanExporter.export` of
+    exporters setting `SpanExporter.accepts_span_batch`.
+
+    The batch is a sequence of the spans it was created from, so exporters can
+    keep iterating over it. It also holds a columnar view of the spans built
+    in a single pass: parallel arrays with one entry per span and tables of
+    the distinct trace ids, names, resources and instrumentation infos that
+    the ``*_indices`` arrays point into. Exporters can encode values once per
+    table entry instead of once per span.
+
+    Args:
+        spans: The spans in the batch.
+    """
+
+    def __init__(self, spans: typing.Iterable[Span]):
+        self.spans = tuple(spans)
+
+        self.trace_ids = []  # type: typing.List[int]
+        self.trace_id_indices = array("I")
+        self.span_ids = array("Q")
+        # 0 for spans without a parent
+        self.parent_span_ids = array("Q")
+        # 0 for spans that were not started or not ended
+        self.start_times = array("q")
+        self.end_times = array("q")
+        # the value of the span's SpanKind and StatusCode
+        self.kinds = array("B")
+        self.status_codes = array("B")
+        self.names = []  # type: typing.List[str]
+        self.name_indices = array("I")
+        self.resources = []  # type: typing.List[Resource]
+        self.resource_indices = array("I")
+        self.instrumentation_infos = (
+            []
+        )  # type: typing.List[typing.Optional[InstrumentationInfo]]
+        self.instrumentation_info_indices = array("I")
+
+        trace_id_indices = {}  # type: typing.Dict[int, int]
+        name_indices = {}  # type: typing.Dict[str, int]
+        # Resource hashes its attributes, so look resources up by identity
+        # first and only hash each distinct object once
+        resource_indices_by_id = {}  # type: typing.Dict[int, int]
+        resource_indices = {}  # type: typing.Dict[Resource, int]
+        instrumentation_info_indices = (
+            {}
+        )  # type: typing.Dict[typing.Optional[InstrumentationInfo], int]
+
+        for span in self.spans:
+            context = span.get_span_context()
+
+            index = trace_id_indices.get(context.trace_id)
+            if index is None:
+                index = trace_id_indices[context.trace_id] = len(
+                    self.trace_ids
+                )
+                self.trace_ids.append(context.trace_id)
+            self.trace_id_indices.append(index)
+
+            self.span_ids.append(context.span_id)
+            parent = span.parent
+            if parent is None:
+                self.parent_span_ids.append(0)
+            elif isinstance(parent, trace_api.Span):
+                self.parent_span_ids.append(parent.get_span_context().span_id)
+            else:
+                self.parent_span_ids.append(parent.span_id)
+
+            self.start_times.append(span.start_time or 0)
+            self.end_times.append(span.end_time or 0)
+            self.kinds.append(span.kind.value)
+            self.status_codes.append(span.status.status_code.value)
+
+            index = name_indices.get(span.name)
+            if index is None:
+                index = name_indices[span.name] = len(self.names)
+                self.names.append(span.name)
+            self.name_indices.append(index)
+
+            index = resource_indices_by_id.get(id(span.resource))
+            if index is None:
+                index = resource_indices.setdefault(
+                    span.resource, len(self.resources)
+                )
+                if index == len(self.resources):
+                    self.resources.append(span.resource)
+                resource_indices_by_id[id(span.resource)] = index
+            self.resource_indices.append(index)
+
+            index = instrumentation_info_indices.get(span.instrumentation_info)
+            if index is None:
+                index = instrumentation_info_indices[
+                    span.instrumentation_info
+                ] = len(self.instrumentation_infos)
+                self.instrumentation_infos.append(span.instrumentation_info)
+            self.instrumentation_info_indices.append(index)
+
+    def __getitem__(self, index):
+        return self.spans[index]
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+    def __iter__(self) -> typing.Iterator[Span]:
+        return iter(self.spans)
+
+    def __repr__(self) -> str:
+        return "{}({!r})".format(type(self).__name__, self.spans)
+
+    @classmethod
+    def create(cls, spans: typing.Iterable[Span]) -> "SpanBatch":
+        """Returns ``spans`` if it already is a `SpanBatch`, otherwise a new
+        `SpanBatch` of ``spans``."""
+        if isinstance(spans, cls):
+            return spans
+        return cls(spans)
+
+
 class SpanExporter:
     """Interface for exporting spans.
 
@@ -41,8 +167,16 @@ class SpanExporter:
 
     To export data this MUST be registered to the :class`opentelemetry.sdk.trace.Tracer` using a
     `SimpleExportSpanProcessor` or a `BatchExportSpanProcessor`.
+
+    Exporters whose `export` method must not be called concurrently from
+    several threads have to set `thread_safe` to ``False``. Exporters reading
+    the columns of a `SpanBatch` can set `accepts_span_batch` to ``True`` to
+    get one from the batch span processors instead of a list of spans.
     """
 
+    thread_safe = True
+    accepts_span_batch = False
+
     def export(self, spans: typing.Sequence[Span]) -> "SpanExportResult":
         """Exports a batch of telemetry data.
 
@@ -60,6 +194,50 @@ class SpanExporter:
         """
 
 
+class AsyncSpanExporter(abc.ABC):
+    """Interface for exporting spans from an asyncio event loop.
+
+    Interface to be implemented by services that want to export recorded
+    spans without blocking the event loop of the application.
+
+    To export data this MUST be registered to the :class`opentelemetry.sdk.trace.Tracer` using an
+    `AsyncBatchSpanProcessor`.
+
+    Exporters reading the columns of a `SpanBatch` can set
+    `accepts_span_batch` to ``True`` to get one instead of a list of spans.
+    """
+
+    accepts_span_batch = False
+
+    @abc.abstractmethod
+    async def export(self, spans: typing.Sequence[Span]) -> "SpanExportResult":
+        """Exports a batch of telemetry data.
+
+        Args:
+            spans: The list of `opentelemetry.trace.Span` objects to be exported
+
+        Returns:
+            The result of the export
+        """
+
+    async def shutdown(self) -> None:
+        """Shuts down the exporter.
+
+        Called when the SDK is shut down.
+        """
+
+
+def _to_span_batch(
+    span_exporter: typing.Union[SpanExporter, AsyncSpanExporter],
+    spans: typing.List[Span],
+) -> typing.Sequence[Span]:
+    """Returns a `SpanBatch` of ``spans`` for exporters accepting one, and
+    ``spans`` otherwise."""
+    if getattr(span_exporter, "accepts_span_batch", False):
+        return SpanBatch(spans)
+    return spans
+
+
 class SimpleExportSpanProcessor(SpanProcessor):
     """Simple SpanProcessor implementation.
 
@@ -104,11 +282,137 @@ class _FlushRequest:
         self.num_spans = 0
 
 
+def _get_batch_parameters(
+    max_queue_size: typing.Optional[int],
+    schedule_delay_millis: typing.Optional[float],
+    max_export_batch_size: typing.Optional[int],
+    export_timeout_millis: typing.Optional[float],
+) -> typing.Tuple[int, float, int, float]:
+    """Fills in the configured defaults of the batch span processor
+    parameters and validates them."""
+    if max_queue_size is None:
+        max_queue_size = Configuration().get("BSP_MAX_QUEUE_SIZE", 2048)
+
+    if schedule_delay_millis is None:
+        schedule_delay_millis = Configuration().get(
+            "BSP_SCHEDULE_DELAY_MILLIS", 5000
+        )
+
+    if max_export_batch_size is None:
+        max_export_batch_size = Configuration().get(
+            "BSP_MAX_EXPORT_BATCH_SIZE", 512
+        )
+
+    if export_timeout_millis is None:
+        export_timeout_millis = Configuration().get(
+            "BSP_EXPORT_TIMEOUT_MILLIS", 30000
+        )
+
+    if max_queue_size <= 0:
+        raise ValueError("max_queue_size must be a positive integer.")
+
+    if schedule_delay_millis <= 0:
+        raise ValueError("schedule_delay_millis must be positive.")
+
+    if max_export_batch_size <= 0:
+        raise ValueError("max_export_batch_size must be a positive integer.")
+
+    if max_export_batch_size > max_queue_size:
+        raise ValueError(
+            "max_export_batch_size must be less than or equal to max_queue_size."
+        )
+
+    return (
+        max_queue_size,
+        schedule_delay_millis,
+        max_export_batch_size,
+        export_timeout_millis,
+    )
+
+
+# rough encoded sizes of the fixed fields of spans, events, links and
+# attributes: ids, timestamps, kind, status and field tags
+_SPAN_OVERHEAD = 64
+_EVENT_OVERHEAD = 16
+_LINK_OVERHEAD = 32
+_ATTRIBUTE_OVERHEAD = 8
+
+
+def _estimate_attributes_size(attributes: types.Attributes) -> int:
+    if isinstance(attributes, BoundedDict):
+        # the attributes of ended spans no longer change, and the items of
+        # the underlying dict are much faster to iterate
+        attributes = attributes._dict  # pylint: disable=protected-access
+    size = 0
+    for key, value in attributes.items():
+        size += _ATTRIBUTE_OVERHEAD + len(key)
+        if isinstance(value, str):
+            size += len(value)
+        elif isinstance(value, (bool, int, float)):
+            size += 8
+        else:
+            for element in value:
+                size += len(element) if isinstance(element, str) else 8
+    return size
+
+
+def _estimate_span_size(span: Span) -> int:
+    """Estimates the size of the span encoded for export in bytes, without
+    its resource and instrumentation info which batches share."""
+    size = (
+        _SPAN_OVERHEAD
+        + len(span.name)
+        + _estimate_attributes_size(span.attributes)
+    )
+    for event in span.events:
+        size += (
+            _EVENT_OVERHEAD
+            + len(event.name)
+            + _estimate_attributes_size(event.attributes)
+        )
+    for link in span.links:
+        size += _LINK_OVERHEAD + _estimate_attributes_size(link.attributes)
+    return size
+
+
+def _reinit_batch_span_processors() -> None:
+    for span_processor in list(_batch_span_processors):
+        span_processor._at_fork_reinit()  # pylint: disable=protected-access
+
+
+_batch_span_processors = weakref.WeakSet()  # type: weakref.WeakSet
+
+# os.register_at_fork is only available from Python 3.7
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(  # pylint: disable=no-member
+        after_in_child=_reinit_batch_span_processors
+    )
+
+
 class BatchExportSpanProcessor(SpanProcessor):
     """Batch span processor implementation.
 
     BatchExportSpanProcessor is an implementation of `SpanProcessor` that
     batches ended spans and pushes them to the configured `SpanExporter`.
+
+    Ended spans are queued without taking a lock. When the queue is full new
+    spans are dropped and counted in `dropped_spans`.
+
+    With ``max_concurrent_exports`` greater than one, batches are handed to a
+    pool of export threads so that a slow export does not block the next
+    batches. Exporters that are not `SpanExporter.thread_safe` are always
+    called serially.
+
+    ``max_queue_bytes`` and ``max_export_batch_bytes`` additionally bound the
+    queue and the export batches by the estimated encoded size of the spans,
+    for example to stay below the maximum message size of the receiver. A
+    span larger than ``max_export_batch_bytes`` is exported in a batch of its
+    own, a span larger than ``max_queue_bytes`` is dropped.
+
+    In a child process forked from the process that created it (for example
+    a preforking web server worker), the processor starts with an empty
+    queue and new worker threads, the spans queued before the fork are
+    exported by the parent.
     """
 
     def __init__(
@@ -118,46 +422,64 @@ class BatchExportSpanProcessor(SpanProcessor):
         schedule_delay_millis: float = None,
         max_export_batch_size: int = None,
         export_timeout_millis: float = None,
+        max_concurrent_exports: int = None,
+        max_queue_bytes: int = None,
+        max_export_batch_bytes: int = None,
     ):
 
-        if max_queue_size is None:
-            max_queue_size = Configuration().get("BSP_MAX_QUEUE_SIZE", 2048)
-
-        if schedule_delay_millis is None:
-            schedule_delay_millis = Configuration().get(
-                "BSP_SCHEDULE_DELAY_MILLIS", 5000
+        (
+            max_queue_size,
+            schedule_delay_millis,
+            max_export_batch_size,
+            export_timeout_millis,
+        ) = _get_batch_parameters(
+            max_queue_size,
+            schedule_delay_millis,
+            max_export_batch_size,
+            export_timeout_millis,
+        )
+
+        if max_concurrent_exports is None:
+            max_concurrent_exports = Configuration().get(
+                "BSP_MAX_CONCURRENT_EXPORTS", 1
             )
 
-        if max_export_batch_size is None:
-            max_export_batch_size = Configuration().get(
-                "BSP_MAX_EXPORT_BATCH_SIZE", 512
+        if max_concurrent_exports <= 0:
+            raise ValueError(
+                "max_concurrent_exports must be a positive integer."
             )
 
-        if export_timeout_millis is None:
-            export_timeout_millis = Configuration().get(
-                "BSP_EXPORT_TIMEOUT_MILLIS", 30000
+        if max_concurrent_exports > 1 and not span_exporter.thread_safe:
+            logger.warning(
+                "%s is not thread safe, exporting serially.",
+                type(span_exporter).__name__,
             )
+            max_concurrent_exports = 1
 
-        if max_queue_size <= 0:
-            raise ValueError("max_queue_size must be a positive integer.")
-
-        if schedule_delay_millis <= 0:
-            raise ValueError("schedule_delay_millis must be positive.")
+        if max_queue_bytes is None:
+            max_queue_bytes = Configuration().get("BSP_MAX_QUEUE_BYTES", None)
 
-        if max_export_batch_size <= 0:
-            raise ValueError(
-                "max_export_batch_size must be a positive integer."
+        if max_export_batch_bytes is None:
+            max_export_batch_bytes = Configuration().get(
+                "BSP_MAX_EXPORT_BATCH_BYTES", None
             )
 
-        if max_export_batch_size > max_queue_size:
+        if max_queue_bytes is not None and max_queue_bytes <= 0:
+            raise ValueError("max_queue_bytes must be a positive integer.")
+
+        if max_export_batch_bytes is not None and max_export_batch_bytes <= 0:
             raise ValueError(
-                "max_export_batch_size must be less than or equal to max_queue_size."
+                "max_export_batch_bytes must be a positive integer."
             )
 
         self.span_exporter = span_exporter
-        self.queue = collections.deque(
-            [], max_queue_size
-        )  # type: typing.Deque[Span]
+        self.max_queue_bytes = max_queue_bytes
+        self.max_export_batch_bytes = max_export_batch_bytes
+        # span sizes are only estimated when bounded by bytes
+        self._sized = not (
+            max_queue_bytes is None and max_export_batch_bytes is None
+        )
+        self.queue = self._create_queue(max_queue_size)
         self.worker_thread = threading.Thread(target=self.worker, daemon=True)
         self.condition = threading.Condition(threading.Lock())
         self._flush_request = None  # type: typing.Optional[_FlushRequest]
@@ -165,14 +487,48 @@ class BatchExportSpanProcessor(SpanProcessor):
         self.max_export_batch_size = max_export_batch_size
         self.max_queue_size = max_queue_size
         self.export_timeout_millis = export_timeout_millis
+        self.max_concurrent_exports = max_concurrent_exports
+        # duration of the latest export call
+        self.last_export_duration_millis = 0.0
+        self._executor = None
+        if max_concurrent_exports > 1:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=max_concurrent_exports
+            )
+            # bounds the number of batches in flight, only the worker thread
+            # acquires it
+            self._exports_semaphore = threading.BoundedSemaphore(
+                max_concurrent_exports
+            )
         self.done = False
         # flag that indicates that spans are being dropped
         self._spans_dropped = False
-        # precallocated list to send spans to exporter
-        self.spans_list = [
-            None
-        ] * self.max_export_batch_size  # type: typing.List[typing.Optional[Span]]
+        # flag set by the worker thread while it waits on the condition, it
+        # lets producers skip taking the lock when nobody has to be woken up
+        self._worker_waiting = False
         self.worker_thread.start()
+        _batch_span_processors.add(self)
+
+    def _at_fork_reinit(self):
+        """Called in forked child processes, where only the thread that
+        forked exists. Replaces the inherited queue, locks and threads."""
+        self.queue = self._create_queue(self.max_queue_size)
+        self.condition = threading.Condition(threading.Lock())
+        self._flush_request = None
+        self._spans_dropped = False
+        self._worker_waiting = False
+        if self._executor is not None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_concurrent_exports
+            )
+            self._exports_semaphore = threading.BoundedSemaphore(
+                self.max_concurrent_exports
+            )
+        if not self.done:
+            self.worker_thread = threading.Thread(
+                target=self.worker, daemon=True
+            )
+            self.worker_thread.start()
 
     def on_start(
         self, span: Span, parent_context: typing.Optional[Context] = None
@@ -185,17 +541,38 @@ class BatchExportSpanProcessor(SpanProcessor):
             return
         if not span.context.trace_flags.sampled:
             return
-        if len(self.queue) == self.max_queue_size:
+        if self._sized:
+            queued = self.queue.put(span, _estimate_span_size(span))
+        else:
+            queued = self.queue.put(span)
+        if not queued:
             if not self._spans_dropped:
-                logger.warning("Queue is full, likely spans will be dropped.")
+                logger.warning("Queue is full, spans will be dropped.")
                 self._spans_dropped = True
+            return
 
-        self.queue.appendleft(span)
-
-        if len(self.queue) >= self.max_queue_size // 2:
+        if self._worker_waiting and self._batch_ready():
             with self.condition:
+                self._worker_waiting = False
                 self.condition.notify()
 
+    def _create_queue(self, max_queue_size: int) -> BoundedQueue:
+        if self._sized:
+            return BytesBoundedQueue(max_queue_size, self.max_queue_bytes)
+        return BoundedQueue(max_queue_size)
+
+    def _batch_ready(self) -> bool:
+        """Returns whether a full batch is queued."""
+        return len(self.queue) >= self.max_export_batch_size or (
+            self.max_export_batch_bytes is not None
+            and self.queue.bytes >= self.max_export_batch_bytes
+        )
+
+    @property
+    def dropped_spans(self) -> int:
+        """The number of spans dropped because the queue was full."""
+        return self.queue.dropped
+
     def worker(self):
         timeout = self.schedule_delay_millis / 1e3
         flush_request = None  # type: typing.Optional[_FlushRequest]
@@ -205,12 +582,10 @@ class BatchExportSpanProcessor(SpanProcessor):
                     # done flag may have changed, avoid waiting
                     break
                 flush_request = self._get_and_unset_flush_request()
-                if (
-                    len(self.queue) < self.max_export_batch_size
-                    and flush_request is None
-                ):
-
+                if not self._batch_ready() and flush_request is None:
+                    self._worker_waiting = True
                     self.condition.wait(timeout)
+                    self._worker_waiting = False
                     flush_request = self._get_and_unset_flush_request()
                     if not self.queue:
                         # spurious notification, let's wait again, reset timeout
@@ -239,6 +614,7 @@ class BatchExportSpanProcessor(SpanProcessor):
 
         # be sure that all spans are sent
         self._drain_queue()
+        self._wait_for_exports()
         self._notify_flush_request_finished(flush_request)
         self._notify_flush_request_finished(shutdown_flush_request)
 
@@ -297,30 +673,51 @@ class BatchExportSpanProcessor(SpanProcessor):
 
             if num_spans <= 0:
                 break
+        self._wait_for_exports()
 
     def _export_batch(self) -> int:
         """Exports at most max_export_batch_size spans and returns the number of
          exported spans.
          """
-        idx = 0
-        # currently only a single thread acts as consumer, so queue.pop() will
-        # not raise an exception
-        while idx < self.max_export_batch_size and self.queue:
-            self.spans_list[idx] = self.queue.pop()
-            idx += 1
+        if self.max_export_batch_bytes is None:
+            spans = self.queue.drain(self.max_export_batch_size)
+        else:
+            spans = self.queue.drain(
+                self.max_export_batch_size, self.max_export_batch_bytes
+            )
+        if self._executor is None:
+            self._export_spans(spans)
+        else:
+            self._exports_semaphore.acquire()
+            self._executor.submit(self._export_spans, spans).add_done_callback(
+                lambda _: self._exports_semaphore.release()
+            )
+        return len(spans)
+
+    def _export_spans(self, spans: typing.List[Span]) -> None:
         token = attach(set_value("suppress_instrumentation", True))
+        start = time_ns()
         try:
-            # Ignore type b/c the Optional[None]+slicing is too "clever"
-            # for mypy
-            self.span_exporter.export(self.spans_list[:idx])  # type: ignore
+            self.span_exporter.export(
+                _to_span_batch(self.span_exporter, spans)
+            )
         except Exception:  # pylint: disable=broad-except
             logger.exception("Exception while exporting Span batch.")
+        self.last_export_duration_millis = (time_ns() - start) / 1e6
         detach(token)
 
-        # clean up list
-        for index in range(idx):
-            self.spans_list[index] = None
-        return idx
+    def _wait_for_exports(self):
+        """Blocks until all batches handed to the export threads are exported.
+
+        Can only be called from the worker thread context, which is the only
+        one submitting batches.
+        """
+        if self._executor is None:
+            return
+        for _ in range(self.max_concurrent_exports):
+            self._exports_semaphore.acquire()
+        for _ in range(self.max_concurrent_exports):
+            self._exports_semaphore.release()
 
     def _drain_queue(self):
         """"Export all elements until queue is empty.
@@ -357,9 +754,277 @@ class BatchExportSpanProcessor(SpanProcessor):
         with self.condition:
             self.condition.notify_all()
         self.worker_thread.join()
+        if self._executor is not None:
+            self._executor.shutdown()
         self.span_exporter.shutdown()
 
 
+def _get_running_loop() -> typing.Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()  # pylint: disable=no-member
+    except RuntimeError:
+        return None
+    except AttributeError:
+        # asyncio.get_running_loop is only available from Python 3.7
+        return asyncio._get_running_loop()  # pylint: disable=protected-access
+
+
+class AsyncBatchSpanProcessor(SpanProcessor):
+    """Batch span processor running on an asyncio event loop.
+
+    AsyncBatchSpanProcessor is an implementation of `SpanProcessor` that
+    batches ended spans and pushes them to the configured
+    `AsyncSpanExporter` from a task on ``loop``, so that no thread is spawned
+    and exports never block the loop.
+
+    Without ``loop``, the processor uses the event loop running when the
+    first span ends on it, or when it is first flushed or shut down. A given
+    ``loop`` must be running on the thread creating the processor, or not run
+    yet. `async_force_flush` and `async_shutdown` are the awaitable versions
+    of `force_flush` and `shutdown`, which have to be used from within the
+    loop.
+    """
+
+    def __init__(
+        self,
+        span_exporter: AsyncSpanExporter,
+        max_queue_size: int = None,
+        schedule_delay_millis: float = None,
+        max_export_batch_size: int = None,
+        export_timeout_millis: float = None,
+        loop: typing.Optional[asyncio.AbstractEventLoop] = None,
+    ):
+        (
+            max_queue_size,
+            schedule_delay_millis,
+            max_export_batch_size,
+            export_timeout_millis,
+        ) = _get_batch_parameters(
+            max_queue_size,
+            schedule_delay_millis,
+            max_export_batch_size,
+            export_timeout_millis,
+        )
+
+        self.span_exporter = span_exporter
+        self.queue = BoundedQueue(max_queue_size)
+        self.schedule_delay_millis = schedule_delay_millis
+        self.max_export_batch_size = max_export_batch_size
+        self.max_queue_size = max_queue_size
+        self.export_timeout_millis = export_timeout_millis
+        # duration of the latest export call
+        self.last_export_duration_millis = 0.0
+        self.done = False
+        self._spans_dropped = False
+        self._worker_waiting = False
+        # asyncio primitives are created by the worker task, as they have to
+        # be bound to the loop they are used on
+        self._wakeup = None  # type: typing.Optional[asyncio.Event]
+        self._export_lock = None  # type: typing.Optional[asyncio.Lock]
+        self._loop_thread_id = None  # type: typing.Optional[int]
+        self._loop = loop
+        self._worker_task = None  # type: typing.Optional[asyncio.Task]
+        self._worker_lock = threading.Lock()
+        if loop is not None:
+            self._worker_task = loop.create_task(self._worker())
+
+    def _start_worker(self) -> None:
+        """Starts the worker task on the event loop running in this thread,
+        if there is one."""
+        loop = _get_running_loop()
+        if loop is None or self._loop not in (None, loop):
+            return
+        with self._worker_lock:
+            if self._worker_task is None:
+                self._loop = loop
+                self._worker_task = loop.create_task(self._worker())
+
+    def on_start(
+        self, span: Span, parent_context: typing.Optional[Context] = None
+    ) -> None:
+        pass
+
+    def on_end(self, span: Span) -> None:
+        if self.done:
+            logger.warning("Already shutdown, dropping span.")
+            return
+        if not span.context.trace_flags.sampled:
+            return
+        if self._worker_task is None:
+            self._start_worker()
+        if not self.queue.put(span):
+            if not self._spans_dropped:
+                logger.warning("Queue is full, spans will be dropped.")
+                self._spans_dropped = True
+            return
+
+        if (
+            self._worker_waiting
+            and len(self.queue) >= self.max_export_batch_size
+        ):
+            self._worker_waiting = False
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    @property
+    def dropped_spans(self) -> int:
+        """The number of spans dropped because the queue was full."""
+        return self.queue.dropped
+
+    def _init_primitives(self):
+        if self._export_lock is None:
+            self._wakeup = asyncio.Event()
+            self._export_lock = asyncio.Lock()
+            self._loop_thread_id = threading.get_ident()
+
+    async def _worker(self):
+        self._init_primitives()
+        timeout = self.schedule_delay_millis / 1e3
+        while not self.done:
+            if len(self.queue) < self.max_export_batch_size:
+                self._worker_waiting = True
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                self._worker_waiting = False
+                self._wakeup.clear()
+                if self.done:
+                    break
+                if not self.queue:
+                    timeout = self.schedule_delay_millis / 1e3
+                    continue
+
+            start = time_ns()
+            async with self._export_lock:
+                await self._export_batch()
+            duration = (time_ns() - start) / 1e9
+            timeout = max(self.schedule_delay_millis / 1e3 - duration, 0)
+
+        # be sure that all spans are sent
+        await self._export_queued(len(self.queue))
+
+    async def _export_batch(self) -> int:
+        """Exports at most max_export_batch_size spans and returns the number of
+        exported spans.
+        """
+        spans = self.queue.drain(self.max_export_batch_size)
+        if not spans:
+            return 0
+        token = attach(set_value("suppress_instrumentation", True))
+        start = time_ns()
+        try:
+            await self.span_exporter.export(
+                _to_span_batch(self.span_exporter, spans)
+            )
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Exception while exporting Span batch.")
+        self.last_export_duration_millis = (time_ns() - start) / 1e6
+        detach(token)
+        return len(spans)
+
+    async def _export_queued(self, num_spans: int) -> None:
+        """Exports batches until at least num_spans were exported or the
+        queue is empty."""
+        async with self._export_lock:
+            while num_spans > 0 and self.queue:
+                num_spans -= await self._export_batch()
+
+    def _in_loop_thread(self) -> bool:
+        return threading.get_ident() == self._loop_thread_id
+
+    async def async_force_flush(self, timeout_millis: int = None) -> bool:
+        """Awaitable version of `force_flush`."""
+        if timeout_millis is None:
+            timeout_millis = self.export_timeout_millis
+
+        if self.done:
+            logger.warning("Already shutdown, ignoring call to force_flush().")
+            return True
+
+        if self._worker_task is None:
+            self._start_worker()
+        self._init_primitives()
+        try:
+            await asyncio.wait_for(
+                self._export_queued(len(self.queue)), timeout_millis / 1e3
+            )
+        except asyncio.TimeoutError:
+            logger.warning("Timeout was exceeded in force_flush().")
+            return False
+        return True
+
+    def force_flush(self, timeout_millis: int = None) -> bool:
+        if timeout_millis is None:
+            timeout_millis = self.export_timeout_millis
+
+        if self._worker_task is None:
+            self._start_worker()
+        if self._loop is None:
+            if not self.queue:
+                return True
+            logger.warning(
+                "No event loop was used by the processor, "
+                "cannot flush queued spans."
+            )
+            return False
+        if self._loop.is_running():
+            if self._in_loop_thread():
+                logger.warning(
+                    "force_flush() would block the event loop, "
+                    "await async_force_flush() instead."
+                )
+                return False
+            future = asyncio.run_coroutine_threadsafe(
+                self.async_force_flush(timeout_millis), self._loop
+            )
+            try:
+                return future.result(timeout_millis / 1e3)
+            except concurrent.futures.TimeoutError:
+                logger.warning("Timeout was exceeded in force_flush().")
+                return False
+        return self._loop.run_until_complete(
+            self.async_force_flush(timeout_millis)
+        )
+
+    async def async_shutdown(self) -> None:
+        """Awaitable version of `shutdown`."""
+        if self.done:
+            return
+        if self._worker_task is None:
+            self._start_worker()
+        self.done = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+        await self._worker_task
+        await self.span_exporter.shutdown()
+
+    def shutdown(self) -> None:
+        if self._worker_task is None:
+            self._start_worker()
+        if self._loop is None:
+            if self.queue:
+                logger.warning(
+                    "No event loop was used by the processor, "
+                    "dropping queued spans."
+                )
+            self.done = True
+            return
+        if self._loop.is_closed():
+            logger.warning("Event loop is closed, dropping queued spans.")
+            self.done = True
+            return
+        if self._loop.is_running():
+            if self._in_loop_thread():
+                # cannot block the loop, finish shutting down in a task
+                self._loop.create_task(self.async_shutdown())
+                return
+            asyncio.run_coroutine_threadsafe(
+                self.async_shutdown(), self._loop
+            ).result()
+            return
+        self._loop.run_until_complete(self.async_shutdown())
+
+
 class ConsoleSpanExporter(SpanExporter):
     """Implementation of :class:`SpanExporter` that prints spans to the
     console.
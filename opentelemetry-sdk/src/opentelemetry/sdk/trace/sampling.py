@@ -15,10 +15,12 @@
 """
 For general information about sampling, see `the specification <https://github.com/open-telemetry/opentelemetry-specification/blob/master/specification/trace/sdk.md#sampling>`_.
 
-OpenTelemetry provides two types of samplers:
+OpenTelemetry provides four types of samplers:
 
 - `StaticSampler`
 - `TraceIdRatioBased`
+- `RuleBasedSampler`
+- `BackpressureSampler`
 
 A `StaticSampler` always returns the same sampling result regardless of the conditions. Both possible StaticSamplers are already created:
 
@@ -27,6 +29,18 @@ A `StaticSampler` always returns the same sampling result regardless of the cond
 
 A `TraceIdRatioBased` sampler makes a random sampling result based on the sampling probability given.
 
+A `RuleBasedSampler` samples spans according to the first `SamplingRule` that matches their name, kind and attributes. Each rule either samples with a probability or limits the number of spans sampled per second. For example, health checks could be limited to one span per second while all other spans are sampled:
+
+.. code:: python
+
+    from opentelemetry.sdk.trace.sampling import RuleBasedSampler, SamplingRule
+
+    sampler = RuleBasedSampler(
+        [SamplingRule(name="GET /health*", spans_per_second=1)]
+    )
+
+A `BackpressureSampler` lowers its sampling rate while the queue of a `BatchExportSpanProcessor` fills up, drops spans or exports slowly, so that spans are not created only to be dropped. It recovers once the pressure is gone.
+
 If the span being sampled has a parent, `ParentBased` will respect the parent span's sampling result. Otherwise, it returns the sampling result from the given delegate sampler.
 
 Currently, sampling results are always made during the creation of the span. However, this might not always be the case in the future (see `OTEP #115 <https://github.com/open-telemetry/oteps/pull/115>`_).
@@ -62,15 +76,36 @@ To use a sampler, pass it into the tracer provider constructor. For example:
 """
 import abc
 import enum
+import inspect
+import threading
+from time import monotonic
 from types import MappingProxyType
-from typing import Optional, Sequence
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 # pylint: disable=unused-import
 from opentelemetry.context import Context
-from opentelemetry.trace import Link, get_current_span
+from opentelemetry.trace import Link, SpanKind, get_current_span
 from opentelemetry.trace.span import TraceState
 from opentelemetry.util.types import Attributes
 
+if TYPE_CHECKING:
+    from opentelemetry.sdk.trace.export import AsyncBatchSpanProcessor
+    from opentelemetry.sdk.trace.export import BatchExportSpanProcessor
+
+_BatchSpanProcessor = Union[
+    "AsyncBatchSpanProcessor", "BatchExportSpanProcessor"
+]
+
 
 class Decision(enum.Enum):
     # IsRecording() == false, span will not be recorded and all events and attributes will be dropped.
@@ -81,7 +116,7 @@ class Decision(enum.Enum):
     RECORD_AND_SAMPLE = 2
 
     def is_recording(self):
-        return self in (Decision.RECORD_ONLY, Decision.RECORD_AND_SAMPLE)
+        return self is not Decision.DROP
 
     def is_sampled(self):
         return self is Decision.RECORD_AND_SAMPLE
@@ -127,6 +162,7 @@ class Sampler(abc.ABC):
         attributes: Attributes = None,
         links: Sequence["Link"] = None,
         trace_state: "TraceState" = None,
+        kind: Optional[SpanKind] = None,
     ) -> "SamplingResult":
         pass
 
@@ -135,6 +171,56 @@ class Sampler(abc.ABC):
         pass
 
 
+# SamplingResult is treated as immutable, so results that carry no
+# attributes and no trace state are shared between spans.
+_DROP_RESULT = SamplingResult(Decision.DROP)
+_RECORD_AND_SAMPLE_RESULT = SamplingResult(Decision.RECORD_AND_SAMPLE)
+
+
+def _get_sampling_result(
+    decision: Decision,
+    attributes: Attributes = None,
+    trace_state: "TraceState" = None,
+) -> SamplingResult:
+    if not attributes and trace_state is None:
+        if decision is Decision.DROP:
+            return _DROP_RESULT
+        if decision is Decision.RECORD_AND_SAMPLE:
+            return _RECORD_AND_SAMPLE_RESULT
+    return SamplingResult(decision, attributes, trace_state)
+
+
+def _accepts_kind(sampler: Sampler) -> bool:
+    try:
+        parameters = inspect.signature(sampler.should_sample).parameters
+    except (TypeError, ValueError):
+        return True
+    return "kind" in parameters or any(
+        parameter.kind is inspect.Parameter.VAR_KEYWORD
+        for parameter in parameters.values()
+    )
+
+
+def _get_should_sample(sampler: Sampler) -> Callable[..., SamplingResult]:
+    """Returns a function calling ``sampler.should_sample`` with the
+    positional arguments of `Sampler.should_sample`.
+
+    Samplers written before the span kind was passed to
+    `Sampler.should_sample` do not accept it, they are called without it.
+    """
+    if _accepts_kind(sampler):
+        return sampler.should_sample
+
+    def should_sample(  # pylint: disable=too-many-arguments
+        parent_context, trace_id, name, attributes, links, trace_state, kind
+    ):  # pylint: disable=unused-argument
+        return sampler.should_sample(
+            parent_context, trace_id, name, attributes, links, trace_state
+        )
+
+    return should_sample
+
+
 class StaticSampler(Sampler):
     """Sampler that always returns the same decision."""
 
@@ -149,10 +235,11 @@ class StaticSampler(Sampler):
         attributes: Attributes = None,
         links: Sequence["Link"] = None,
         trace_state: "TraceState" = None,
+        kind: Optional[SpanKind] = None,
     ) -> "SamplingResult":
         if self._decision is Decision.DROP:
-            return SamplingResult(self._decision)
-        return SamplingResult(self._decision, attributes, trace_state)
+            return _DROP_RESULT
+        return _get_sampling_result(self._decision, attributes, trace_state)
 
     def get_description(self) -> str:
         if self._decision is Decision.DROP:
@@ -204,13 +291,14 @@ class TraceIdRatioBased(Sampler):
         attributes: Attributes = None,
         links: Sequence["Link"] = None,
         trace_state: "TraceState" = None,
+        kind: Optional[SpanKind] = None,
     ) -> "SamplingResult":
         decision = Decision.DROP
         if trace_id & self.TRACE_ID_LIMIT < self.bound:
             decision = Decision.RECORD_AND_SAMPLE
         if decision is Decision.DROP:
-            return SamplingResult(decision)
-        return SamplingResult(decision, attributes)
+            return _DROP_RESULT
+        return _get_sampling_result(decision, attributes)
 
     def get_description(self) -> str:
         return "TraceIdRatioBased{{{}}}".format(self._rate)
@@ -228,6 +316,7 @@ class ParentBased(Sampler):
 
     def __init__(self, delegate: Sampler):
         self._delegate = delegate
+        self._delegate_should_sample = _get_should_sample(delegate)
 
     def should_sample(
         self,
@@ -237,6 +326,7 @@ class ParentBased(Sampler):
         attributes: Attributes = None,
         links: Sequence["Link"] = None,
         trace_state: "TraceState" = None,
+        kind: Optional[SpanKind] = None,
     ) -> "SamplingResult":
         if parent_context is not None:
             parent_span_context = get_current_span(
@@ -248,22 +338,394 @@ class ParentBased(Sampler):
                 and parent_span_context.is_valid
                 and not parent_span_context.trace_flags.sampled
             ):
-                return SamplingResult(Decision.DROP)
-            return SamplingResult(Decision.RECORD_AND_SAMPLE, attributes)
-
-        return self._delegate.should_sample(
-            parent_context=parent_context,
-            trace_id=trace_id,
-            name=name,
-            attributes=attributes,
-            links=links,
-            trace_state=trace_state,
+                return _DROP_RESULT
+            return _get_sampling_result(Decision.RECORD_AND_SAMPLE, attributes)
+
+        return self._delegate_should_sample(
+            parent_context,
+            trace_id,
+            name,
+            attributes,
+            links,
+            trace_state,
+            kind,
         )
 
     def get_description(self):
         return "ParentBased{{{}}}".format(self._delegate.get_description())
 
 
+class _TokenBucket:
+    """Allows ``rate`` acquisitions per second on average, and bursts of up
+    to ``rate`` acquisitions (at least one)."""
+
+    __slots__ = ("_rate", "_capacity", "_tokens", "_last_time", "_lock")
+
+    def __init__(self, rate: float):
+        self._rate = rate
+        self._capacity = max(rate, 1.0)
+        self._tokens = self._capacity
+        self._last_time = monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            now = monotonic()
+            self._tokens = min(
+                self._capacity,
+                self._tokens + (now - self._last_time) * self._rate,
+            )
+            self._last_time = now
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+
+class SamplingRule:
+    """A rule of a `RuleBasedSampler`.
+
+    A span matches the rule if it matches all the criteria given, a rule
+    without criteria matches every span. Matching spans are either sampled
+    with the probability ``ratio`` or up to ``spans_per_second``, exactly one
+    of them must be given.
+
+    Args:
+        name: The span name, or a prefix of it if it ends with ``*``.
+        kind: The span kind.
+        attributes: Attributes the span must be created with.
+        ratio: Probability (between 0 and 1) that a matching span is sampled.
+        spans_per_second: The maximum average number of matching spans
+            sampled per second.
+    """
+
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        kind: Optional[SpanKind] = None,
+        attributes: Attributes = None,
+        ratio: Optional[float] = None,
+        spans_per_second: Optional[float] = None,
+    ):
+        # pylint: disable=too-many-arguments
+        if (ratio is None) == (spans_per_second is None):
+            raise ValueError(
+                "Exactly one of ratio and spans_per_second must be given."
+            )
+        if ratio is not None and (ratio < 0.0 or ratio > 1.0):
+            raise ValueError("Probability must be in range [0.0, 1.0].")
+        if spans_per_second is not None and spans_per_second < 0:
+            raise ValueError("spans_per_second must not be negative.")
+
+        self.name = name
+        self.kind = kind
+        self.attributes = MappingProxyType(dict(attributes or {}))
+        self.ratio = ratio
+        self.spans_per_second = spans_per_second
+        self._bound = None  # type: Optional[int]
+        self._token_bucket = None  # type: Optional[_TokenBucket]
+        if ratio is not None:
+            self._bound = TraceIdRatioBased.get_bound_for_rate(ratio)
+        elif spans_per_second:
+            self._token_bucket = _TokenBucket(spans_per_second)
+
+    def _matches(
+        self, attributes: Attributes, kind: Optional[SpanKind]
+    ) -> bool:
+        """Checks the kind and attributes, names are matched by the
+        `RuleBasedSampler` index."""
+        if self.kind is not None and kind is not self.kind:
+            return False
+        if self.attributes:
+            if not attributes:
+                return False
+            for key, value in self.attributes.items():
+                if attributes.get(key) != value:
+                    return False
+        return True
+
+    def _sample(self, trace_id: int) -> bool:
+        if self._bound is not None:
+            return trace_id & TraceIdRatioBased.TRACE_ID_LIMIT < self._bound
+        if self._token_bucket is not None:
+            return self._token_bucket.try_acquire()
+        return False
+
+    def __repr__(self) -> str:
+        return "{}(name={!r}, kind={}, attributes={}, {})".format(
+            type(self).__name__,
+            self.name,
+            self.kind,
+            dict(self.attributes),
+            "ratio={}".format(self.ratio)
+            if self.ratio is not None
+            else "spans_per_second={}".format(self.spans_per_second),
+        )
+
+
+# rules with their index in the rules of a RuleBasedSampler
+_IndexedRules = List[Tuple[int, SamplingRule]]
+
+
+class RuleBasedSampler(Sampler):
+    """Sampler that samples spans according to the first `SamplingRule`
+    they match, and with the ``default`` sampler if they match none.
+
+    Rules are indexed by span name when the sampler is created: the rules
+    for an exact name are found with a single dict lookup, and prefixes with
+    a dict lookup per distinct prefix length.
+
+    Like `TraceIdRatioBased`, it does not look at the parent span, wrap it
+    in `ParentBased` to respect the parent span sampling decision.
+
+    Args:
+        rules: The rules, in order of precedence.
+        default: The sampler used for spans that match no rule.
+    """
+
+    def __init__(
+        self, rules: Sequence[SamplingRule], default: Optional[Sampler] = None
+    ):
+        self.rules = tuple(rules)
+        self.default = ALWAYS_ON if default is None else default
+        self._default_should_sample = _get_should_sample(self.default)
+
+        exact_rules = {}  # type: Dict[str, _IndexedRules]
+        # prefix length -> prefix -> rules
+        prefix_rules = {}  # type: Dict[int, Dict[str, _IndexedRules]]
+        any_name_rules = []  # type: _IndexedRules
+        for index, rule in enumerate(self.rules):
+            if rule.name is None:
+                any_name_rules.append((index, rule))
+            elif rule.name.endswith("*"):
+                prefix = rule.name[:-1]
+                prefix_rules.setdefault(len(prefix), {}).setdefault(
+                    prefix, []
+                ).append((index, rule))
+            else:
+                exact_rules.setdefault(rule.name, []).append((index, rule))
+
+        self._prefix_rules = sorted(prefix_rules.items())
+        self._any_name_rules = tuple(any_name_rules)
+        # the candidate rules of exact names, including matching prefix and
+        # any name rules, in order of precedence
+        self._rules_by_name = {
+            name: tuple(
+                rule
+                for _, rule in sorted(rules + self._get_non_exact_rules(name))
+            )
+            for name, rules in exact_rules.items()
+        }  # type: Dict[str, Tuple[SamplingRule, ...]]
+
+    def _get_non_exact_rules(self, name: str) -> "_IndexedRules":
+        rules = list(self._any_name_rules)
+        for length, prefixes in self._prefix_rules:
+            if length > len(name):
+                break
+            rules.extend(prefixes.get(name[:length], ()))
+        return rules
+
+    def _get_rules(self, name: str) -> Iterable[SamplingRule]:
+        rules = self._rules_by_name.get(name)
+        if rules is not None:
+            return rules
+        # the rule indices are unique, so the rules themselves are never
+        # compared
+        return (rule for _, rule in sorted(self._get_non_exact_rules(name)))
+
+    def should_sample(
+        self,
+        parent_context: Optional["Context"],
+        trace_id: int,
+        name: str,
+        attributes: Attributes = None,
+        links: Sequence["Link"] = None,
+        trace_state: "TraceState" = None,
+        kind: Optional[SpanKind] = None,
+    ) -> "SamplingResult":
+        # pylint: disable=protected-access
+        for rule in self._get_rules(name):
+            if rule._matches(attributes, kind):
+                if rule._sample(trace_id):
+                    return _get_sampling_result(
+                        Decision.RECORD_AND_SAMPLE, attributes
+                    )
+                return _DROP_RESULT
+
+        return self._default_should_sample(
+            parent_context,
+            trace_id,
+            name,
+            attributes,
+            links,
+            trace_state,
+            kind,
+        )
+
+    def get_description(self) -> str:
+        return "RuleBasedSampler{{{}, default={}}}".format(
+            list(self.rules), self.default.get_description()
+        )
+
+
+class BackpressureSampler(Sampler):
+    """Sampler that samples fewer traces while the export pipeline of a
+    batch span processor is under pressure.
+
+    Every ``update_interval_millis`` the sampler checks the span
+    processor. It is under pressure if its queue is at least
+    ``high_watermark`` full, by count or by bytes, it dropped spans since
+    the previous check, or its latest export took longer than
+    ``max_export_duration_millis``.
+    Under pressure, the sampling rate is multiplied by ``decrease_factor``
+    down to ``min_rate``. Once the queue is at most ``low_watermark`` full
+    and the pipeline is not under pressure, the rate increases by
+    ``increase_step`` per check up to 1. In between, the rate is kept.
+
+    Like `TraceIdRatioBased`, spans are sampled by trace id, so a trace
+    is sampled at any rate that is not lower than the one it was first
+    sampled at. Spans within the rate are passed to ``delegate``. Wrap
+    the sampler in `ParentBased` so that child spans follow the decision
+    of their root span.
+
+    Args:
+        span_processor: The `BatchExportSpanProcessor` or
+            `AsyncBatchSpanProcessor` to read the pressure from.
+        delegate: The sampler for the spans within the current rate.
+        min_rate: The lowest sampling rate.
+        high_watermark: The queue fill ratio starting to decrease the rate.
+        low_watermark: The queue fill ratio below which the rate recovers.
+        max_export_duration_millis: Slower exports decrease the rate. If
+            not set, the export duration is not checked.
+        decrease_factor: The factor the rate is multiplied by under
+            pressure.
+        increase_step: What is added to the rate when it recovers.
+        update_interval_millis: The interval at which the rate is updated.
+    """
+
+    def __init__(
+        self,
+        span_processor: _BatchSpanProcessor,
+        delegate: Optional[Sampler] = None,
+        min_rate: float = 0.01,
+        high_watermark: float = 0.75,
+        low_watermark: float = 0.5,
+        max_export_duration_millis: Optional[float] = None,
+        decrease_factor: float = 0.5,
+        increase_step: float = 0.1,
+        update_interval_millis: float = 1000,
+    ):
+        # pylint: disable=too-many-arguments
+        if min_rate < 0.0 or min_rate > 1.0:
+            raise ValueError("Probability must be in range [0.0, 1.0].")
+        if not 0.0 <= low_watermark <= high_watermark <= 1.0:
+            raise ValueError(
+                "Watermarks must satisfy "
+                "0 <= low_watermark <= high_watermark <= 1."
+            )
+        if decrease_factor <= 0.0 or decrease_factor >= 1.0:
+            raise ValueError("decrease_factor must be in range (0.0, 1.0).")
+
+        self.span_processor = span_processor
+        self.delegate = ALWAYS_ON if delegate is None else delegate
+        self._delegate_should_sample = _get_should_sample(self.delegate)
+        self.min_rate = min_rate
+        self.high_watermark = high_watermark
+        self.low_watermark = low_watermark
+        self.max_export_duration_millis = max_export_duration_millis
+        self.decrease_factor = decrease_factor
+        self.increase_step = increase_step
+        self._update_interval = update_interval_millis / 1e3
+        self._rate = 1.0
+        self._bound = TraceIdRatioBased.get_bound_for_rate(self._rate)
+        self._dropped_spans = span_processor.dropped_spans
+        self._next_update = monotonic() + self._update_interval
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        """The current sampling rate."""
+        return self._rate
+
+    def _get_fill_ratio(self) -> float:
+        queue = self.span_processor.queue
+        fill_ratio = len(queue) / self.span_processor.max_queue_size
+        # a queue bounded by bytes is full once either bound is reached
+        max_bytes = getattr(queue, "max_bytes", None)
+        if max_bytes is not None:
+            fill_ratio = max(fill_ratio, queue.bytes / max_bytes)
+        return fill_ratio
+
+    def _is_under_pressure(self, fill_ratio: float) -> bool:
+        # the drops are accounted on every check, so that drops while the
+        # queue is full do not count as pressure once it recovered
+        dropped_spans = self.span_processor.dropped_spans
+        spans_dropped = dropped_spans > self._dropped_spans
+        self._dropped_spans = dropped_spans
+
+        return (
+            fill_ratio >= self.high_watermark
+            or spans_dropped
+            or (
+                self.max_export_duration_millis is not None
+                and self.span_processor.last_export_duration_millis
+                > self.max_export_duration_millis
+            )
+        )
+
+    def _update(self, now: float) -> None:
+        # only one thread updates the rate, the others keep sampling
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            if now < self._next_update:
+                return
+            self._next_update = now + self._update_interval
+
+            fill_ratio = self._get_fill_ratio()
+            if self._is_under_pressure(fill_ratio):
+                rate = max(self.min_rate, self._rate * self.decrease_factor)
+            elif fill_ratio <= self.low_watermark:
+                rate = min(1.0, self._rate + self.increase_step)
+            else:
+                return
+            self._bound = TraceIdRatioBased.get_bound_for_rate(rate)
+            self._rate = rate
+        finally:
+            self._lock.release()
+
+    def should_sample(
+        self,
+        parent_context: Optional["Context"],
+        trace_id: int,
+        name: str,
+        attributes: Attributes = None,
+        links: Sequence["Link"] = None,
+        trace_state: "TraceState" = None,
+        kind: Optional[SpanKind] = None,
+    ) -> "SamplingResult":
+        now = monotonic()
+        if now >= self._next_update:
+            self._update(now)
+
+        if trace_id & TraceIdRatioBased.TRACE_ID_LIMIT >= self._bound:
+            return _DROP_RESULT
+        return self._delegate_should_sample(
+            parent_context,
+            trace_id,
+            name,
+            attributes,
+            links,
+            trace_state,
+            kind,
+        )
+
+    def get_description(self) -> str:
+        return "BackpressureSampler{{{}, delegate={}}}".format(
+            self._rate, self.delegate.get_description()
+        )
+
+
 ALWAYS_OFF = StaticSampler(Decision.DROP)
 """Sampler that never samples spans, regardless of the parent span's sampling decision."""
 
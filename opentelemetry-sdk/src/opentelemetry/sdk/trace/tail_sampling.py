@@ -0,0 +1,396 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Samplers decide whether to sample a span when it is created, before it is
+known whether the trace will be slow or fail. Tail sampling decides once the
+spans of a trace have ended instead.
+
+`TailSamplingSpanProcessor` buffers ended spans by trace id. A trace is
+decided when its local root span ends, when it has been buffered for
+``decision_wait_millis`` or when it is evicted because the buffer is full. It
+is kept if any of the configured `TailSamplingPolicy` objects samples it, in
+which case its spans are passed to the wrapped span processor. Spans of a
+trace that end after it was decided follow the decision.
+
+The following policies are available:
+
+- `LatencyPolicy` samples traces that took at least a given time
+- `ErrorStatusPolicy` samples traces with a span with an error status
+- `AttributePolicy` samples traces with a span with a matching attribute
+- `ProbabilisticPolicy` samples a fraction of the traces
+
+Spans must be sampled when they are created to reach the tail sampling span
+processor, so it is used with a sampler that samples every span. For example:
+
+.. code:: python
+
+    from opentelemetry import trace
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        BatchExportSpanProcessor,
+        ConsoleSpanExporter,
+    )
+    from opentelemetry.sdk.trace.sampling import ALWAYS_ON
+    from opentelemetry.sdk.trace.tail_sampling import (
+        ErrorStatusPolicy,
+        LatencyPolicy,
+        ProbabilisticPolicy,
+        TailSamplingSpanProcessor,
+    )
+
+    trace.set_tracer_provider(TracerProvider(sampler=ALWAYS_ON))
+
+    # export failed and slow traces and 1 in every 100 other traces
+    trace.get_tracer_provider().add_span_processor(
+        TailSamplingSpanProcessor(
+            BatchExportSpanProcessor(ConsoleSpanExporter()),
+            [
+                ErrorStatusPolicy(),
+                LatencyPolicy(500),
+                ProbabilisticPolicy(0.01),
+            ],
+        )
+    )
+"""
+
+import abc
+import logging
+import os
+import threading
+import typing
+import weakref
+from collections import OrderedDict
+from time import monotonic
+
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import Span, SpanProcessor
+from opentelemetry.sdk.trace.sampling import TraceIdRatioBased
+from opentelemetry.trace.status import StatusCode
+from opentelemetry.util import types
+
+logger = logging.getLogger(__name__)
+
+
+class TailSamplingPolicy(abc.ABC):
+    """Decides whether to sample a trace once its spans have ended."""
+
+    @abc.abstractmethod
+    def should_sample(
+        self, trace_id: int, spans: typing.Sequence[Span]
+    ) -> bool:
+        """Returns whether to sample the trace.
+
+        Called while the `TailSamplingSpanProcessor` holds its lock, so it
+        should be fast.
+
+        Args:
+            trace_id: The id of the trace.
+            spans: The ended spans of the trace.
+        """
+
+
+class LatencyPolicy(TailSamplingPolicy):
+    """Samples traces whose ended spans cover at least ``threshold_millis``
+    from the earliest start to the latest end."""
+
+    def __init__(self, threshold_millis: float):
+        self.threshold_millis = threshold_millis
+        self._threshold_ns = int(threshold_millis * 1e6)
+
+    def should_sample(
+        self, trace_id: int, spans: typing.Sequence[Span]
+    ) -> bool:
+        start_time = min(span.start_time for span in spans)
+        end_time = max(span.end_time for span in spans)
+        return end_time - start_time >= self._threshold_ns
+
+
+class ErrorStatusPolicy(TailSamplingPolicy):
+    """Samples traces with a span whose status is `StatusCode.ERROR`."""
+
+    def should_sample(
+        self, trace_id: int, spans: typing.Sequence[Span]
+    ) -> bool:
+        for span in spans:
+            if span.status.status_code is StatusCode.ERROR:
+                return True
+        return False
+
+
+class AttributePolicy(TailSamplingPolicy):
+    """Samples traces with a span that has the attribute ``key``.
+
+    If ``values`` is given, the attribute value must also be one of them.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        values: typing.Optional[typing.Iterable[types.AttributeValue]] = None,
+    ):
+        self.key = key
+        self.values = None if values is None else frozenset(values)
+
+    def should_sample(
+        self, trace_id: int, spans: typing.Sequence[Span]
+    ) -> bool:
+        for span in spans:
+            value = span.attributes.get(self.key)
+            if value is None:
+                continue
+            if self.values is None or value in self.values:
+                return True
+        return False
+
+
+class ProbabilisticPolicy(TailSamplingPolicy):
+    """Samples the fraction ``rate`` of the traces.
+
+    Like `opentelemetry.sdk.trace.sampling.TraceIdRatioBased`, the decision
+    only depends on the trace id.
+    """
+
+    def __init__(self, rate: float):
+        if rate < 0.0 or rate > 1.0:
+            raise ValueError("Probability must be in range [0.0, 1.0].")
+        self.rate = rate
+        self._bound = TraceIdRatioBased.get_bound_for_rate(rate)
+
+    def should_sample(
+        self, trace_id: int, spans: typing.Sequence[Span]
+    ) -> bool:
+        return trace_id & TraceIdRatioBased.TRACE_ID_LIMIT < self._bound
+
+
+class _BufferedTrace:
+    __slots__ = ("spans", "deadline")
+
+    def __init__(self, deadline: float):
+        self.spans = []  # type: typing.List[Span]
+        self.deadline = deadline
+
+
+def _reinit_tail_sampling_span_processors() -> None:
+    for span_processor in list(_tail_sampling_span_processors):
+        span_processor._at_fork_reinit()  # pylint: disable=protected-access
+
+
+_tail_sampling_span_processors = weakref.WeakSet()  # type: weakref.WeakSet
+
+# os.register_at_fork is only available from Python 3.7
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(  # pylint: disable=no-member
+        after_in_child=_reinit_tail_sampling_span_processors
+    )
+
+
+class TailSamplingSpanProcessor(SpanProcessor):
+    """Span processor that samples whole traces after their spans ended.
+
+    Ended spans are buffered by trace id, up to ``max_buffered_traces``
+    traces and ``max_buffered_spans`` spans. When either limit is exceeded
+    the oldest traces are decided early. Traces are also decided after
+    ``decision_wait_millis``, or as soon as their local root span ends.
+    Sampled traces are passed to ``span_processor``, only its
+    `SpanProcessor.on_end` is called.
+
+    In a child process forked from the process that created it, the traces
+    buffered before the fork are left to the parent.
+
+    Args:
+        span_processor: The span processor sampled spans are passed to.
+        policies: A trace is sampled if any of them samples it.
+        decision_wait_millis: The maximum time a trace is buffered.
+        max_buffered_traces: The maximum number of buffered traces, also the
+            number of decisions remembered for spans ending late.
+        max_buffered_spans: The maximum number of buffered spans.
+    """
+
+    def __init__(
+        self,
+        span_processor: SpanProcessor,
+        policies: typing.Sequence[TailSamplingPolicy],
+        decision_wait_millis: float = 30000,
+        max_buffered_traces: int = 1024,
+        max_buffered_spans: int = 8192,
+    ):
+        if decision_wait_millis <= 0:
+            raise ValueError("decision_wait_millis must be positive.")
+
+        if max_buffered_traces <= 0:
+            raise ValueError("max_buffered_traces must be a positive integer.")
+
+        if max_buffered_spans <= 0:
+            raise ValueError("max_buffered_spans must be a positive integer.")
+
+        self.span_processor = span_processor
+        self.policies = tuple(policies)
+        self.decision_wait_millis = decision_wait_millis
+        self.max_buffered_traces = max_buffered_traces
+        self.max_buffered_spans = max_buffered_spans
+        # buffered traces, in the order of their deadlines
+        self._traces = OrderedDict()
+        # recent decisions, for spans that end after their trace was decided
+        self._decisions = OrderedDict()
+        self._num_spans = 0
+        self._sampled_traces = 0
+        self._dropped_traces = 0
+        self._condition = threading.Condition(threading.Lock())
+        self._done = False
+        self._worker_thread = threading.Thread(
+            target=self._worker, daemon=True
+        )
+        self._worker_thread.start()
+        _tail_sampling_span_processors.add(self)
+
+    def _at_fork_reinit(self):
+        self._traces = OrderedDict()
+        self._num_spans = 0
+        self._condition = threading.Condition(threading.Lock())
+        if not self._done:
+            self._worker_thread = threading.Thread(
+                target=self._worker, daemon=True
+            )
+            self._worker_thread.start()
+
+    @property
+    def sampled_traces(self) -> int:
+        """The number of traces passed to the wrapped span processor."""
+        return self._sampled_traces
+
+    @property
+    def dropped_traces(self) -> int:
+        """The number of traces that were not sampled."""
+        return self._dropped_traces
+
+    def on_start(
+        self, span: Span, parent_context: typing.Optional[Context] = None
+    ) -> None:
+        pass
+
+    def on_end(self, span: Span) -> None:
+        if self._done:
+            logger.warning("Already shutdown, dropping span.")
+            return
+
+        trace_id = span.context.trace_id
+        with self._condition:
+            decision = self._decisions.get(trace_id)
+            if decision is None:
+                sampled_spans = self._buffer(trace_id, span)
+            elif decision:
+                sampled_spans = [span]
+            else:
+                return
+
+        for sampled_span in sampled_spans:
+            self.span_processor.on_end(sampled_span)
+
+    def _buffer(self, trace_id: int, span: Span) -> typing.List[Span]:
+        """Buffers the span and decides the traces that are complete or no
+        longer fit. Returns the spans to pass on."""
+        sampled_spans = []  # type: typing.List[Span]
+
+        buffered = self._traces.get(trace_id)
+        if buffered is None:
+            if len(self._traces) >= self.max_buffered_traces:
+                sampled_spans.extend(self._decide_oldest())
+            elif not self._traces:
+                # the worker waits without timeout while nothing is buffered
+                self._condition.notify()
+            buffered = self._traces[trace_id] = _BufferedTrace(
+                monotonic() + self.decision_wait_millis / 1e3
+            )
+        buffered.spans.append(span)
+        self._num_spans += 1
+
+        if span.parent is None or span.parent.is_remote:
+            sampled_spans.extend(self._decide(trace_id))
+
+        while self._num_spans > self.max_buffered_spans:
+            sampled_spans.extend(self._decide_oldest())
+
+        return sampled_spans
+
+    def _decide(self, trace_id: int) -> typing.List[Span]:
+        """Decides a buffered trace, returns its spans if it is sampled."""
+        spans = self._traces.pop(trace_id).spans
+        self._num_spans -= len(spans)
+
+        sampled = False
+        for policy in self.policies:
+            try:
+                sampled = policy.should_sample(trace_id, spans)
+            # pylint: disable=broad-except
+            except Exception:
+                logger.exception("Exception in tail sampling policy.")
+            if sampled:
+                break
+
+        self._decisions[trace_id] = sampled
+        if len(self._decisions) > self.max_buffered_traces:
+            self._decisions.popitem(last=False)
+
+        if sampled:
+            self._sampled_traces += 1
+            return spans
+        self._dropped_traces += 1
+        return []
+
+    def _decide_oldest(self) -> typing.List[Span]:
+        return self._decide(next(iter(self._traces)))
+
+    def _decide_all(self) -> typing.List[Span]:
+        sampled_spans = []  # type: typing.List[Span]
+        with self._condition:
+            while self._traces:
+                sampled_spans.extend(self._decide_oldest())
+        return sampled_spans
+
+    def _worker(self):
+        while not self._done:
+            sampled_spans = []  # type: typing.List[Span]
+            with self._condition:
+                now = monotonic()
+                while self._traces:
+                    trace_id, buffered = next(iter(self._traces.items()))
+                    if buffered.deadline > now:
+                        break
+                    sampled_spans.extend(self._decide(trace_id))
+
+                if not sampled_spans:
+                    timeout = None
+                    if self._traces:
+                        timeout = buffered.deadline - now
+                    self._condition.wait(timeout)
+
+            for sampled_span in sampled_spans:
+                self.span_processor.on_end(sampled_span)
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        """Decides all buffered traces and flushes the wrapped span
+        processor."""
+        for sampled_span in self._decide_all():
+            self.span_processor.on_end(sampled_span)
+        return self.span_processor.force_flush(timeout_millis)
+
+    def shutdown(self) -> None:
+        with self._condition:
+            self._done = True
+            self._condition.notify()
+        self._worker_thread.join()
+        for sampled_span in self._decide_all():
+            self.span_processor.on_end(sampled_span)
+        self.span_processor.shutdown()
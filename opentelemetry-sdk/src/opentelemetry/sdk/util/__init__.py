@@ -14,6 +14,7 @@
 import datetime
 import threading
 from collections import OrderedDict, deque
+from typing import List, Tuple
 
 try:
     # pylint: disable=ungrouped-imports
@@ -153,3 +154,140 @@ class BoundedDict(MutableMapping):
         # pylint: disable=protected-access
         bounded_dict._dict = mapping
         return bounded_dict
+
+
+class BoundedQueue:
+    """A bounded FIFO queue for many producer threads.
+
+    In contrast to `BoundedList`, items are never evicted: once the queue is
+    full new items are rejected and counted in `dropped`.
+
+    Producers never take a lock. ``deque.append`` and ``len`` are atomic, so
+    the capacity check may be overshot by at most the number of threads
+    appending at the very same time. Dropped items are counted in a slot owned
+    by the dropping thread, which keeps the count exact without contention.
+    """
+
+    def __init__(self, maxlen):
+        if not isinstance(maxlen, int):
+            raise ValueError
+        if maxlen <= 0:
+            raise ValueError
+        self.maxlen = maxlen
+        self._dq = deque()  # type: deque
+        self._local = threading.local()
+        # one drop counter per producer thread, a tuple avoids race conditions
+        # when a new thread registers its counter while `dropped` is read.
+        self._drop_counters = ()  # type: Tuple[List[int], ...]
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "{}({}, maxlen={})".format(
+            type(self).__name__, list(self._dq), self.maxlen
+        )
+
+    def __len__(self):
+        return len(self._dq)
+
+    @property
+    def dropped(self):
+        return sum(counter[0] for counter in self._drop_counters)
+
+    def put(self, item):
+        """Appends an item to the queue.
+
+        Returns:
+            False if the queue is full and the item was dropped, True
+            otherwise.
+        """
+        if len(self._dq) >= self.maxlen:
+            self._count_drop()
+            return False
+        self._dq.append(item)
+        return True
+
+    def _count_drop(self):
+        try:
+            counter = self._local.counter
+        except AttributeError:
+            counter = self._local.counter = [0]
+            with self._lock:
+                self._drop_counters = self._drop_counters + (counter,)
+        counter[0] += 1
+
+    def drain(self, max_items):
+        """Removes and returns at most ``max_items`` of the oldest items."""
+        items = []
+        popleft = self._dq.popleft
+        try:
+            for _ in range(min(max_items, len(self._dq))):
+                items.append(popleft())
+        except IndexError:
+            # another consumer emptied the queue concurrently
+            pass
+        return items
+
+
+class BytesBoundedQueue(BoundedQueue):
+    """A `BoundedQueue` also bounded by the total size of its items.
+
+    The size of each item is given by the producer. Items are rejected once
+    the queue holds ``maxlen`` items, or when the item would make the total
+    size exceed ``max_bytes``. To keep the total exact, producers take a
+    short lock.
+
+    Args:
+        maxlen: The maximum number of items.
+        max_bytes: The maximum total size of the items, or None to only
+            track it.
+    """
+
+    def __init__(self, maxlen, max_bytes=None):
+        super().__init__(maxlen)
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError
+        self.max_bytes = max_bytes
+        # the total size of the queued items
+        self.bytes = 0
+
+    def put(self, item, size=0):  # pylint: disable=arguments-differ
+        """Appends an item of ``size`` bytes to the queue.
+
+        Returns:
+            False if the queue is full and the item was dropped, True
+            otherwise.
+        """
+        with self._lock:
+            if len(self._dq) >= self.maxlen or (
+                self.max_bytes is not None
+                and self.bytes + size > self.max_bytes
+            ):
+                full = True
+            else:
+                full = False
+                self.bytes += size
+                self._dq.append((item, size))
+        if full:
+            self._count_drop()
+        return not full
+
+    def drain(self, max_items, max_bytes=None):
+        """Removes and returns at most ``max_items`` of the oldest items,
+        whose total size does not exceed ``max_bytes``.
+
+        The oldest item is returned even if it is larger than ``max_bytes``.
+        Only one thread may drain the queue.
+        """
+        items = []
+        total = 0
+        queue = self._dq
+        while queue and len(items) < max_items:
+            item, size = queue[0]
+            if items and max_bytes is not None and total + size > max_bytes:
+                break
+            queue.popleft()
+            items.append(item)
+            total += size
+        with self._lock:
+            self.bytes -= total
+        return items
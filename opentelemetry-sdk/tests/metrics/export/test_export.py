@@ -13,7 +13,12 @@
 # limitations under the License.
 
 import concurrent.futures
+import os
+import pickle
 import random
+import select
+import signal
+import threading
 import unittest
 from math import inf
 from unittest import mock
@@ -25,12 +30,20 @@ from opentelemetry.sdk.metrics.export import (
     MetricRecord,
 )
 from opentelemetry.sdk.metrics.export.aggregate import (
+    DDSketch,
+    DDSketchAggregator,
+    HistogramAggregator,
     LastValueAggregator,
     MinMaxSumCountAggregator,
     SumAggregator,
     ValueObserverAggregator,
+    exponential_bounds,
+    linear_bounds,
 )
 from opentelemetry.sdk.metrics.export.controller import PushController
+from opentelemetry.sdk.metrics.export.in_memory_metrics_exporter import (
+    InMemoryMetricsExporter,
+)
 from opentelemetry.sdk.metrics.export.processor import Processor
 from opentelemetry.sdk.resources import Resource
 
@@ -254,6 +267,83 @@ class TestSumAggregator(unittest.TestCase):
 
         self.assertEqual(fut.result(), checkpoint_total)
 
+    def test_concurrent_updates_and_checkpoint(self):
+        sum_agg = SumAggregator()
+        checkpoint_total = 0
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [
+                executor.submit(self.call_update, sum_agg) for _ in range(4)
+            ]
+
+            while not all(future.done() for future in futures):
+                sum_agg.take_checkpoint()
+                checkpoint_total += sum_agg.checkpoint
+
+        sum_agg.take_checkpoint()
+        checkpoint_total += sum_agg.checkpoint
+
+        self.assertEqual(
+            sum(future.result() for future in futures), checkpoint_total
+        )
+
+    def test_max_pending(self):
+        sum_agg = SumAggregator()
+        # pylint: disable=protected-access
+        for _ in range(sum_agg._MAX_PENDING * 2 + 1):
+            sum_agg.update(1)
+        self.assertLess(len(sum_agg._pending), sum_agg._MAX_PENDING)
+        self.assertEqual(sum_agg.current, sum_agg._MAX_PENDING * 2 + 1)
+        self.assertEqual(len(sum_agg._pending), 0)
+
+    def test_max_buffered(self):
+        sum_agg = SumAggregator()
+        # pylint: disable=protected-access
+        with sum_agg._lock:
+            # the lock is held, the updating thread keeps buffering
+            for _ in range(sum_agg._MAX_BUFFERED - 1):
+                sum_agg.update(1)
+            thread = threading.Thread(target=sum_agg.update, args=(1,))
+            thread.start()
+            # past the hard limit, it waits for the lock
+            thread.join(0.05)
+            self.assertTrue(thread.is_alive())
+        thread.join()
+        self.assertEqual(len(sum_agg._pending), 0)
+        self.assertEqual(sum_agg.current, sum_agg._MAX_BUFFERED)
+
+    @mock.patch("opentelemetry.sdk.metrics.export.aggregate.time_ns")
+    def test_update_many(self, time_mock):
+        time_mock.return_value = 123
+        values = [random.randint(-100, 100) for _ in range(100)]
+        aggregators = [
+            SumAggregator(),
+            MinMaxSumCountAggregator(),
+            HistogramAggregator(config={"bounds": [-10, 0, 10]}),
+            DDSketchAggregator(),
+        ]
+        for aggregator in aggregators:
+            expected = aggregator.__class__(config=aggregator.config)
+            for value in values:
+                expected.update(value)
+            expected.take_checkpoint()
+
+            aggregator.update(values[0])
+            aggregator.update_many(values[1:])
+            aggregator.update_many([])
+            self.assertEqual(aggregator.last_update_timestamp, 123)
+            aggregator.take_checkpoint()
+            checkpoint = aggregator.checkpoint
+            if isinstance(aggregator, DDSketchAggregator):
+                self.assertEqual(
+                    checkpoint.quantile(0.5), expected.checkpoint.quantile(0.5)
+                )
+                checkpoint, expected.checkpoint = (
+                    checkpoint.count,
+                    expected.checkpoint.count,
+                )
+            self.assertEqual(checkpoint, expected.checkpoint)
+
 
 class TestMinMaxSumCountAggregator(unittest.TestCase):
     @staticmethod
@@ -425,6 +515,261 @@ class TestMinMaxSumCountAggregator(unittest.TestCase):
             self.assertEqual(mmsc0.checkpoint, fut.result())
 
 
+class TestHistogramAggregator(unittest.TestCase):
+    @mock.patch("opentelemetry.sdk.metrics.export.aggregate.time_ns")
+    def test_update(self, time_mock):
+        time_mock.return_value = 123
+        histogram = HistogramAggregator(config={"bounds": [0, 10]})
+        for value in (-1, 0, 5, 10, 20):
+            histogram.update(value)
+        self.assertEqual(
+            list(histogram.current.items()), [(0, 1), (10, 2), (inf, 2)]
+        )
+        self.assertEqual(histogram.last_update_timestamp, 123)
+
+    def test_checkpoint(self):
+        histogram = HistogramAggregator()
+        histogram.update(1)
+        histogram.take_checkpoint()
+        self.assertEqual(list(histogram.checkpoint.values()), [0, 1])
+        self.assertEqual(list(histogram.current.values()), [0, 0])
+
+    def test_checkpoint_reuses_counts(self):
+        histogram = HistogramAggregator()
+        counts = {
+            id(histogram.current.counts),
+            id(histogram.checkpoint.counts),
+        }
+        histogram.update(1)
+        histogram.take_checkpoint()
+        histogram.update(-1)
+        histogram.take_checkpoint()
+        self.assertEqual(list(histogram.checkpoint.values()), [1, 0])
+        # nothing was recorded, the retired counts are zeroed
+        histogram.take_checkpoint()
+        self.assertEqual(list(histogram.checkpoint.values()), [0, 0])
+        histogram.update_many([1, 2])
+        histogram.take_checkpoint()
+        self.assertEqual(list(histogram.checkpoint.values()), [0, 2])
+        self.assertEqual(list(histogram.current.values()), [0, 0])
+        self.assertEqual(
+            {id(histogram.current.counts), id(histogram.checkpoint.counts),},
+            counts,
+        )
+
+    def test_buckets(self):
+        histogram = HistogramAggregator(config={"bounds": [1.5, 3]})
+        for value in (1, 1.5, 3, inf):
+            histogram.update(value)
+        histogram.take_checkpoint()
+        checkpoint = histogram.checkpoint
+        self.assertEqual(len(checkpoint), 3)
+        self.assertEqual(checkpoint[1.5], 1)
+        self.assertEqual(checkpoint[3], 1)
+        self.assertEqual(checkpoint[inf], 2)
+        self.assertEqual(checkpoint, {1.5: 1, 3: 1, inf: 2})
+        with self.assertRaises(KeyError):
+            checkpoint[2]  # pylint: disable=pointless-statement
+
+    def test_invalid_bounds(self):
+        with self.assertLogs(level="WARNING"):
+            histogram = HistogramAggregator(config={"bounds": [10, 5]})
+        self.assertEqual(list(histogram.current), [0, inf])
+
+    def test_merge(self):
+        histogram = HistogramAggregator(config={"bounds": [10]})
+        histogram2 = HistogramAggregator(config={"bounds": [10]})
+        histogram.update(1)
+        histogram.take_checkpoint()
+        histogram2.update(1)
+        histogram2.update(20)
+        histogram2.take_checkpoint()
+
+        histogram.merge(histogram2)
+        self.assertEqual(
+            list(histogram.checkpoint.items()), [(10, 2), (inf, 1)]
+        )
+        # the merged checkpoint does not alias the other one
+        self.assertEqual(list(histogram2.checkpoint.values()), [1, 1])
+
+        with self.assertLogs(level="WARNING"):
+            histogram.merge(HistogramAggregator(config={"bounds": [20]}))
+        self.assertEqual(list(histogram.checkpoint.values()), [2, 1])
+
+    def test_linear_bounds(self):
+        self.assertEqual(linear_bounds(10, 5, 4), [10, 15, 20, 25])
+        for args in ((0, 5, 0), (0, 0, 4)):
+            with self.assertRaises(ValueError):
+                linear_bounds(*args)
+
+    def test_exponential_bounds(self):
+        self.assertEqual(exponential_bounds(1, 2, 4), [1, 2, 4, 8])
+        for args in ((1, 2, 0), (0, 2, 4), (1, 1, 4)):
+            with self.assertRaises(ValueError):
+                exponential_bounds(*args)
+
+    def test_concurrent_updates_and_checkpoint(self):
+        histogram = HistogramAggregator(config={"bounds": [10, 100]})
+        checkpoint_total = [0, 0, 0]
+
+        def update():
+            for value in range(1000):
+                histogram.update(value)
+
+        def add_checkpoint():
+            histogram.take_checkpoint()
+            for index, count in enumerate(histogram.checkpoint.values()):
+                checkpoint_total[index] += count
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(update) for _ in range(4)]
+
+            while not all(future.done() for future in futures):
+                add_checkpoint()
+        add_checkpoint()
+
+        self.assertEqual(checkpoint_total, [40, 360, 3600])
+
+
+class TestDDSketchAggregator(unittest.TestCase):
+    @mock.patch("opentelemetry.sdk.metrics.export.aggregate.time_ns")
+    def test_update(self, time_mock):
+        time_mock.return_value = 123
+        sketch = DDSketchAggregator()
+        for value in (-1, 0, 5, 10, 20):
+            sketch.update(value)
+        current = sketch.current
+        self.assertEqual(
+            (current.count, current.sum, current.min, current.max),
+            (5, 34, -1, 20),
+        )
+        self.assertEqual(current.zero_count, 1)
+        self.assertEqual(sum(current.positive.values()), 3)
+        self.assertEqual(sum(current.negative.values()), 1)
+        self.assertEqual(sketch.last_update_timestamp, 123)
+
+    def test_checkpoint(self):
+        sketch = DDSketchAggregator()
+        sketch.update(1)
+        sketch.take_checkpoint()
+        self.assertEqual(sketch.checkpoint.count, 1)
+        self.assertEqual(sketch.current.count, 0)
+        self.assertIsNone(sketch.current.quantile(0.5))
+
+    def test_quantiles(self):
+        sketch = DDSketchAggregator({"relative_accuracy": 0.02})
+        values = [random.lognormvariate(0, 2) for _ in range(10000)]
+        values += [-value for value in values[:1000]]
+        for value in values:
+            sketch.update(value)
+        sketch.take_checkpoint()
+
+        values.sort()
+        for quantile in (0, 0.01, 0.1, 0.5, 0.9, 0.99, 0.999, 1):
+            expected = values[int(quantile * (len(values) - 1))]
+            self.assertLessEqual(
+                abs(sketch.checkpoint.quantile(quantile) - expected),
+                0.02 * abs(expected),
+            )
+        with self.assertRaises(ValueError):
+            sketch.checkpoint.quantile(1.5)
+
+    def test_infinity(self):
+        sketch = DDSketch()
+        sketch.add([1, inf, -inf])
+        self.assertEqual(sketch.count, 3)
+        self.assertEqual(sketch.quantile(0), -inf)
+        self.assertAlmostEqual(sketch.quantile(0.5), 1, delta=0.01)
+        self.assertEqual(sketch.quantile(1), inf)
+        self.assertEqual(list(sketch.buckets().values()), [1, 1, 1])
+
+    def test_max_buckets(self):
+        sketch = DDSketch(max_buckets=10)
+        values = [1.1 ** exponent for exponent in range(100)]
+        sketch.add(values)
+        self.assertEqual(len(sketch.positive), 10)
+        self.assertEqual(sketch.count, 100)
+        self.assertAlmostEqual(
+            sketch.quantile(0.99), values[98], delta=0.01 * values[98]
+        )
+        # the values of the collapsed buckets are counted in the lowest one
+        self.assertGreater(sketch.quantile(0.5), values[50])
+
+    def test_buckets(self):
+        sketch = DDSketch()
+        sketch.add([-2, 0, 0, 1, 1, 3])
+        buckets = sketch.buckets()
+        bounds = list(buckets)
+        self.assertEqual(bounds[1:3], [0, 1.0])
+        self.assertEqual(bounds[-1], inf)
+        self.assertEqual(list(buckets.values()), [1, 2, 2, 1, 0])
+        self.assertLess(-2, bounds[0])
+        self.assertGreaterEqual(3, bounds[2])
+        self.assertLessEqual(3, bounds[3])
+
+    def test_merge(self):
+        sketch = DDSketchAggregator()
+        sketch2 = DDSketchAggregator()
+        for value in range(1, 51):
+            sketch.update(value)
+            sketch2.update(value + 50)
+        sketch.take_checkpoint()
+        sketch2.take_checkpoint()
+        checkpoint = sketch.checkpoint
+
+        sketch.merge(sketch2)
+        self.assertEqual(checkpoint.count, 50)
+        self.assertEqual(sketch.checkpoint.count, 100)
+        self.assertEqual(sketch.checkpoint.sum, 5050)
+        self.assertAlmostEqual(sketch.checkpoint.quantile(0.5), 50, delta=1)
+        self.assertEqual(sketch.checkpoint.quantile(1), 100)
+
+        with self.assertLogs(level="WARNING"):
+            sketch.merge(DDSketchAggregator({"relative_accuracy": 0.05}))
+        self.assertEqual(sketch.checkpoint.count, 100)
+
+    def test_merge_pickled(self):
+        sketch = DDSketch()
+        sketch.add([1, 2, 3])
+        other = DDSketch()
+        other.add([4, 5])
+
+        sketch.merge(pickle.loads(pickle.dumps(other)))
+        self.assertEqual(sketch.count, 5)
+        self.assertEqual(sketch.max, 5)
+        self.assertAlmostEqual(sketch.quantile(0.5), 3, delta=0.03)
+        with self.assertRaises(ValueError):
+            sketch.merge(DDSketch(relative_accuracy=0.1))
+
+    def test_invalid_config(self):
+        with self.assertLogs(level="WARNING"):
+            sketch = DDSketchAggregator({"relative_accuracy": 2})
+        self.assertEqual(sketch.current.relative_accuracy, 0.01)
+        with self.assertLogs(level="WARNING"):
+            sketch = DDSketchAggregator({"quantiles": [0.5, 99]})
+        self.assertEqual(sketch.quantiles, (0.5, 0.9, 0.99))
+
+    def test_concurrent_updates_and_checkpoint(self):
+        sketch = DDSketchAggregator()
+        checkpoint = DDSketch()
+
+        def record(start):
+            for value in range(start, start + 1000):
+                sketch.update(value)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(record, start) for start in (1, 1001)]
+            while not all(future.done() for future in futures):
+                sketch.take_checkpoint()
+                checkpoint.merge(sketch.checkpoint)
+        sketch.take_checkpoint()
+        checkpoint.merge(sketch.checkpoint)
+
+        self.assertEqual(checkpoint.count, 2000)
+        self.assertEqual(checkpoint.sum, 2001000)
+        self.assertEqual((checkpoint.min, checkpoint.max), (1, 2000))
+
+
 class TestValueObserverAggregator(unittest.TestCase):
     @mock.patch("opentelemetry.sdk.metrics.export.aggregate.time_ns")
     def test_update(self, time_mock):
@@ -701,6 +1046,107 @@ class TestController(unittest.TestCase):
         self.assertEqual(meter.collect.call_count, 1)
         self.assertEqual(exporter.export.call_count, 1)
 
+    @unittest.skipUnless(hasattr(os, "fork"), "requires os.fork")
+    def test_push_controller_fork(self):
+        meter = metrics.MeterProvider(stateful=False).get_meter(__name__)
+        counter = meter.create_counter("counter", "", "1", int)
+        exporter = InMemoryMetricsExporter()
+        controller = PushController(meter, exporter, 30.0)
+        counter.add(1, {})
+
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            try:
+                os.close(read_fd)
+                counter.add(2, {})
+                controller.shutdown()
+                os.write(
+                    write_fd,
+                    str(
+                        [
+                            record.aggregator.checkpoint
+                            for record in exporter.get_exported_metrics()
+                        ]
+                    ).encode(),
+                )
+            finally:
+                os._exit(0)  # pylint: disable=protected-access
+
+        os.close(write_fd)
+        child_checkpoints = os.read(read_fd, 1024).decode()
+        os.close(read_fd)
+        os.waitpid(pid, 0)
+
+        self.assertEqual(child_checkpoints, "[2]")
+        controller.shutdown()
+        self.assertEqual(
+            [
+                record.aggregator.checkpoint
+                for record in exporter.get_exported_metrics()
+            ],
+            [1],
+        )
+
+    @unittest.skipUnless(
+        hasattr(os, "register_at_fork"), "requires os.register_at_fork"
+    )
+    def test_push_controller_fork_with_held_locks(self):
+        meter = metrics.MeterProvider(stateful=False).get_meter(__name__)
+        counter = meter.create_counter("counter", "", "1", int)
+        exporter = InMemoryMetricsExporter()
+        controller = PushController(meter, exporter, 30.0)
+        counter.add(1, {})
+        bound_counter = counter.bind({})
+        (view_data,) = bound_counter.view_datas
+
+        # locks held by another thread of the parent while forking
+        locked = threading.Event()
+        release = threading.Event()
+
+        def hold_locks():
+            with counter.bound_instruments_lock, view_data.aggregator._lock:
+                locked.set()
+                release.wait()
+
+        thread = threading.Thread(target=hold_locks)
+        thread.start()
+        locked.wait()
+
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            try:
+                os.close(read_fd)
+                counter.add(2, {})
+                counter.add(3, {"key": "value"})
+                controller.shutdown()
+                os.write(
+                    write_fd,
+                    str(
+                        sorted(
+                            record.aggregator.checkpoint
+                            for record in exporter.get_exported_metrics()
+                        )
+                    ).encode(),
+                )
+            finally:
+                os._exit(0)  # pylint: disable=protected-access
+
+        release.set()
+        thread.join()
+        os.close(write_fd)
+        readable, _, _ = select.select([read_fd], [], [], 10)
+        if not readable:  # pragma: no cover
+            os.kill(pid, signal.SIGKILL)
+        child_checkpoints = os.read(read_fd, 1024).decode() if readable else ""
+        os.close(read_fd)
+        os.waitpid(pid, 0)
+        bound_counter.release()
+        controller.shutdown()
+
+        self.assertEqual(child_checkpoints, "[2, 3]")
+
     def test_push_controller_suppress_instrumentation(self):
         meter = mock.Mock()
         exporter = mock.Mock()
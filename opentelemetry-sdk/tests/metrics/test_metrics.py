@@ -12,7 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import sys
+import threading
+import time
 import unittest
+from array import array
 from unittest import mock
 
 from opentelemetry import metrics as metrics_api
@@ -109,6 +113,88 @@ class TestMeter(unittest.TestCase):
         meter.collect()
         self.assertFalse(processor_mock.process.called)
 
+    def test_collect_keeps_updated_instruments(self):
+        meter = metrics.MeterProvider(stateful=False).get_meter(__name__)
+        counter = meter.create_counter("name", "desc", "unit", int)
+        labels = {"key1": "value1", "key2": "value2"}
+        counter.add(1, labels)
+        bound_instrument = counter.bound_instruments[
+            metrics.get_dict_as_key(labels)
+        ]
+        meter.collect()
+        meter.processor.finished_collection()
+
+        # labels in another order find the same bound instrument
+        counter.add(2, {"key2": "value2", "key1": "value1"})
+        self.assertIs(
+            counter.bound_instruments[metrics.get_dict_as_key(labels)],
+            bound_instrument,
+        )
+        meter.collect()
+        records = meter.processor.checkpoint_set()
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0].aggregator.checkpoint, 2)
+
+    def test_collect_expires_idle_instruments(self):
+        meter = metrics.MeterProvider(stateful=False).get_meter(__name__)
+        counter = meter.create_counter("name", "desc", "unit", int)
+        counter.add(1, {"key1": "value1"})
+        bound_counter = counter.bind({"key1": "value2"})
+        meter.collect()
+        meter.processor.finished_collection()
+
+        meter.collect()
+        # pylint: disable=protected-access
+        self.assertEqual(
+            list(counter.bound_instruments),
+            [metrics.get_dict_as_key({"key1": "value2"})],
+        )
+        self.assertEqual(counter._unbound_instruments, {})
+        (view,) = meter.view_manager.views[counter]
+        self.assertEqual(len(view.view_datas), 1)
+
+        # recording with the expired label set starts a new bound instrument
+        bound_counter.release()
+        meter.collect()
+        self.assertEqual(counter.bound_instruments, {})
+        bound_counter.add(3)
+        self.assertEqual(len(counter.bound_instruments), 1)
+        meter.collect()
+        records = meter.processor.checkpoint_set()
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0].aggregator.checkpoint, 3)
+
+    def test_collect_while_recording(self):
+        meter = metrics.MeterProvider().get_meter(__name__)
+        counter = meter.create_counter("name", "desc", "unit", int)
+        label_sets = [{"key": str(index)} for index in range(4)]
+        # switch threads often, so that bound instruments expire between
+        # their lookup and update
+        self.addCleanup(sys.setswitchinterval, sys.getswitchinterval())
+        sys.setswitchinterval(1e-6)
+
+        def add():
+            for _ in range(250):
+                for labels in label_sets:
+                    counter.add(1, labels)
+                # leave the label sets idle for some collections
+                time.sleep(0.0001)
+
+        threads = [threading.Thread(target=add) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        while any(thread.is_alive() for thread in threads):
+            meter.collect()
+        for thread in threads:
+            thread.join()
+        meter.collect()
+
+        # no values were lost to bound instruments expiring concurrently
+        records = meter.processor.checkpoint_set()
+        self.assertEqual(
+            [record.aggregator.checkpoint for record in records], [1000] * 4
+        )
+
     def test_collect_observers(self):
         meter = metrics.MeterProvider().get_meter(__name__)
         processor_mock = mock.Mock()
@@ -153,6 +239,38 @@ class TestMeter(unittest.TestCase):
             (3.0, 3.0, 3.0, 1),
         )
 
+    def test_record_batch_reuses_encoded_labels(self):
+        meter = metrics.MeterProvider().get_meter(__name__)
+        labels = {"key1": "value1", "key2": "value2"}
+        counter = metrics.Counter("name", "desc", "unit", int, meter)
+        updowncounter = metrics.UpDownCounter(
+            "name", "desc", "unit", int, meter
+        )
+        valuerecorder = metrics.ValueRecorder(
+            "name", "desc", "unit", int, meter
+        )
+        with mock.patch(
+            "opentelemetry.sdk.metrics.get_dict_as_key",
+            wraps=metrics.get_dict_as_key,
+        ) as get_dict_as_key_mock:
+            meter.record_batch(
+                labels, [(counter, 1), (updowncounter, -2), (valuerecorder, 3)]
+            )
+            # once for each metric not updated with the labels yet
+            self.assertEqual(get_dict_as_key_mock.call_count, 3)
+            meter.record_batch(
+                dict(labels), [(counter, 4), (valuerecorder, -1)]
+            )
+            self.assertEqual(get_dict_as_key_mock.call_count, 3)
+
+        labels_key = metrics.get_dict_as_key(labels)
+        (view_data,) = counter.bound_instruments[labels_key].view_datas
+        self.assertEqual(view_data.aggregator.current, 5)
+        (view_data,) = updowncounter.bound_instruments[labels_key].view_datas
+        self.assertEqual(view_data.aggregator.current, -2)
+        (view_data,) = valuerecorder.bound_instruments[labels_key].view_datas
+        self.assertEqual(view_data.aggregator.current, (-1, 3, 2, 2))
+
     def test_create_counter(self):
         resource = mock.Mock(spec=resources.Resource)
         meter_provider = metrics.MeterProvider(resource=resource)
@@ -347,6 +465,28 @@ class TestValueRecorder(unittest.TestCase):
             (min(values), max(values), sum(values), len(values)),
         )
 
+    def test_record_many(self):
+        meter = metrics.MeterProvider().get_meter(__name__)
+        metric = metrics.ValueRecorder("name", "desc", "unit", float, meter)
+        labels = {"key": "value"}
+        bound_valuerecorder = metric.bind(labels)
+        (view_data,) = bound_valuerecorder.view_datas
+
+        metric.record_many([37.0, 42.0], labels)
+        # arrays are converted to lists of numbers at once
+        bound_valuerecorder.record_many(array("d", [7.0, 1.5]))
+        bound_valuerecorder.record_many(value / 2 for value in range(3))
+        bound_valuerecorder.record_many([])
+        self.assertEqual(view_data.aggregator.current, (0, 42, 89, 7))
+
+        with self.assertLogs(level="WARNING"):
+            metric.record_many([3.0, 4, "5"], labels)
+        self.assertEqual(view_data.aggregator.current, (0, 42, 92, 8))
+
+        metric.enabled = False
+        metric.record_many([100.0], labels)
+        self.assertEqual(view_data.aggregator.current, (0, 42, 92, 8))
+
 
 class TestSumObserver(unittest.TestCase):
     def test_observe(self):
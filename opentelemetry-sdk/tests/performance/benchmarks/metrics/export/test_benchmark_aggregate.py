@@ -0,0 +1,99 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from opentelemetry.sdk.metrics.export.aggregate import (
+    DDSketchAggregator,
+    HistogramAggregator,
+    MinMaxSumCountAggregator,
+    SumAggregator,
+    exponential_bounds,
+)
+from opentelemetry.test.concurrency import run_in_threads
+
+UPDATES_PER_THREAD = 1000
+THREAD_COUNTS = [1, 4, 16, 64]
+AGGREGATORS = {
+    "sum": SumAggregator,
+    "minmaxsumcount": MinMaxSumCountAggregator,
+    "histogram": lambda: HistogramAggregator(
+        config={"bounds": [5, 10, 25, 50, 100, 250, 500, 1000]}
+    ),
+    "sketch": DDSketchAggregator,
+}
+
+
+def _update_and_checkpoint(aggregator, num_threads):
+    def target():
+        for value in range(UPDATES_PER_THREAD):
+            aggregator.update(value)
+
+    run_in_threads(target, num_threads)
+    aggregator.take_checkpoint()
+
+
+@pytest.mark.parametrize("num_threads", THREAD_COUNTS)
+@pytest.mark.parametrize("aggregator", sorted(AGGREGATORS))
+def test_update(benchmark, aggregator, num_threads):
+    benchmark.pedantic(
+        _update_and_checkpoint,
+        setup=lambda: ((AGGREGATORS[aggregator](), num_threads), {}),
+        rounds=10,
+    )
+
+
+@pytest.mark.parametrize("num_buckets", [10, 50])
+def test_histogram_update(benchmark, num_buckets):
+    histogram = HistogramAggregator(
+        config={"bounds": exponential_bounds(1, 1.25, num_buckets)}
+    )
+    values = [value % 1000 for value in range(UPDATES_PER_THREAD)]
+
+    def update():
+        for value in values:
+            histogram.update(value)
+        histogram.take_checkpoint()
+
+    benchmark(update)
+
+
+@pytest.mark.parametrize("num_buckets", [10, 50])
+def test_histogram_merge(benchmark, num_buckets):
+    config = {"bounds": exponential_bounds(1, 1.25, num_buckets)}
+    histogram = HistogramAggregator(config=config)
+    other = HistogramAggregator(config=config)
+    other.update(10)
+    other.take_checkpoint()
+
+    benchmark(histogram.merge, other)
+
+
+def test_sketch_merge(benchmark):
+    sketch = DDSketchAggregator()
+    other = DDSketchAggregator()
+    for value in range(1, 10000, 7):
+        other.update(value)
+    other.take_checkpoint()
+
+    benchmark(sketch.merge, other)
+
+
+def test_sketch_quantile(benchmark):
+    sketch = DDSketchAggregator()
+    for value in range(1, 10000, 7):
+        sketch.update(value)
+    sketch.take_checkpoint()
+
+    benchmark(sketch.checkpoint.quantile, 0.99)
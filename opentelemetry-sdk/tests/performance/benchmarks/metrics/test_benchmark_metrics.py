@@ -0,0 +1,99 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.test.concurrency import run_in_threads
+
+UPDATES_PER_THREAD = 1000
+THREAD_COUNTS = [1, 4, 16, 64]
+LABELS = {"environment": "staging", "route": "/api/users", "method": "GET"}
+
+meter = MeterProvider(shutdown_on_exit=False).get_meter(__name__)
+counter = meter.create_counter("counter", "desc", "1", int)
+valuerecorder = meter.create_valuerecorder("valuerecorder", "desc", "ms", int)
+
+
+def _update(update, num_threads):
+    def target():
+        for _ in range(UPDATES_PER_THREAD):
+            update(1)
+
+    run_in_threads(target, num_threads)
+
+
+@pytest.mark.parametrize("num_threads", THREAD_COUNTS)
+def test_bound_counter_add(benchmark, num_threads):
+    bound_counter = counter.bind(LABELS)
+    benchmark.pedantic(
+        _update, args=(bound_counter.add, num_threads), rounds=10
+    )
+    bound_counter.release()
+
+
+@pytest.mark.parametrize("num_threads", THREAD_COUNTS)
+def test_unbound_counter_add(benchmark, num_threads):
+    benchmark.pedantic(
+        _update,
+        args=(lambda value: counter.add(value, LABELS), num_threads),
+        rounds=10,
+    )
+
+
+@pytest.mark.parametrize("num_threads", THREAD_COUNTS)
+def test_bound_valuerecorder_record(benchmark, num_threads):
+    bound_valuerecorder = valuerecorder.bind(LABELS)
+    benchmark.pedantic(
+        _update, args=(bound_valuerecorder.record, num_threads), rounds=10
+    )
+    bound_valuerecorder.release()
+
+
+@pytest.mark.parametrize("num_threads", THREAD_COUNTS)
+def test_unbound_valuerecorder_record(benchmark, num_threads):
+    benchmark.pedantic(
+        _update,
+        args=(lambda value: valuerecorder.record(value, LABELS), num_threads),
+        rounds=10,
+    )
+
+
+def test_unbound_counter_add_after_collect(benchmark):
+    def add_and_collect():
+        counter.add(1, LABELS)
+        meter.collect()
+
+    benchmark(add_and_collect)
+
+
+def test_valuerecorder_record_values(benchmark):
+    values = list(range(UPDATES_PER_THREAD))
+
+    def record_values():
+        for value in values:
+            valuerecorder.record(value, LABELS)
+
+    benchmark(record_values)
+
+
+def test_valuerecorder_record_many(benchmark):
+    values = list(range(UPDATES_PER_THREAD))
+    benchmark(valuerecorder.record_many, values, LABELS)
+
+
+def test_record_batch(benchmark):
+    updowncounter = meter.create_updowncounter("updowncounter", "", "1", int)
+    record_tuples = [(counter, 1), (updowncounter, -1), (valuerecorder, 1)]
+    benchmark(meter.record_batch, LABELS, record_tuples)
@@ -0,0 +1,140 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import threading
+import tracemalloc
+
+import pytest
+
+from opentelemetry import trace as trace_api
+from opentelemetry.sdk import trace
+from opentelemetry.sdk.trace import export
+from opentelemetry.sdk.util import BoundedQueue
+from opentelemetry.test.concurrency import run_in_threads
+
+MAX_QUEUE_SIZE = 2048
+SPANS_PER_THREAD = 1000
+THREAD_COUNTS = [1, 8, 32]
+
+
+class _DequeQueue:
+    """The queueing path BatchExportSpanProcessor used before BoundedQueue:
+    a deque evicting the oldest span and a condition notified on every span
+    once the queue is half full."""
+
+    def __init__(self, maxlen):
+        self.queue = collections.deque([], maxlen)
+        self.condition = threading.Condition(threading.Lock())
+
+    def put(self, span):
+        self.queue.appendleft(span)
+        if len(self.queue) >= self.queue.maxlen // 2:
+            with self.condition:
+                self.condition.notify()
+
+
+class _NoOpSpanExporter(export.SpanExporter):
+    def export(self, spans):
+        return export.SpanExportResult.SUCCESS
+
+
+def _create_span():
+    span = trace._Span(  # pylint: disable=protected-access
+        "benchmarkedSpan",
+        trace_api.SpanContext(
+            0xDEADBEEF,
+            0xDEADBEEF,
+            is_remote=False,
+            trace_flags=trace_api.TraceFlags(trace_api.TraceFlags.SAMPLED),
+        ),
+    )
+    span.start()
+    span.end()
+    return span
+
+
+def _produce(put, num_threads):
+    span = _create_span()
+
+    def target():
+        for _ in range(SPANS_PER_THREAD):
+            put(span)
+
+    run_in_threads(target, num_threads)
+
+
+@pytest.mark.parametrize("num_threads", THREAD_COUNTS)
+def test_deque_put(benchmark, num_threads):
+    benchmark.pedantic(
+        _produce,
+        setup=lambda: ((_DequeQueue(MAX_QUEUE_SIZE).put, num_threads), {}),
+        rounds=10,
+    )
+
+
+@pytest.mark.parametrize("num_threads", THREAD_COUNTS)
+def test_bounded_queue_put(benchmark, num_threads):
+    benchmark.pedantic(
+        _produce,
+        setup=lambda: ((BoundedQueue(MAX_QUEUE_SIZE).put, num_threads), {}),
+        rounds=10,
+    )
+
+
+@pytest.mark.parametrize("num_threads", THREAD_COUNTS)
+def test_batch_export_span_processor_on_end(benchmark, num_threads):
+    span_processor = export.BatchExportSpanProcessor(
+        _NoOpSpanExporter(), max_queue_size=MAX_QUEUE_SIZE
+    )
+    benchmark.pedantic(
+        _produce, args=(span_processor.on_end, num_threads), rounds=10
+    )
+    span_processor.shutdown()
+
+
+# attributes of spans carrying payloads, 16 KiB each
+HEAVY_ATTRIBUTE_BYTES = 16 * 1024
+
+
+@pytest.mark.parametrize("max_queue_bytes", [None, 4 * 1024 * 1024])
+def test_batch_export_span_processor_queue_memory(benchmark, max_queue_bytes):
+    tracer_provider = trace.TracerProvider(shutdown_on_exit=False)
+    tracer = tracer_provider.get_tracer(__name__)
+    # spans are only exported once the queue is full
+    span_processor = export.BatchExportSpanProcessor(
+        _NoOpSpanExporter(),
+        max_queue_size=MAX_QUEUE_SIZE,
+        max_export_batch_size=MAX_QUEUE_SIZE,
+        schedule_delay_millis=60000,
+        max_queue_bytes=max_queue_bytes,
+    )
+    tracer_provider.add_span_processor(span_processor)
+
+    def fill_queue():
+        tracemalloc.start()
+        for _ in range(MAX_QUEUE_SIZE):
+            tracer.start_span(
+                "benchmarkedSpan",
+                attributes={"payload": "x" * HEAVY_ATTRIBUTE_BYTES},
+            ).end()
+        retained_bytes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        span_processor.queue.drain(MAX_QUEUE_SIZE)
+        return retained_bytes
+
+    benchmark.extra_info["retained_bytes"] = benchmark.pedantic(
+        fill_queue, rounds=3
+    )
+    span_processor.shutdown()
@@ -0,0 +1,44 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from opentelemetry import trace as trace_api
+from opentelemetry.test.concurrency import run_in_threads
+
+IDS_PER_THREAD = 10000
+THREAD_COUNTS = [1, 8]
+IDS_GENERATORS = {
+    "fork_safe": trace_api.ForkSafeRandomIdsGenerator,
+    "random": trace_api.RandomIdsGenerator,
+}
+
+
+def _generate(ids_generator, num_threads):
+    def target():
+        generate_span_id = ids_generator.generate_span_id
+        generate_trace_id = ids_generator.generate_trace_id
+        for _ in range(IDS_PER_THREAD):
+            generate_trace_id()
+            generate_span_id()
+
+    run_in_threads(target, num_threads)
+
+
+@pytest.mark.parametrize("num_threads", THREAD_COUNTS)
+@pytest.mark.parametrize("name", sorted(IDS_GENERATORS))
+def test_generate_ids(benchmark, name, num_threads):
+    ids_generator = IDS_GENERATORS[name]()
+    benchmark.extra_info["ids"] = 2 * IDS_PER_THREAD * num_threads
+    benchmark.pedantic(_generate, args=(ids_generator, num_threads), rounds=10)
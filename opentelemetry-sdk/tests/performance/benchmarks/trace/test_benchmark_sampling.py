@@ -0,0 +1,50 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from opentelemetry.sdk.trace.export import (
+    BatchExportSpanProcessor,
+    SpanExporter,
+)
+from opentelemetry.sdk.trace.sampling import (
+    BackpressureSampler,
+    RuleBasedSampler,
+    SamplingRule,
+)
+
+rule_based_sampler = RuleBasedSampler(
+    [
+        SamplingRule(name="GET /health", spans_per_second=1),
+        SamplingRule(name="cache.*", spans_per_second=5),
+    ]
+    + [
+        SamplingRule(name="GET /route{}".format(index), ratio=0.5)
+        for index in range(200)
+    ]
+)
+
+
+@pytest.mark.parametrize(
+    "name", ["GET /route150", "GET /health", "cache.hit", "unmatched"]
+)
+def test_rule_based_sampler(benchmark, name):
+    benchmark(rule_based_sampler.should_sample, None, 0xDEADBEEF, name)
+
+
+def test_backpressure_sampler(benchmark):
+    span_processor = BatchExportSpanProcessor(SpanExporter())
+    sampler = BackpressureSampler(span_processor, update_interval_millis=1)
+    benchmark(sampler.should_sample, None, 0xDEADBEEF, "span")
+    span_processor.shutdown()
@@ -0,0 +1,63 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import tracemalloc
+
+from opentelemetry import trace as trace_api
+from opentelemetry.sdk import trace
+
+NUM_SPANS = 2048
+
+_CONTEXT = trace_api.SpanContext(
+    0xDEADBEEF,
+    0xDEADBEEF,
+    is_remote=False,
+    trace_flags=trace_api.TraceFlags(trace_api.TraceFlags.SAMPLED),
+)
+
+
+def _create_spans(set_attribute):
+    spans = []
+    for _ in range(NUM_SPANS):
+        span = trace._Span(  # pylint: disable=protected-access
+            "benchmarkedSpan", _CONTEXT
+        )
+        span.start()
+        if set_attribute:
+            span.set_attribute("key", "value")
+        span.end()
+        spans.append(span)
+    return spans
+
+
+def _bytes_per_span(set_attribute):
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        spans = _create_spans(set_attribute)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert len(spans) == NUM_SPANS
+    return (after - before) // NUM_SPANS
+
+
+def test_span_memory_bare(benchmark):
+    benchmark.extra_info["bytes_per_span"] = _bytes_per_span(False)
+    benchmark(_create_spans, False)
+
+
+def test_span_memory_with_attribute(benchmark):
+    benchmark.extra_info["bytes_per_span"] = _bytes_per_span(True)
+    benchmark(_create_spans, True)
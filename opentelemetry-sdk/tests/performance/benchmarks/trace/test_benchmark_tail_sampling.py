@@ -0,0 +1,40 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from opentelemetry.sdk.trace import SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.tail_sampling import (
+    ErrorStatusPolicy,
+    LatencyPolicy,
+    TailSamplingSpanProcessor,
+)
+
+SPANS_PER_TRACE = 10
+
+tracer_provider = TracerProvider(shutdown_on_exit=False)
+tracer_provider.add_span_processor(
+    TailSamplingSpanProcessor(
+        SpanProcessor(), [ErrorStatusPolicy(), LatencyPolicy(1000)]
+    )
+)
+tracer = tracer_provider.get_tracer("sdk_tracer_provider")
+
+
+def test_tail_sampled_trace(benchmark):
+    def benchmark_tail_sampled_trace():
+        with tracer.start_as_current_span("root"):
+            for _ in range(SPANS_PER_TRACE - 1):
+                with tracer.start_as_current_span("child"):
+                    pass
+
+    benchmark(benchmark_tail_sampled_trace)
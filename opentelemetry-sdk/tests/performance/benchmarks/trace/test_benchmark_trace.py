@@ -0,0 +1,130 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider, sampling
+
+tracer = TracerProvider(
+    sampler=sampling.DEFAULT_ON,
+    resource=Resource(
+        {
+            "service.name": "A123456789",
+            "service.version": "1.34567890",
+            "service.instance.id": "123ab456-a123-12ab-12ab-12340a1abc12",
+        }
+    ),
+    shutdown_on_exit=False,
+).get_tracer("sdk_tracer_provider")
+
+
+def test_simple_start_span(benchmark):
+    def benchmark_start_span():
+        span = tracer.start_span("benchmarkedSpan")
+        span.end()
+
+    benchmark(benchmark_start_span)
+
+
+def test_simple_start_span_with_attributes(benchmark):
+    def benchmark_start_span_with_attributes():
+        span = tracer.start_span(
+            "benchmarkedSpan",
+            attributes={"long.attribute": -10000000001000000000},
+        )
+        span.end()
+
+    benchmark(benchmark_start_span_with_attributes)
+
+
+def test_set_attribute(benchmark):
+    def benchmark_set_attribute():
+        span = tracer.start_span("benchmarkedSpan")
+        span.set_attribute("http.method", "GET")
+        span.set_attribute("http.url", "https://example.com/resource")
+        span.set_attribute("http.status_code", 200)
+        span.set_attribute("http.retries", (1, 2, 3))
+        span.end()
+
+    benchmark(benchmark_set_attribute)
+
+
+def test_simple_start_as_current_span(benchmark):
+    def benchmark_start_as_current_span():
+        with tracer.start_as_current_span("benchmarkedSpan"):
+            pass
+
+    benchmark(benchmark_start_as_current_span)
+
+
+def test_nested_start_as_current_span(benchmark):
+    def benchmark_nested_start_as_current_span():
+        with tracer.start_as_current_span("parent"):
+            with tracer.start_as_current_span("child"):
+                with tracer.start_as_current_span("grandchild"):
+                    pass
+
+    benchmark(benchmark_nested_start_as_current_span)
+
+
+def test_use_span(benchmark):
+    span = tracer.start_span("benchmarkedSpan")
+
+    def benchmark_use_span():
+        with tracer.use_span(span):
+            pass
+
+    benchmark(benchmark_use_span)
+    span.end()
+
+
+def _start_nested_spans(depth):
+    if depth:
+        with tracer.start_as_current_span("benchmarkedSpan"):
+            _start_nested_spans(depth - 1)
+
+
+def test_deep_nested_start_as_current_span(benchmark):
+    benchmark(_start_nested_spans, 32)
+
+
+@tracer.start_as_current_span("benchmarkedSpan")
+def _decorated():
+    pass
+
+
+def test_start_as_current_span_decorator(benchmark):
+    benchmark(_decorated)
+
+
+dropping_tracer = TracerProvider(
+    sampler=sampling.ALWAYS_OFF, shutdown_on_exit=False
+).get_tracer("sdk_tracer_provider")
+
+
+def test_dropped_start_span(benchmark):
+    def benchmark_dropped_start_span():
+        span = dropping_tracer.start_span("benchmarkedSpan")
+        span.end()
+
+    benchmark(benchmark_dropped_start_span)
+
+
+def test_dropped_nested_start_as_current_span(benchmark):
+    def benchmark_dropped_nested_start_as_current_span():
+        with dropping_tracer.start_as_current_span("parent"):
+            with dropping_tracer.start_as_current_span("child"):
+                with dropping_tracer.start_as_current_span("grandchild"):
+                    pass
+
+    benchmark(benchmark_dropped_nested_start_as_current_span)
@@ -13,9 +13,15 @@
 # limitations under the License.
 
 import collections
+import threading
 import unittest
 
-from opentelemetry.sdk.util import BoundedDict, BoundedList
+from opentelemetry.sdk.util import (
+    BoundedDict,
+    BoundedList,
+    BoundedQueue,
+    BytesBoundedQueue,
+)
 
 
 class TestBoundedList(unittest.TestCase):
@@ -135,6 +141,87 @@ class TestBoundedList(unittest.TestCase):
         self.assertEqual(blist.dropped, len(other_list))
 
 
+class TestBoundedQueue(unittest.TestCase):
+    def test_raises(self):
+        with self.assertRaises(ValueError):
+            BoundedQueue(0)
+
+        with self.assertRaises(ValueError):
+            BoundedQueue(-1)
+
+    def test_put_and_drain(self):
+        queue = BoundedQueue(8)
+        for val in range(5):
+            self.assertTrue(queue.put(val))
+
+        self.assertEqual(len(queue), 5)
+        self.assertEqual(queue.drain(3), [0, 1, 2])
+        self.assertEqual(queue.drain(3), [3, 4])
+        self.assertEqual(queue.drain(3), [])
+        self.assertEqual(queue.dropped, 0)
+
+    def test_put_drop(self):
+        """Test that new items are rejected instead of evicting old ones."""
+        queue = BoundedQueue(4)
+        for val in range(10):
+            queue.put(val)
+
+        self.assertEqual(len(queue), 4)
+        self.assertEqual(queue.dropped, 6)
+        self.assertEqual(queue.drain(10), [0, 1, 2, 3])
+
+    def test_dropped_from_multiple_threads(self):
+        num_threads = 8
+        num_items = 1000
+        queue = BoundedQueue(1)
+        queue.put(None)
+
+        def put_items():
+            for val in range(num_items):
+                queue.put(val)
+
+        threads = [
+            threading.Thread(target=put_items) for _ in range(num_threads)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(queue), 1)
+        self.assertEqual(queue.dropped, num_threads * num_items)
+
+
+class TestBytesBoundedQueue(unittest.TestCase):
+    def test_raises(self):
+        with self.assertRaises(ValueError):
+            BytesBoundedQueue(8, 0)
+
+    def test_put_drop(self):
+        queue = BytesBoundedQueue(8, 100)
+        self.assertTrue(queue.put("a", 60))
+        self.assertFalse(queue.put("b", 60))
+        self.assertTrue(queue.put("c", 40))
+        self.assertFalse(queue.put("d", 1))
+
+        self.assertEqual(queue.bytes, 100)
+        self.assertEqual(queue.dropped, 2)
+        self.assertEqual(queue.drain(8), ["a", "c"])
+        self.assertEqual(queue.bytes, 0)
+
+    def test_drain_max_bytes(self):
+        queue = BytesBoundedQueue(8)
+        for item, size in (("a", 10), ("b", 10), ("c", 50), ("d", 10)):
+            queue.put(item, size)
+
+        self.assertEqual(queue.bytes, 80)
+        self.assertEqual(queue.drain(8, 30), ["a", "b"])
+        # the oldest item is drained even if it exceeds max_bytes
+        self.assertEqual(queue.drain(8, 30), ["c"])
+        self.assertEqual(queue.drain(8, 30), ["d"])
+        self.assertEqual(queue.bytes, 0)
+
+
 class TestBoundedDict(unittest.TestCase):
     base = collections.OrderedDict(
         [
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import os
 import threading
 import time
@@ -24,7 +25,9 @@ from opentelemetry import trace as trace_api
 from opentelemetry.configuration import Configuration
 from opentelemetry.context import Context
 from opentelemetry.sdk import trace
+from opentelemetry.sdk.resources import Resource
 from opentelemetry.sdk.trace import export
+from opentelemetry.trace.status import Status, StatusCode
 
 
 class MySpanExporter(export.SpanExporter):
@@ -167,6 +170,7 @@ class TestBatchExportSpanProcessor(unittest.TestCase):
             "OTEL_BSP_SCHEDULE_DELAY_MILLIS": "2",
             "OTEL_BSP_MAX_EXPORT_BATCH_SIZE": "3",
             "OTEL_BSP_EXPORT_TIMEOUT_MILLIS": "4",
+            "OTEL_BSP_MAX_CONCURRENT_EXPORTS": "5",
         },
     )
     def test_batch_span_processor_environment_variables(self):
@@ -179,6 +183,8 @@ class TestBatchExportSpanProcessor(unittest.TestCase):
         self.assertEqual(batch_span_processor.schedule_delay_millis, 2)
         self.assertEqual(batch_span_processor.max_export_batch_size, 3)
         self.assertEqual(batch_span_processor.export_timeout_millis, 4)
+        self.assertEqual(batch_span_processor.max_concurrent_exports, 5)
+        batch_span_processor.shutdown()
 
     def test_on_start_accepts_parent_context(self):
         # pylint: disable=no-self-use
@@ -333,6 +339,205 @@ class TestBatchExportSpanProcessor(unittest.TestCase):
         self.assertEqual(len(spans_names_list), 1024)
         span_processor.shutdown()
 
+    def test_batch_span_processor_drops_newest(self):
+        """Test that spans are dropped and counted when the queue is full"""
+        spans_names_list = []
+
+        export_event = threading.Event()
+        release_event = threading.Event()
+
+        class BlockingSpanExporter(MySpanExporter):
+            def export(self, spans):
+                result = super().export(spans)
+                release_event.wait(5)
+                return result
+
+        my_exporter = BlockingSpanExporter(
+            destination=spans_names_list, export_event=export_event
+        )
+        span_processor = export.BatchExportSpanProcessor(
+            my_exporter, max_queue_size=4, max_export_batch_size=4
+        )
+
+        # the first batch keeps the worker busy in the exporter
+        for idx in range(4):
+            _create_start_and_end_span("first-{}".format(idx), span_processor)
+        self.assertTrue(export_event.wait(2))
+
+        with self.assertLogs(level=WARNING):
+            for idx in range(6):
+                _create_start_and_end_span(
+                    "second-{}".format(idx), span_processor
+                )
+
+        self.assertEqual(span_processor.dropped_spans, 2)
+
+        release_event.set()
+        self.assertTrue(span_processor.force_flush())
+        self.assertListEqual(
+            ["first-{}".format(idx) for idx in range(4)]
+            + ["second-{}".format(idx) for idx in range(4)],
+            spans_names_list,
+        )
+        span_processor.shutdown()
+
+    def test_batch_span_processor_concurrent_exports(self):
+        """Test that batches are exported in parallel and none is lost"""
+        spans_names_list = []
+        lock = threading.Lock()
+        in_flight = [0]
+        max_in_flight = [0]
+
+        class SlowSpanExporter(MySpanExporter):
+            def export(self, spans):
+                with lock:
+                    in_flight[0] += 1
+                    max_in_flight[0] = max(max_in_flight[0], in_flight[0])
+                result = super().export(spans)
+                with lock:
+                    in_flight[0] -= 1
+                return result
+
+        my_exporter = SlowSpanExporter(
+            destination=spans_names_list,
+            max_export_batch_size=4,
+            export_timeout_millis=50,
+        )
+        span_processor = export.BatchExportSpanProcessor(
+            my_exporter,
+            max_queue_size=64,
+            max_export_batch_size=4,
+            max_concurrent_exports=4,
+        )
+
+        for _ in range(32):
+            _create_start_and_end_span("foo", span_processor)
+
+        self.assertTrue(span_processor.force_flush())
+        self.assertEqual(len(spans_names_list), 32)
+        self.assertGreater(max_in_flight[0], 1)
+        self.assertLessEqual(max_in_flight[0], 4)
+
+        for _ in range(8):
+            _create_start_and_end_span("bar", span_processor)
+
+        span_processor.shutdown()
+        self.assertEqual(len(spans_names_list), 40)
+        self.assertTrue(my_exporter.is_shutdown)
+
+    def test_batch_span_processor_export_batch_bytes(self):
+        batches = []
+
+        class BatchSpanExporter(export.SpanExporter):
+            def export(self, spans):
+                batches.append([span.name for span in spans])
+                return export.SpanExportResult.SUCCESS
+
+        tracer_provider = trace.TracerProvider()
+        tracer = tracer_provider.get_tracer(__name__)
+        span_processor = export.BatchExportSpanProcessor(
+            BatchSpanExporter(), max_export_batch_bytes=400
+        )
+        tracer_provider.add_span_processor(span_processor)
+
+        # about 130 bytes each
+        for name in ("a", "b", "c"):
+            tracer.start_span(name, attributes={"key": "v" * 50}).end()
+        # larger than max_export_batch_bytes, exported on its own
+        tracer.start_span("large", attributes={"key": "v" * 500}).end()
+        tracer.start_span("d").end()
+        span_processor.shutdown()
+
+        self.assertEqual(batches, [["a", "b", "c"], ["large"], ["d"]])
+
+    def test_batch_span_processor_queue_bytes(self):
+        spans_names_list = []
+        tracer_provider = trace.TracerProvider()
+        tracer = tracer_provider.get_tracer(__name__)
+        span_processor = export.BatchExportSpanProcessor(
+            MySpanExporter(destination=spans_names_list),
+            schedule_delay_millis=30000,
+            max_queue_bytes=1024,
+        )
+        tracer_provider.add_span_processor(span_processor)
+
+        with self.assertLogs(level=WARNING):
+            # larger than the whole queue
+            tracer.start_span(
+                "oversized", attributes={"key": "v" * 2048}
+            ).end()
+            for _ in range(20):
+                tracer.start_span("span", attributes={"key": "v" * 50}).end()
+
+        # about 130 bytes each, so 7 of them fit
+        self.assertEqual(span_processor.dropped_spans, 14)
+        self.assertLessEqual(span_processor.queue.bytes, 1024)
+        span_processor.shutdown()
+        self.assertEqual(spans_names_list, ["span"] * 7)
+
+    def test_estimate_span_size(self):
+        tracer = trace.TracerProvider().get_tracer(__name__)
+        span = tracer.start_span("span")
+        span.end()
+        base_size = export._estimate_span_size(span)
+
+        span = tracer.start_span(
+            "span", attributes={"key": "value", "values": (1, 2)}
+        )
+        span.add_event("event", {"key": "value"})
+        span.end()
+        self.assertEqual(
+            export._estimate_span_size(span),
+            base_size
+            + (export._ATTRIBUTE_OVERHEAD + len("key") + len("value"))
+            + (export._ATTRIBUTE_OVERHEAD + len("values") + 2 * 8)
+            + (export._EVENT_OVERHEAD + len("event"))
+            + (export._ATTRIBUTE_OVERHEAD + len("key") + len("value")),
+        )
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires os.fork")
+    def test_batch_span_processor_fork(self):
+        spans_names_list = []
+        my_exporter = MySpanExporter(destination=spans_names_list)
+        span_processor = export.BatchExportSpanProcessor(
+            my_exporter, max_concurrent_exports=2
+        )
+        # queued before the fork, only exported by the parent
+        _create_start_and_end_span("parent", span_processor)
+
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            try:
+                os.close(read_fd)
+                _create_start_and_end_span("child", span_processor)
+                span_processor.force_flush()
+                os.write(write_fd, ",".join(spans_names_list).encode())
+            finally:
+                os._exit(0)  # pylint: disable=protected-access
+
+        os.close(write_fd)
+        child_spans_names = os.read(read_fd, 1024).decode()
+        os.close(read_fd)
+        os.waitpid(pid, 0)
+
+        self.assertEqual(child_spans_names, "child")
+        span_processor.shutdown()
+        self.assertEqual(spans_names_list, ["parent"])
+
+    def test_batch_span_processor_not_thread_safe_exporter(self):
+        class NotThreadSafeSpanExporter(MySpanExporter):
+            thread_safe = False
+
+        my_exporter = NotThreadSafeSpanExporter(destination=[])
+        with self.assertLogs(level=WARNING):
+            span_processor = export.BatchExportSpanProcessor(
+                my_exporter, max_concurrent_exports=4
+            )
+
+        self.assertEqual(span_processor.max_concurrent_exports, 1)
+        span_processor.shutdown()
+
     def test_batch_span_processor_not_sampled(self):
         tracer_provider = trace.TracerProvider(
             sampler=trace.sampling.ALWAYS_OFF
@@ -358,6 +563,20 @@ class TestBatchExportSpanProcessor(unittest.TestCase):
         self.assertEqual(len(spans_names_list), 0)
         span_processor.shutdown()
 
+    def test_batch_span_processor_export_duration(self):
+        spans_names_list = []
+
+        my_exporter = MySpanExporter(
+            destination=spans_names_list, export_timeout_millis=20
+        )
+        span_processor = export.BatchExportSpanProcessor(my_exporter)
+        self.assertEqual(span_processor.last_export_duration_millis, 0)
+
+        _create_start_and_end_span("foo", span_processor)
+        self.assertTrue(span_processor.force_flush())
+        self.assertGreaterEqual(span_processor.last_export_duration_millis, 20)
+        span_processor.shutdown()
+
     def test_batch_span_processor_scheduled_delay(self):
         """Test that spans are exported each schedule_delay_millis"""
         spans_names_list = []
@@ -464,6 +683,14 @@ class TestBatchExportSpanProcessor(unittest.TestCase):
             max_export_batch_size=-500,
         )
 
+        # zero max_concurrent_exports
+        self.assertRaises(
+            ValueError,
+            export.BatchExportSpanProcessor,
+            None,
+            max_concurrent_exports=0,
+        )
+
         # max_export_batch_size > max_queue_size:
         self.assertRaises(
             ValueError,
@@ -473,6 +700,308 @@ class TestBatchExportSpanProcessor(unittest.TestCase):
             max_export_batch_size=512,
         )
 
+        # zero max_queue_bytes
+        self.assertRaises(
+            ValueError,
+            export.BatchExportSpanProcessor,
+            None,
+            max_queue_bytes=0,
+        )
+
+        # negative max_export_batch_bytes
+        self.assertRaises(
+            ValueError,
+            export.BatchExportSpanProcessor,
+            None,
+            max_export_batch_bytes=-500,
+        )
+
+
+class MyAsyncSpanExporter(export.AsyncSpanExporter):
+    """Very simple async span exporter used for testing."""
+
+    def __init__(self, destination, export_delay_millis=0.0):
+        self.destination = destination
+        self.export_delay = export_delay_millis / 1e3
+        self.is_shutdown = False
+
+    async def export(self, spans):
+        await asyncio.sleep(self.export_delay)
+        self.destination.extend(span.name for span in spans)
+        return export.SpanExportResult.SUCCESS
+
+    async def shutdown(self):
+        self.is_shutdown = True
+
+
+class TestAsyncBatchSpanProcessor(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def _create_processor(self, exporter, **kwargs):
+        return export.AsyncBatchSpanProcessor(
+            exporter, loop=self.loop, **kwargs
+        )
+
+    def test_shutdown(self):
+        spans_names_list = []
+        my_exporter = MyAsyncSpanExporter(destination=spans_names_list)
+        span_processor = self._create_processor(my_exporter)
+
+        span_names = ["xxx", "bar", "foo"]
+
+        async def run():
+            for name in span_names:
+                _create_start_and_end_span(name, span_processor)
+            await span_processor.async_shutdown()
+
+        self.loop.run_until_complete(run())
+        self.assertTrue(my_exporter.is_shutdown)
+        self.assertListEqual(span_names, spans_names_list)
+
+    def test_shutdown_outside_loop(self):
+        spans_names_list = []
+        my_exporter = MyAsyncSpanExporter(destination=spans_names_list)
+        span_processor = self._create_processor(my_exporter)
+
+        _create_start_and_end_span("foo", span_processor)
+        span_processor.shutdown()
+
+        self.assertTrue(my_exporter.is_shutdown)
+        self.assertListEqual(["foo"], spans_names_list)
+
+    def test_running_loop(self):
+        spans_names_list = []
+        my_exporter = MyAsyncSpanExporter(destination=spans_names_list)
+        # the processor uses the loop running when the first span ends
+        span_processor = export.AsyncBatchSpanProcessor(my_exporter)
+
+        async def run():
+            _create_start_and_end_span("foo", span_processor)
+            await span_processor.async_shutdown()
+
+        self.loop.run_until_complete(run())
+        self.assertTrue(my_exporter.is_shutdown)
+        self.assertListEqual(["foo"], spans_names_list)
+
+    def test_shutdown_without_loop(self):
+        my_exporter = MyAsyncSpanExporter(destination=[])
+        span_processor = export.AsyncBatchSpanProcessor(my_exporter)
+
+        _create_start_and_end_span("foo", span_processor)
+        with self.assertLogs(level=WARNING):
+            self.assertFalse(span_processor.force_flush())
+        with self.assertLogs(level=WARNING):
+            span_processor.shutdown()
+        self.assertTrue(span_processor.done)
+
+    def test_force_flush(self):
+        spans_names_list = []
+        my_exporter = MyAsyncSpanExporter(destination=spans_names_list)
+        span_processor = self._create_processor(my_exporter)
+
+        span_names0 = ["xxx", "bar", "foo"]
+        span_names1 = ["yyy", "baz", "fox"]
+
+        async def run():
+            for name in span_names0:
+                _create_start_and_end_span(name, span_processor)
+            self.assertTrue(await span_processor.async_force_flush())
+            self.assertListEqual(span_names0, spans_names_list)
+
+            for name in span_names1:
+                _create_start_and_end_span(name, span_processor)
+            self.assertTrue(await span_processor.async_force_flush())
+            self.assertListEqual(span_names0 + span_names1, spans_names_list)
+
+            await span_processor.async_shutdown()
+
+        self.loop.run_until_complete(run())
+
+    def test_force_flush_timeout(self):
+        my_exporter = MyAsyncSpanExporter(
+            destination=[], export_delay_millis=500
+        )
+        span_processor = self._create_processor(my_exporter)
+
+        async def run():
+            _create_start_and_end_span("foo", span_processor)
+            with self.assertLogs(level=WARNING):
+                self.assertFalse(await span_processor.async_force_flush(100))
+            await span_processor.async_shutdown()
+
+        self.loop.run_until_complete(run())
+
+    def test_force_flush_from_other_thread(self):
+        spans_names_list = []
+        my_exporter = MyAsyncSpanExporter(destination=spans_names_list)
+        span_processor = self._create_processor(my_exporter)
+        loop_thread = threading.Thread(target=self.loop.run_forever)
+        loop_thread.start()
+
+        try:
+            _create_start_and_end_span("foo", span_processor)
+            self.assertTrue(span_processor.force_flush())
+            self.assertListEqual(["foo"], spans_names_list)
+            span_processor.shutdown()
+            self.assertTrue(my_exporter.is_shutdown)
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            loop_thread.join()
+
+    def test_export_full_batch(self):
+        """Test that a full batch is exported before the schedule delay"""
+        spans_names_list = []
+        my_exporter = MyAsyncSpanExporter(destination=spans_names_list)
+        span_processor = self._create_processor(
+            my_exporter, max_export_batch_size=4, schedule_delay_millis=30000
+        )
+
+        async def run():
+            # let the worker task start waiting
+            await asyncio.sleep(0)
+            for _ in range(4):
+                _create_start_and_end_span("foo", span_processor)
+            await asyncio.sleep(0.05)
+            self.assertEqual(len(spans_names_list), 4)
+            await span_processor.async_shutdown()
+
+        self.loop.run_until_complete(run())
+
+    def test_scheduled_delay(self):
+        spans_names_list = []
+        my_exporter = MyAsyncSpanExporter(destination=spans_names_list)
+        span_processor = self._create_processor(
+            my_exporter, schedule_delay_millis=50
+        )
+
+        async def run():
+            _create_start_and_end_span("foo", span_processor)
+            await asyncio.sleep(0.2)
+            self.assertEqual(len(spans_names_list), 1)
+            await span_processor.async_shutdown()
+
+        self.loop.run_until_complete(run())
+
+
+class TestSpanBatch(unittest.TestCase):
+    def test_columns(self):
+        resource = Resource({"service.name": "batch"})
+        equal_resource = Resource({"service.name": "batch"})
+        other_resource = Resource({"service.name": "other"})
+        parent = trace_api.SpanContext(
+            0x000000000000000000000000DEADBEEF,
+            0x00000000DEADBEF0,
+            is_remote=False,
+        )
+        spans = [
+            trace._Span(
+                "root",
+                trace_api.SpanContext(
+                    0x000000000000000000000000DEADBEEF,
+                    0x00000000DEADBEF0,
+                    is_remote=False,
+                ),
+                resource=resource,
+            ),
+            trace._Span(
+                "child",
+                trace_api.SpanContext(
+                    0x000000000000000000000000DEADBEEF,
+                    0x00000000DEADBEF1,
+                    is_remote=False,
+                ),
+                parent=parent,
+                resource=equal_resource,
+                kind=trace_api.SpanKind.CLIENT,
+            ),
+            trace._Span(
+                "root",
+                trace_api.SpanContext(
+                    0x000000000000000000000000DEADBEF2,
+                    0x00000000DEADBEF3,
+                    is_remote=False,
+                ),
+                resource=other_resource,
+            ),
+        ]
+        for start_time, span in enumerate(spans):
+            span.start(start_time=start_time)
+        spans[1].set_status(Status(StatusCode.ERROR))
+        for end_time, span in enumerate(spans, 10):
+            span.end(end_time=end_time)
+
+        batch = export.SpanBatch(spans)
+
+        self.assertEqual(len(batch), 3)
+        self.assertIs(batch[1], spans[1])
+        self.assertEqual(list(batch), spans)
+        self.assertEqual(
+            batch.trace_ids,
+            [
+                0x000000000000000000000000DEADBEEF,
+                0x000000000000000000000000DEADBEF2,
+            ],
+        )
+        self.assertEqual(list(batch.trace_id_indices), [0, 0, 1])
+        self.assertEqual(
+            list(batch.span_ids),
+            [0x00000000DEADBEF0, 0x00000000DEADBEF1, 0x00000000DEADBEF3],
+        )
+        self.assertEqual(list(batch.parent_span_ids), [0, 0xDEADBEF0, 0])
+        self.assertEqual(list(batch.start_times), [0, 1, 2])
+        self.assertEqual(list(batch.end_times), [10, 11, 12])
+        self.assertEqual(
+            list(batch.kinds),
+            [
+                trace_api.SpanKind.INTERNAL.value,
+                trace_api.SpanKind.CLIENT.value,
+                trace_api.SpanKind.INTERNAL.value,
+            ],
+        )
+        self.assertEqual(
+            list(batch.status_codes),
+            [
+                StatusCode.UNSET.value,
+                StatusCode.ERROR.value,
+                StatusCode.UNSET.value,
+            ],
+        )
+        self.assertEqual(batch.names, ["root", "child"])
+        self.assertEqual(list(batch.name_indices), [0, 1, 0])
+        self.assertEqual(batch.resources, [resource, other_resource])
+        self.assertEqual(list(batch.resource_indices), [0, 0, 1])
+        self.assertEqual(batch.instrumentation_infos, [None])
+        self.assertEqual(list(batch.instrumentation_info_indices), [0, 0, 0])
+
+    def test_create(self):
+        batch = export.SpanBatch(())
+        self.assertIs(export.SpanBatch.create(batch), batch)
+        self.assertIsInstance(export.SpanBatch.create([]), export.SpanBatch)
+
+    def test_batch_span_processor_exports_batch(self):
+        for accepts_span_batch in (False, True):
+            spans_names_list = []
+            my_exporter = MySpanExporter(destination=spans_names_list)
+            my_exporter.accepts_span_batch = accepts_span_batch
+            span_processor = export.BatchExportSpanProcessor(my_exporter)
+
+            with mock.patch.object(
+                my_exporter, "export", wraps=my_exporter.export
+            ) as export_mock:
+                _create_start_and_end_span("foo", span_processor)
+                span_processor.force_flush()
+
+            (batch,), _ = export_mock.call_args
+            self.assertEqual(
+                isinstance(batch, export.SpanBatch), accepts_span_batch
+            )
+            self.assertEqual(spans_names_list, ["foo"])
+            span_processor.shutdown()
+
 
 class TestConsoleSpanExporter(unittest.TestCase):
     def test_export(self):  # pylint: disable=no-self-use
@@ -14,9 +14,11 @@
 
 import sys
 import unittest
+from unittest import mock
 
 from opentelemetry import trace
-from opentelemetry.sdk.trace import sampling
+from opentelemetry.sdk.trace import TracerProvider, sampling
+from opentelemetry.sdk.util import BytesBoundedQueue
 
 TO_DEFAULT = trace.TraceFlags(trace.TraceFlags.DEFAULT)
 TO_SAMPLED = trace.TraceFlags(trace.TraceFlags.SAMPLED)
@@ -89,6 +91,19 @@ class TestSampler(unittest.TestCase):
             sampled_always_on.attributes, {"sampled parent": "sampling on"}
         )
 
+    def test_always_on_reuses_result(self):
+        first = sampling.ALWAYS_ON.should_sample(None, 0xDEADBEF1, "span")
+        second = sampling.ALWAYS_ON.should_sample(None, 0xDEADBEF2, "span")
+        self.assertIs(first, second)
+        self.assertTrue(first.decision.is_sampled())
+        self.assertEqual(first.attributes, {})
+
+        with_attributes = sampling.ALWAYS_ON.should_sample(
+            None, 0xDEADBEF1, "span", {"key": "value"}
+        )
+        self.assertIsNot(first, with_attributes)
+        self.assertEqual(with_attributes.attributes, {"key": "value"})
+
     def test_always_off(self):
         no_record_always_off = sampling.ALWAYS_OFF.should_sample(
             trace.SpanContext(
@@ -341,3 +356,277 @@ class TestSampler(unittest.TestCase):
                 context, 0x8000000000000000, 0xDEADBEEF, "span name",
             ).decision.is_sampled()
         )
+
+
+class TestRuleBasedSampler(unittest.TestCase):
+    @staticmethod
+    def _is_sampled(sampler, name, attributes=None, kind=None, trace_id=0):
+        return sampler.should_sample(
+            None, trace_id, name, attributes, kind=kind
+        ).decision.is_sampled()
+
+    def test_exact_name(self):
+        sampler = sampling.RuleBasedSampler(
+            [sampling.SamplingRule(name="GET /health", ratio=0.0)]
+        )
+        self.assertFalse(self._is_sampled(sampler, "GET /health"))
+        self.assertTrue(self._is_sampled(sampler, "GET /healthz"))
+        self.assertTrue(self._is_sampled(sampler, "GET /"))
+
+    def test_prefix_name(self):
+        sampler = sampling.RuleBasedSampler(
+            [
+                sampling.SamplingRule(name="cache.*", ratio=0.0),
+                sampling.SamplingRule(name="cache.miss", ratio=1.0),
+                sampling.SamplingRule(name="c*", ratio=1.0),
+            ],
+            default=sampling.ALWAYS_OFF,
+        )
+        # the prefix rule comes first
+        self.assertFalse(self._is_sampled(sampler, "cache.miss"))
+        self.assertFalse(self._is_sampled(sampler, "cache.hit"))
+        self.assertTrue(self._is_sampled(sampler, "call"))
+        self.assertFalse(self._is_sampled(sampler, "other"))
+
+    def test_rule_order(self):
+        sampler = sampling.RuleBasedSampler(
+            [
+                sampling.SamplingRule(
+                    attributes={"cache.hit": True}, ratio=0.0
+                ),
+                sampling.SamplingRule(name="lookup", ratio=1.0),
+            ],
+            default=sampling.ALWAYS_OFF,
+        )
+        self.assertFalse(
+            self._is_sampled(sampler, "lookup", {"cache.hit": True})
+        )
+        self.assertTrue(
+            self._is_sampled(sampler, "lookup", {"cache.hit": False})
+        )
+        self.assertTrue(self._is_sampled(sampler, "lookup"))
+
+    def test_kind(self):
+        sampler = sampling.RuleBasedSampler(
+            [sampling.SamplingRule(kind=trace.SpanKind.SERVER, ratio=1.0)],
+            default=sampling.ALWAYS_OFF,
+        )
+        self.assertTrue(
+            self._is_sampled(sampler, "span", kind=trace.SpanKind.SERVER)
+        )
+        self.assertFalse(
+            self._is_sampled(sampler, "span", kind=trace.SpanKind.CLIENT)
+        )
+        self.assertFalse(self._is_sampled(sampler, "span"))
+
+    def test_ratio(self):
+        sampler = sampling.RuleBasedSampler(
+            [sampling.SamplingRule(name="span", ratio=0.5)]
+        )
+        self.assertTrue(
+            self._is_sampled(sampler, "span", trace_id=0x7FFFFFFFFFFFFFFF)
+        )
+        self.assertFalse(
+            self._is_sampled(sampler, "span", trace_id=0x8000000000000000)
+        )
+
+    def test_spans_per_second(self):
+        sampler = sampling.RuleBasedSampler(
+            [
+                sampling.SamplingRule(name="limited", spans_per_second=3),
+                sampling.SamplingRule(name="never", spans_per_second=0),
+            ]
+        )
+        sampled = [self._is_sampled(sampler, "limited") for _ in range(10)]
+        self.assertEqual(sampled, [True] * 3 + [False] * 7)
+        self.assertFalse(self._is_sampled(sampler, "never"))
+
+    def test_sampler_attributes(self):
+        sampler = sampling.RuleBasedSampler([sampling.SamplingRule(ratio=1.0)])
+        result = sampler.should_sample(None, 0, "span", {"key": "value"})
+        self.assertEqual(result.attributes, {"key": "value"})
+
+    def test_invalid_rules(self):
+        with self.assertRaises(ValueError):
+            sampling.SamplingRule()
+        with self.assertRaises(ValueError):
+            sampling.SamplingRule(ratio=1.0, spans_per_second=1)
+        with self.assertRaises(ValueError):
+            sampling.SamplingRule(ratio=2.0)
+        with self.assertRaises(ValueError):
+            sampling.SamplingRule(spans_per_second=-1)
+
+    def test_tracer_passes_kind(self):
+        tracer = TracerProvider(
+            sampler=sampling.RuleBasedSampler(
+                [sampling.SamplingRule(kind=trace.SpanKind.SERVER, ratio=1.0)],
+                default=sampling.ALWAYS_OFF,
+            )
+        ).get_tracer(__name__)
+
+        self.assertTrue(
+            tracer.start_span(
+                "span", kind=trace.SpanKind.SERVER
+            ).is_recording()
+        )
+        self.assertFalse(tracer.start_span("span").is_recording())
+
+    def test_sampler_without_kind(self):
+        class LegacySampler(sampling.Sampler):
+            def should_sample(
+                self,
+                parent_context,
+                trace_id,
+                name,
+                attributes=None,
+                links=None,
+                trace_state=None,
+            ):
+                return sampling.SamplingResult(
+                    sampling.Decision.RECORD_AND_SAMPLE
+                )
+
+            def get_description(self):
+                return "LegacySampler"
+
+        tracer = TracerProvider(sampler=LegacySampler()).get_tracer(__name__)
+        self.assertTrue(
+            tracer.start_span(
+                "span", kind=trace.SpanKind.SERVER
+            ).is_recording()
+        )
+
+        for sampler in (
+            sampling.ParentBased(LegacySampler()),
+            sampling.RuleBasedSampler([], default=LegacySampler()),
+            sampling.BackpressureSampler(
+                _SpanProcessor(), delegate=LegacySampler()
+            ),
+        ):
+            with self.subTest(sampler=sampler.get_description()):
+                self.assertTrue(
+                    self._is_sampled(
+                        sampler, "span", kind=trace.SpanKind.SERVER
+                    )
+                )
+
+
+class _SpanProcessor:
+    def __init__(self):
+        self.queue = []
+        self.max_queue_size = 100
+        self.dropped_spans = 0
+        self.last_export_duration_millis = 0.0
+
+
+class TestBackpressureSampler(unittest.TestCase):
+    def setUp(self):
+        self.span_processor = _SpanProcessor()
+        self.now = 0.0
+        patcher = mock.patch(
+            "opentelemetry.sdk.trace.sampling.monotonic",
+            side_effect=lambda: self.now,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _sample(self, sampler, trace_id=0x7FFFFFFFFFFFFFFF):
+        self.now += 1
+        return sampler.should_sample(
+            None, trace_id, "span"
+        ).decision.is_sampled()
+
+    def test_queue_fill_ratio(self):
+        sampler = sampling.BackpressureSampler(self.span_processor)
+        self.assertTrue(self._sample(sampler))
+        self.assertEqual(sampler.rate, 1.0)
+
+        self.span_processor.queue = [None] * 80
+        self.assertTrue(self._sample(sampler))
+        self.assertEqual(sampler.rate, 0.5)
+        # sampled by trace id, like TraceIdRatioBased
+        self.assertFalse(self._sample(sampler, 0x8000000000000000))
+        self.assertEqual(sampler.rate, 0.25)
+
+        # between the watermarks the rate is kept
+        self.span_processor.queue = [None] * 60
+        self.assertFalse(self._sample(sampler))
+        self.assertEqual(sampler.rate, 0.25)
+
+        self.span_processor.queue = []
+        self._sample(sampler)
+        self.assertAlmostEqual(sampler.rate, 0.35)
+        for _ in range(10):
+            self._sample(sampler)
+        self.assertEqual(sampler.rate, 1.0)
+
+    def test_min_rate(self):
+        sampler = sampling.BackpressureSampler(
+            self.span_processor, min_rate=0.1
+        )
+        self.span_processor.queue = [None] * 100
+        for _ in range(10):
+            self._sample(sampler)
+        self.assertEqual(sampler.rate, 0.1)
+
+    def test_dropped_spans(self):
+        sampler = sampling.BackpressureSampler(self.span_processor)
+        self.span_processor.dropped_spans = 10
+        self._sample(sampler)
+        self.assertEqual(sampler.rate, 0.5)
+        # no new drops, the queue recovered
+        self._sample(sampler)
+        self.assertEqual(sampler.rate, 0.6)
+
+    def test_dropped_spans_while_full(self):
+        sampler = sampling.BackpressureSampler(self.span_processor)
+        self.span_processor.queue = [None] * 100
+        self.span_processor.dropped_spans = 10
+        self._sample(sampler)
+        self.assertEqual(sampler.rate, 0.5)
+        # the drops were accounted while the queue was full
+        self.span_processor.queue = []
+        self._sample(sampler)
+        self.assertEqual(sampler.rate, 0.6)
+
+    def test_queue_bytes_fill_ratio(self):
+        self.span_processor.queue = BytesBoundedQueue(100, max_bytes=1000)
+        sampler = sampling.BackpressureSampler(self.span_processor)
+        for _ in range(2):
+            self.span_processor.queue.put(None, 400)
+        self._sample(sampler)
+        self.assertEqual(sampler.rate, 0.5)
+
+    def test_export_duration(self):
+        sampler = sampling.BackpressureSampler(
+            self.span_processor, max_export_duration_millis=100
+        )
+        self.span_processor.last_export_duration_millis = 150
+        self._sample(sampler)
+        self.assertEqual(sampler.rate, 0.5)
+
+    def test_update_interval(self):
+        sampler = sampling.BackpressureSampler(
+            self.span_processor, update_interval_millis=5000
+        )
+        self.span_processor.queue = [None] * 80
+        for _ in range(4):
+            self._sample(sampler)
+        self.assertEqual(sampler.rate, 1.0)
+        self._sample(sampler)
+        self.assertEqual(sampler.rate, 0.5)
+
+    def test_delegate(self):
+        sampler = sampling.BackpressureSampler(
+            self.span_processor, delegate=sampling.ALWAYS_OFF
+        )
+        self.assertFalse(self._sample(sampler))
+
+    def test_invalid_parameters(self):
+        for kwargs in (
+            {"min_rate": 2},
+            {"low_watermark": 0.8, "high_watermark": 0.6},
+            {"decrease_factor": 1},
+        ):
+            with self.assertRaises(ValueError):
+                sampling.BackpressureSampler(self.span_processor, **kwargs)
@@ -0,0 +1,239 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+import unittest
+
+from opentelemetry import trace as trace_api
+from opentelemetry.sdk import trace
+from opentelemetry.sdk.trace import export, tail_sampling
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+from opentelemetry.trace.status import Status, StatusCode
+
+
+class TestTailSamplingSpanProcessor(unittest.TestCase):
+    def setUp(self):
+        self.exporter = InMemorySpanExporter()
+        self.tracer_provider = trace.TracerProvider(shutdown_on_exit=False)
+        self.tracer = self.tracer_provider.get_tracer(__name__)
+
+    def _add_processor(self, policies, **kwargs):
+        span_processor = tail_sampling.TailSamplingSpanProcessor(
+            export.SimpleExportSpanProcessor(self.exporter), policies, **kwargs
+        )
+        self.tracer_provider.add_span_processor(span_processor)
+        self.addCleanup(span_processor.shutdown)
+        return span_processor
+
+    def _exported_names(self):
+        return sorted(span.name for span in self.exporter.get_finished_spans())
+
+    def test_error_status_policy(self):
+        span_processor = self._add_processor(
+            [tail_sampling.ErrorStatusPolicy()]
+        )
+
+        with self.tracer.start_as_current_span("ok"):
+            with self.tracer.start_as_current_span("ok-child"):
+                pass
+        self.assertEqual(self._exported_names(), [])
+
+        with self.tracer.start_as_current_span("failed"):
+            with self.tracer.start_as_current_span("failed-child") as child:
+                child.set_status(Status(StatusCode.ERROR))
+
+        self.assertEqual(self._exported_names(), ["failed", "failed-child"])
+        self.assertEqual(span_processor.sampled_traces, 1)
+        self.assertEqual(span_processor.dropped_traces, 1)
+
+    def test_latency_policy(self):
+        self._add_processor([tail_sampling.LatencyPolicy(10)])
+
+        with self.tracer.start_as_current_span("fast"):
+            pass
+        root = self.tracer.start_span("slow", start_time=0)
+        root.end(end_time=10 * 10 ** 6)
+
+        self.assertEqual(self._exported_names(), ["slow"])
+
+    def test_attribute_policy(self):
+        self._add_processor(
+            [tail_sampling.AttributePolicy("http.status_code", [500, 503])]
+        )
+
+        for name, status_code in (("ok", 200), ("unavailable", 503)):
+            with self.tracer.start_as_current_span(name):
+                with self.tracer.start_as_current_span(
+                    "child", attributes={"http.status_code": status_code}
+                ):
+                    pass
+
+        self.assertEqual(self._exported_names(), ["child", "unavailable"])
+
+    def test_attribute_policy_any_value(self):
+        self._add_processor([tail_sampling.AttributePolicy("debug")])
+
+        with self.tracer.start_as_current_span("plain"):
+            pass
+        with self.tracer.start_as_current_span(
+            "debugged", attributes={"debug": False}
+        ):
+            pass
+
+        self.assertEqual(self._exported_names(), ["debugged"])
+
+    def test_probabilistic_policy(self):
+        self.assertTrue(
+            tail_sampling.ProbabilisticPolicy(1.0).should_sample(
+                0xFFFFFFFFFFFFFFFF, ()
+            )
+        )
+        policy = tail_sampling.ProbabilisticPolicy(0.5)
+        self.assertTrue(policy.should_sample(0x7FFFFFFFFFFFFFFF, ()))
+        self.assertFalse(policy.should_sample(0x8000000000000000, ()))
+        self.assertFalse(
+            tail_sampling.ProbabilisticPolicy(0.0).should_sample(0, ())
+        )
+        with self.assertRaises(ValueError):
+            tail_sampling.ProbabilisticPolicy(1.5)
+
+    def test_late_span_follows_decision(self):
+        self._add_processor([tail_sampling.AttributePolicy("keep", [True])])
+
+        for name in ("kept", "dropped"):
+            root = self.tracer.start_span(
+                name, attributes={"keep": name == "kept"}
+            )
+            late = self.tracer.start_span(
+                name + "-late", trace_api.set_span_in_context(root)
+            )
+            root.end()
+            late.end()
+
+        self.assertEqual(self._exported_names(), ["kept", "kept-late"])
+
+    def test_decision_wait(self):
+        span_processor = self._add_processor(
+            [tail_sampling.ErrorStatusPolicy()], decision_wait_millis=10
+        )
+        # the span is not a local root, so its trace is only decided when
+        # the decision wait time elapsed
+        parent_context = trace_api.set_span_in_context(
+            trace_api.DefaultSpan(
+                trace_api.SpanContext(
+                    0xDEADBEEF,
+                    0xDEADBEEF,
+                    is_remote=False,
+                    trace_flags=trace_api.TraceFlags(
+                        trace_api.TraceFlags.SAMPLED
+                    ),
+                )
+            )
+        )
+
+        with self.tracer.start_as_current_span("span", parent_context) as span:
+            span.set_status(Status(StatusCode.ERROR))
+        self.assertEqual(self._exported_names(), [])
+
+        for _ in range(100):
+            if span_processor.sampled_traces:
+                break
+            time.sleep(0.01)
+        self.assertEqual(self._exported_names(), ["span"])
+
+    def test_max_buffered_traces(self):
+        span_processor = self._add_processor(
+            [tail_sampling.ErrorStatusPolicy()], max_buffered_traces=1
+        )
+
+        first = self.tracer.start_span("first")
+        first_child = self.tracer.start_span(
+            "first-child", trace_api.set_span_in_context(first)
+        )
+        first_child.set_status(Status(StatusCode.ERROR))
+        first_child.end()
+        second = self.tracer.start_span("second")
+        second_child = self.tracer.start_span(
+            "second-child", trace_api.set_span_in_context(second)
+        )
+        second_child.end()
+
+        # the first trace was decided to make room for the second one
+        self.assertEqual(self._exported_names(), ["first-child"])
+        self.assertEqual(span_processor.sampled_traces, 1)
+        first.end()
+        second.end()
+        self.assertEqual(self._exported_names(), ["first", "first-child"])
+
+    def test_max_buffered_spans(self):
+        span_processor = self._add_processor(
+            [tail_sampling.ErrorStatusPolicy()], max_buffered_spans=2
+        )
+
+        root = self.tracer.start_span("root")
+        context = trace_api.set_span_in_context(root)
+        for _ in range(3):
+            self.tracer.start_span("child", context).end()
+
+        self.assertEqual(span_processor.dropped_traces, 1)
+        root.end()
+        self.assertEqual(span_processor.dropped_traces, 1)
+
+    def test_force_flush(self):
+        span_processor = self._add_processor(
+            [tail_sampling.ErrorStatusPolicy()]
+        )
+
+        root = self.tracer.start_span("root")
+        child = self.tracer.start_span(
+            "child", trace_api.set_span_in_context(root)
+        )
+        child.set_status(Status(StatusCode.ERROR))
+        child.end()
+        self.assertEqual(self._exported_names(), [])
+
+        self.assertTrue(span_processor.force_flush())
+        self.assertEqual(self._exported_names(), ["child"])
+
+    def test_shutdown(self):
+        span_processor = tail_sampling.TailSamplingSpanProcessor(
+            export.SimpleExportSpanProcessor(self.exporter),
+            [tail_sampling.ProbabilisticPolicy(1.0)],
+        )
+        self.tracer_provider.add_span_processor(span_processor)
+
+        root = self.tracer.start_span("root")
+        self.tracer.start_span(
+            "child", trace_api.set_span_in_context(root)
+        ).end()
+        span_processor.shutdown()
+
+        self.assertEqual(self._exported_names(), ["child"])
+        with self.assertLogs(level="WARNING"):
+            root.end()
+
+    def test_invalid_parameters(self):
+        for kwargs in (
+            {"decision_wait_millis": 0},
+            {"max_buffered_traces": 0},
+            {"max_buffered_spans": -1},
+        ):
+            with self.assertRaises(ValueError):
+                tail_sampling.TailSamplingSpanProcessor(
+                    export.SimpleExportSpanProcessor(self.exporter),
+                    [],
+                    **kwargs
+                )
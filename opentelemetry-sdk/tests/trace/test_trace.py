@@ -13,8 +13,13 @@
 # limitations under the License.
 
 # pylint: disable=too-many-lines
+import asyncio
+import os
 import shutil
+import signal
 import subprocess
+import threading
+import time
 import unittest
 from logging import ERROR, WARNING
 from typing import Optional
@@ -174,6 +179,55 @@ class TestTracerSampling(unittest.TestCase):
             trace_api.TraceFlags.DEFAULT,
         )
 
+    def test_dropped_span_reuse(self):
+        tracer_provider = trace.TracerProvider(sampling.ALWAYS_OFF)
+        tracer = tracer_provider.get_tracer(__name__)
+
+        with tracer.start_as_current_span("root") as root_span:
+            with tracer.start_as_current_span("child") as child_span:
+                self.assertIs(child_span, root_span)
+                self.assertFalse(child_span.is_recording())
+
+    def test_dropped_span_lazy_span_id(self):
+        ids_generator = mock.Mock(spec=trace_api.IdsGenerator)
+        ids_generator.generate_trace_id.return_value = 0xDEADBEEF
+        ids_generator.generate_span_id.return_value = 0xDEADBEF0
+        tracer_provider = trace.TracerProvider(
+            sampling.ALWAYS_OFF, ids_generator=ids_generator
+        )
+        tracer = tracer_provider.get_tracer(__name__)
+
+        span = tracer.start_span("root")
+        ids_generator.generate_span_id.assert_not_called()
+
+        span_context = span.get_span_context()
+        self.assertEqual(span_context.trace_id, 0xDEADBEEF)
+        self.assertEqual(span_context.span_id, 0xDEADBEF0)
+        self.assertFalse(span_context.trace_flags.sampled)
+        self.assertIs(span.get_span_context(), span_context)
+        ids_generator.generate_span_id.assert_called_once_with()
+
+    def test_recording_child_of_dropped_span(self):
+        sampler = mock.Mock(spec=sampling.Sampler)
+        sampler.should_sample.return_value = sampling.SamplingResult(
+            sampling.Decision.DROP
+        )
+        tracer_provider = trace.TracerProvider(sampler)
+        tracer = tracer_provider.get_tracer(__name__)
+
+        root_span = tracer.start_span("root")
+        sampler.should_sample.return_value = sampling.SamplingResult(
+            sampling.Decision.RECORD_ONLY
+        )
+        child_span = tracer.start_span(
+            "child", context=trace_api.set_span_in_context(root_span)
+        )
+        self.assertIsInstance(child_span, trace.Span)
+        self.assertEqual(child_span.parent, root_span.get_span_context())
+        self.assertEqual(
+            child_span.context.trace_id, root_span.get_span_context().trace_id
+        )
+
 
 class TestSpanCreation(unittest.TestCase):
     def test_start_span_invalid_spancontext(self):
@@ -410,6 +464,53 @@ class TestSpanCreation(unittest.TestCase):
             self.assertIs(trace_api.get_current_span(), root)
             self.assertIsNotNone(child.end_time)
 
+    def test_start_as_current_span_decorator(self):
+        tracer = new_tracer()
+        spans = []
+
+        @tracer.start_as_current_span("decorated")
+        def decorated(value):
+            spans.append(trace_api.get_current_span())
+            return value
+
+        self.assertEqual(decorated(1), 1)
+        self.assertEqual(decorated(2), 2)
+
+        self.assertEqual(trace_api.get_current_span(), trace_api.INVALID_SPAN)
+        self.assertEqual(len(spans), 2)
+        self.assertIsNot(spans[0], spans[1])
+        for span in spans:
+            self.assertEqual(span.name, "decorated")
+            self.assertIsNotNone(span.end_time)
+
+    def test_start_as_current_span_decorator_coroutine(self):
+        tracer = new_tracer()
+
+        @tracer.start_as_current_span("decorated")
+        async def decorated():
+            return trace_api.get_current_span()
+
+        loop = asyncio.new_event_loop()
+        try:
+            span = loop.run_until_complete(decorated())
+        finally:
+            loop.close()
+
+        self.assertEqual(span.name, "decorated")
+        self.assertIsNotNone(span.end_time)
+
+    def test_start_as_current_span_decorator_exception(self):
+        tracer = new_tracer()
+
+        @tracer.start_as_current_span("decorated")
+        def decorated():
+            raise ValueError("invalid")
+
+        with self.assertRaises(ValueError):
+            decorated()
+
+        self.assertEqual(trace_api.get_current_span(), trace_api.INVALID_SPAN)
+
     def test_explicit_span_resource(self):
         resource = resources.Resource.create({})
         tracer_provider = trace.TracerProvider(resource=resource)
@@ -446,6 +547,58 @@ class TestSpan(unittest.TestCase):
         span = trace._Span("name", mock.Mock(spec=trace_api.SpanContext))
         self.assertEqual(span.name, "name")
 
+    @unittest.skipUnless(
+        hasattr(os, "register_at_fork"), "requires os.register_at_fork"
+    )
+    def test_span_lock_after_fork(self):
+        span = self.tracer.start_span("span")
+        locked = threading.Event()
+        release = threading.Event()
+
+        def hold_lock():
+            # pylint: disable=protected-access
+            with span._lock:
+                locked.set()
+                release.wait()
+
+        thread = threading.Thread(target=hold_lock)
+        thread.start()
+        locked.wait()
+
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            # the span uses the lock of the child, which is not held
+            span.set_attribute("key", "value")
+            span.end()
+            os._exit(0)  # pylint: disable=protected-access
+
+        release.set()
+        thread.join()
+        for _ in range(1000):
+            waited_pid, _ = os.waitpid(pid, os.WNOHANG)
+            if waited_pid:
+                break
+            time.sleep(0.01)
+        else:  # pragma: no cover
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+            self.fail("The child process did not exit.")
+        span.end()
+
+    def test_lazy_containers(self):
+        span = trace._Span("name", mock.Mock(spec=trace_api.SpanContext))
+        self.assertFalse(hasattr(span, "__dict__"))
+        self.assertEqual(dict(span.attributes), {})
+        self.assertEqual(tuple(span.events), ())
+        self.assertEqual(tuple(span.links), ())
+
+        span.start()
+        span.set_attribute("key", "value")
+        span.add_event("event")
+        span.end()
+        self.assertEqual(dict(span.attributes), {"key": "value"})
+        self.assertEqual(len(span.events), 1)
+
     def test_attributes(self):
         with self.tracer.start_as_current_span("root") as root:
             root.set_attribute("component", "http")
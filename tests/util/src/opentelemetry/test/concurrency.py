@@ -0,0 +1,30 @@
+# Copyright The OpenTelemetry Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+from typing import Callable
+
+
+def run_in_threads(target: Callable[[], None], num_threads: int) -> None:
+    """Runs ``target`` in ``num_threads`` threads at once and waits for all
+    of them to finish.
+
+    Benchmarks of code recording from concurrent threads pass their loop as
+    ``target``.
+    """
+    threads = [threading.Thread(target=target) for _ in range(num_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()